@@ -101,6 +101,7 @@ aws cloudformation deploy \
     AllTokenHistoryCsvDownloadS3Bucket=${SSM_PARAMS_PREFIX}AllTokenHistoryCsvDownloadS3Bucket \
     CognitoIdentityPoolId=${SSM_PARAMS_PREFIX}CognitoIdentityPoolId\
     AcquisitionInfoTableName=${SSM_PARAMS_PREFIX}AcquisitionInfoTableName \
+    BlockTimestampTableName=${SSM_PARAMS_PREFIX}BlockTimestampTableName \
   --capabilities CAPABILITY_IAM \
   --no-fail-on-empty-changeset
 
@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+import boto3
+import json
+import os
+import urllib.request
+import time
+import sys
+import re
+
+#################################################################
+# 既存の users インデックスを、search_name に部分一致検索用の n-gram サブフィールドを持つインデックスへ移行する。
+# Amazon ES 6.2 ではインデックスのクローズ（_close）が利用できないため、analyzer は新しいインデックスで作成する。
+# 1. elasticsearch-setup.py と同一の設定で新しいインデックス（users_<日時>）を作成する
+#    マッピングの _meta には search_name_ngram_ready が設定されている
+# 2. _reindex で既存の users インデックスのドキュメントを新しいインデックスへコピーする
+#    コピー中に更新されたドキュメントを反映するため、version_type: external で 2 回実行する
+#    （2 回目はバージョンが新しいドキュメントのみ上書きされる。コピー中に削除されたドキュメントは反映されない）
+# 3. 既存の users インデックスを削除し、同じ操作内で users エイリアスを新しいインデックスに向ける
+#    ESUtil.search_user は _meta を確認し、設定されるまで（エイリアスの切り替えまで）は従来の wildcard クエリで検索する
+# 新規にインデックスを作成する場合は elasticsearch-setup.py に同一の設定が含まれているため不要。
+# $ python elasticsearch-migrate-users-ngram.py [許可するIP]
+#################################################################
+
+USERS_SETTING = {
+    "settings": {
+        "index": {
+            "number_of_replicas": "1"
+        },
+        "analysis": {
+            "analyzer": {
+                "default": {
+                    "tokenizer": "keyword"
+                },
+                "search_name_ngram": {
+                    "type": "custom",
+                    "tokenizer": "search_name_ngram",
+                    "filter": ["lowercase"]
+                },
+                "search_name_short_ngram": {
+                    "type": "custom",
+                    "tokenizer": "search_name_short_ngram",
+                    "filter": ["lowercase"]
+                }
+            },
+            "tokenizer": {
+                "search_name_ngram": {
+                    "type": "ngram",
+                    "min_gram": 3,
+                    "max_gram": 3
+                },
+                "search_name_short_ngram": {
+                    "type": "ngram",
+                    "min_gram": 1,
+                    "max_gram": 2
+                }
+            },
+            "normalizer": {
+                "lowcase": {
+                    "type": "custom",
+                    "char_filter": [],
+                    "filter": ["lowercase"]
+                }
+            }
+        }
+    },
+    "mappings": {
+        "user": {
+            "_meta": {
+                "search_name_ngram_ready": True
+            },
+            "properties": {
+                "user_id": {
+                    "type": "keyword",
+                    "copy_to": "search_name"
+                },
+                "user_display_name": {
+                    "type": "keyword",
+                    "copy_to": "search_name"
+                },
+                "search_name": {
+                    "type": "keyword",
+                    "normalizer": "lowcase",
+                    "fields": {
+                        "ngram": {
+                            "type": "text",
+                            "analyzer": "search_name_ngram"
+                        },
+                        "short_ngram": {
+                            "type": "text",
+                            "analyzer": "search_name_short_ngram"
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+
+class ESconfig:
+    def __getdomain(self):
+        ssm = boto3.client('ssm')
+        response = ssm.get_parameter(Name=f'{os.environ["ALIS_APP_ID"]}ssmElasticSearchEndpoint')
+        endpoint = response["Parameter"]["Value"]
+        m = re.match(r'search\-([\w\-]+)\-', endpoint)
+        return m.group(1)
+
+    def __init__(self):
+        self.domain = self.__getdomain()
+        self.client = boto3.client('es')
+        response = self.client.describe_elasticsearch_domain(
+            DomainName=self.domain
+        )
+        self.original_access_policy = response['DomainStatus']['AccessPolicies']
+        self.arn = json.loads(self.original_access_policy)['Statement'][0]['Resource']
+        self.endpoint = response['DomainStatus']['Endpoint']
+
+    def set_access_policy_allow_ip(self, ip):
+        new_access_policy = {
+                "Version": "2012-10-17",
+                "Statement": [
+                    {
+                        "Effect": "Allow",
+                        "Principal": {
+                            "AWS": "*"
+                        },
+                        "Action": [
+                            "es:*"
+                        ],
+                        "Condition": {
+                            "IpAddress": {
+                                "aws:SourceIp": [
+                                    ip
+                                ]
+                            }
+                        },
+                        "Resource": self.arn
+                    }
+                ]
+        }
+        self.client.update_elasticsearch_domain_config(
+                DomainName=self.domain,
+                AccessPolicies=json.dumps(new_access_policy)
+        )
+
+    def rollback_access_policy(self):
+        self.client.update_elasticsearch_domain_config(
+                DomainName=self.domain,
+                AccessPolicies=self.original_access_policy
+        )
+
+    def request(self, method, path, body=None):
+        url = f"https://{self.endpoint}/{path}"
+        request = urllib.request.Request(
+                url,
+                method=method,
+                data=json.dumps(body).encode("utf-8") if body is not None else None,
+                headers={"Content-Type": "application/json"}
+                )
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+
+esconfig = ESconfig()
+
+
+def reindex(dest_index):
+    task = esconfig.request("POST", "_reindex?wait_for_completion=false", {
+        "conflicts": "proceed",
+        "source": {"index": "users"},
+        "dest": {"index": dest_index, "version_type": "external"}
+    })
+    print(f"再インデックス開始 task: {task['task']}")
+    while True:
+        time.sleep(10)
+        status = esconfig.request("GET", f"_tasks/{task['task']}")
+        task_status = status['task']['status']
+        print(f"{task_status['created'] + task_status['updated'] + task_status['version_conflicts']}/{task_status['total']}件反映")
+        if status.get("completed"):
+            break
+    if status.get("error") or status.get("response", {}).get("failures"):
+        raise Exception(f"再インデックスに失敗しました: {status}")
+
+
+# 自分のIPを許可
+myip = sys.argv[1]
+print(f"{myip}のIPを許可リストに追加します")
+esconfig.set_access_policy_allow_ip(myip)
+print("アクセスポリシー反映中 60秒待機")
+for i in range(6):
+    time.sleep(10)
+    print(f"{(i+1)*10}秒経過")
+
+try:
+    new_index = f"users_{time.strftime('%Y%m%d%H%M%S')}"
+    print(f"{new_index}を作成し、usersインデックスから移行します。実行しますか？ (y/n)")
+    choice = input("input> ")
+    if choice != "y":
+        print("キャンセル")
+    else:
+        esconfig.request("PUT", new_index, USERS_SETTING)
+        print(f"{new_index}を作成")
+
+        reindex(new_index)
+        # 1 回目の再インデックス中に更新されたドキュメントを反映する
+        reindex(new_index)
+        print("再インデックス完了")
+
+        # 既存の users インデックスの削除とエイリアスの作成を 1 つの操作で行い、検索できない時間を作らない
+        esconfig.request("POST", "_aliases", {
+            "actions": [
+                {"add": {"index": new_index, "alias": "users"}},
+                {"remove_index": {"index": "users"}}
+            ]
+        })
+        print(f"移行完了 usersエイリアスを{new_index}に設定")
+finally:
+    print("アクセスポリシーを元の状態に戻します")
+    esconfig.rollback_access_policy()
@@ -146,6 +146,7 @@ articles_setting = {
 create_index_list.append({"name": "articles", "setting": articles_setting})
 
 # users インデックス設定(逐次検索なのでトークナイズしない)
+# 部分一致検索用に search_name へ n-gram のサブフィールドを追加している(elasticsearch-migrate-users-ngram.py と同一の設定)
 users_setting = {
     "settings": {
         "index": {
@@ -155,6 +156,28 @@ users_setting = {
             "analyzer": {
                 "default": {
                     "tokenizer": "keyword"
+                },
+                "search_name_ngram": {
+                    "type": "custom",
+                    "tokenizer": "search_name_ngram",
+                    "filter": ["lowercase"]
+                },
+                "search_name_short_ngram": {
+                    "type": "custom",
+                    "tokenizer": "search_name_short_ngram",
+                    "filter": ["lowercase"]
+                }
+            },
+            "tokenizer": {
+                "search_name_ngram": {
+                    "type": "ngram",
+                    "min_gram": 3,
+                    "max_gram": 3
+                },
+                "search_name_short_ngram": {
+                    "type": "ngram",
+                    "min_gram": 1,
+                    "max_gram": 2
                 }
             },
             "normalizer": {
@@ -168,6 +191,9 @@ users_setting = {
     },
     "mappings": {
         "user": {
+            "_meta": {
+                "search_name_ngram_ready": True
+            },
             "properties": {
                 "user_id": {
                     "type": "keyword",
@@ -179,7 +205,17 @@ users_setting = {
                 },
                 "search_name": {
                     "type": "keyword",
-                    "normalizer": "lowcase"
+                    "normalizer": "lowcase",
+                    "fields": {
+                        "ngram": {
+                            "type": "text",
+                            "analyzer": "search_name_ngram"
+                        },
+                        "short_ngram": {
+                            "type": "text",
+                            "analyzer": "search_name_short_ngram"
+                        }
+                    }
                 }
             }
         }
@@ -0,0 +1,132 @@
+import sys
+import time
+
+from elasticsearch import Elasticsearch
+from elasticsearch.helpers import bulk
+
+#################################################################
+# ESUtil.search_user の部分一致検索のコストを、users インデックスと同一設定の合成データ（既定 100 万ユーザ）で計測する。
+# search_name への wildcard（*word*）クエリ（従来）と、n-gram サブフィールドへのクエリを比較する。
+# テストと同じローカルの Elasticsearch（localhost:9200）を利用し、計測用インデックスを作成・削除する。
+# リポジトリのルートで実行。
+# $ python misc/benchmarks/benchmark_es_user_search.py [ユーザ数] [計測回数]
+#################################################################
+INDEX_NAME = 'benchmark_users'
+WORDS = ['a', 'x7', 'user', 'ser12', 'display_name_98765', 'notfound']
+
+
+def main():
+    user_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    number = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    elasticsearch = Elasticsearch(hosts=[{'host': 'localhost'}], timeout=60)
+
+    create_index(elasticsearch, user_count)
+    try:
+        for word in WORDS:
+            before_body = build_body({'wildcard': {'search_name': f'*{word}*'}})
+            after_body = build_body(build_ngram_query(word))
+
+            if search_total(elasticsearch, before_body) != search_total(elasticsearch, after_body):
+                raise Exception(f'result mismatch: {word}')
+
+            before = measure(elasticsearch, before_body, number)
+            after = measure(elasticsearch, after_body, number)
+            print(f'{word}: before: {before:.3f} ms, after: {after:.3f} ms')
+    finally:
+        elasticsearch.indices.delete(index=INDEX_NAME, ignore=[404])
+
+
+# src/common/es_util.py の ESUtil.__get_user_search_name_ngram_query と同一
+def build_ngram_query(word):
+    if len(word) >= 3:
+        return {'match_phrase': {'search_name.ngram': word}}
+    return {'match': {'search_name.short_ngram': {'query': word, 'operator': 'and'}}}
+
+
+def create_index(elasticsearch, user_count):
+    # elasticsearch-setup.py の users インデックスと同一の設定
+    elasticsearch.indices.delete(index=INDEX_NAME, ignore=[404])
+    elasticsearch.indices.create(index=INDEX_NAME, body={
+        'settings': {
+            'index': {
+                'number_of_replicas': '0',
+                'refresh_interval': '-1'
+            },
+            'analysis': {
+                'analyzer': {
+                    'default': {'tokenizer': 'keyword'},
+                    'search_name_ngram': {'type': 'custom', 'tokenizer': 'search_name_ngram', 'filter': ['lowercase']},
+                    'search_name_short_ngram': {
+                        'type': 'custom', 'tokenizer': 'search_name_short_ngram', 'filter': ['lowercase']
+                    }
+                },
+                'tokenizer': {
+                    'search_name_ngram': {'type': 'ngram', 'min_gram': 3, 'max_gram': 3},
+                    'search_name_short_ngram': {'type': 'ngram', 'min_gram': 1, 'max_gram': 2}
+                },
+                'normalizer': {
+                    'lowcase': {'type': 'custom', 'char_filter': [], 'filter': ['lowercase']}
+                }
+            }
+        },
+        'mappings': {
+            'user': {
+                'properties': {
+                    'user_id': {'type': 'keyword', 'copy_to': 'search_name'},
+                    'user_display_name': {'type': 'keyword', 'copy_to': 'search_name'},
+                    'search_name': {
+                        'type': 'keyword',
+                        'normalizer': 'lowcase',
+                        'fields': {
+                            'ngram': {'type': 'text', 'analyzer': 'search_name_ngram'},
+                            'short_ngram': {'type': 'text', 'analyzer': 'search_name_short_ngram'}
+                        }
+                    }
+                }
+            }
+        }
+    })
+
+    actions = (
+        {
+            '_index': INDEX_NAME,
+            '_type': 'user',
+            '_id': f'user{i:07d}',
+            '_source': {
+                'user_id': f'user{i:07d}',
+                'user_display_name': f'Display_Name_{i * 7919 % user_count:07d}',
+                'updated_at': 1530112753
+            }
+        }
+        for i in range(user_count)
+    )
+    bulk(elasticsearch, actions, chunk_size=5000)
+    elasticsearch.indices.put_settings(index=INDEX_NAME, body={'index': {'refresh_interval': '1s'}})
+    elasticsearch.indices.refresh(index=INDEX_NAME)
+    elasticsearch.indices.forcemerge(index=INDEX_NAME, max_num_segments=1)
+
+
+def build_body(query):
+    return {
+        'query': query,
+        'from': 0,
+        'size': 20
+    }
+
+
+def search_total(elasticsearch, body):
+    return elasticsearch.search(index=INDEX_NAME, body=body, request_cache=False)['hits']['total']
+
+
+def measure(elasticsearch, body, number):
+    # 初回はキャッシュ作成のため計測対象外とする
+    search_total(elasticsearch, body)
+
+    start = time.perf_counter()
+    for _ in range(number):
+        search_total(elasticsearch, body)
+    return (time.perf_counter() - start) / number * 1000
+
+
+if __name__ == '__main__':
+    main()
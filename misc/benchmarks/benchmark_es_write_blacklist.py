@@ -0,0 +1,102 @@
+import sys
+import time
+
+from elasticsearch import Elasticsearch
+
+#################################################################
+# ESUtil の write_blacklisted ユーザ除外条件のコストを、blacklist の件数（10 / 100 / 1000）毎に計測する。
+# user 毎の match 句を must_not に並べる方式（従来）と、単一の terms 句で除外する方式を比較する。
+# テストと同じローカルの Elasticsearch（localhost:9200）を利用し、計測用インデックスを作成・削除する。
+# インデックス定義は tests/tests_common/tests_es_util.py の articles インデックスと同一。
+# リポジトリのルートで実行。
+# $ python misc/benchmarks/benchmark_es_write_blacklist.py [計測回数]
+#################################################################
+INDEX_NAME = 'benchmark_write_blacklist'
+ARTICLE_COUNT = 5000
+USER_COUNT = 2000
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    elasticsearch = Elasticsearch(hosts=[{'host': 'localhost'}])
+
+    create_index(elasticsearch)
+    try:
+        for blacklist_count in [10, 100, 1000]:
+            users = [f'user_{i:05d}' for i in range(blacklist_count)]
+            before_body = build_body([{'match': {'user_id': user}} for user in users])
+            after_body = build_body([{'terms': {'user_id.keyword': users}}])
+
+            before_ids = search_ids(elasticsearch, before_body)
+            after_ids = search_ids(elasticsearch, after_body)
+            if before_ids != after_ids:
+                raise Exception('result mismatch')
+
+            before = measure(elasticsearch, before_body, number)
+            after = measure(elasticsearch, after_body, number)
+            print(f'{blacklist_count} users: before: {before:.3f} ms, after: {after:.3f} ms')
+    finally:
+        elasticsearch.indices.delete(index=INDEX_NAME, ignore=[404])
+
+
+def create_index(elasticsearch):
+    elasticsearch.indices.delete(index=INDEX_NAME, ignore=[404])
+    elasticsearch.indices.create(index=INDEX_NAME, body={
+        'mappings': {
+            'article': {
+                'properties': {
+                    'sort_key': {
+                        'type': 'long'
+                    }
+                }
+            }
+        }
+    })
+
+    lines = []
+    for i in range(ARTICLE_COUNT):
+        lines.append({'index': {'_index': INDEX_NAME, '_type': 'article', '_id': f'testid{i:06d}'}})
+        lines.append({
+            'article_id': f'testid{i:06d}',
+            'user_id': f'user_{i % USER_COUNT:05d}',
+            'title': f'title{i}',
+            'topic': 'crypto',
+            'sort_key': 1520150272000000 + i
+        })
+    elasticsearch.bulk(body=lines)
+    elasticsearch.indices.refresh(index=INDEX_NAME)
+
+
+def build_body(must_not):
+    return {
+        'query': {
+            'bool': {
+                'must': [{'match': {'topic': 'crypto'}}],
+                'must_not': must_not
+            }
+        },
+        'sort': [
+            {'sort_key': 'desc'}
+        ],
+        'from': 0,
+        'size': 20
+    }
+
+
+def search_ids(elasticsearch, body):
+    res = elasticsearch.search(index=INDEX_NAME, body=body, request_cache=False)
+    return [item['_id'] for item in res['hits']['hits']]
+
+
+def measure(elasticsearch, body, number):
+    # 初回はクエリキャッシュ作成のため計測対象外とする
+    search_ids(elasticsearch, body)
+
+    start = time.perf_counter()
+    for _ in range(number):
+        search_ids(elasticsearch, body)
+    return (time.perf_counter() - start) / number * 1000
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import decimal
+import json
+import os
+import sys
+import timeit
+from decimal import Decimal
+
+#################################################################
+# DynamoDB から取得した記事一覧（Decimal を含む）を JSON 文字列に変換するコストを計測する。
+# json.dumps(obj, cls=DecimalEncoder)（従来）と JsonUtil.dumps を比較する。
+# リポジトリのルートで実行。
+# $ python misc/benchmarks/benchmark_json_serialization.py [計測回数]
+#################################################################
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(ROOT_DIR, 'src', 'common'))
+
+from json_util import JsonUtil  # noqa: E402
+
+
+# 従来の src/common/decimal_encoder.py と同一の実装
+class DecimalEncoder(json.JSONEncoder):
+    def default(self, o):
+        if isinstance(o, decimal.Decimal):
+            if o % 1 > 0:
+                return float(o)
+            else:
+                return int(o)
+        return super(DecimalEncoder, self).default(o)
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    payload = build_payload(100)
+
+    if json.dumps(payload, cls=DecimalEncoder) != JsonUtil.dumps(payload):
+        raise Exception('output mismatch')
+
+    before = timeit.timeit(lambda: json.dumps(payload, cls=DecimalEncoder), number=number) / number * 1000
+    after = timeit.timeit(lambda: JsonUtil.dumps(payload), number=number) / number * 1000
+    print(f'before: {before:.3f} ms, after: {after:.3f} ms ({len(payload["Items"])} items)')
+
+
+def build_payload(count):
+    items = []
+    for i in range(count):
+        items.append({
+            'article_id': f'testid{i:06d}',
+            'user_id': f'user{i % 10:04d}',
+            'title': f'title{i}',
+            'overview': 'overview' * 10,
+            'eye_catch_url': f'https://example.com/{i}.png',
+            'status': 'public',
+            'topic': 'crypto',
+            'tags': ['a', 'b', 'c'],
+            'price': Decimal(10 ** 20 * (i + 1)),
+            'sort_key': Decimal(1520150272000000 + i),
+            'published_at': Decimal(1520150272 + i),
+            'created_at': Decimal(1520150272 + i),
+            'sync_elasticsearch': Decimal(1),
+            'article_score': Decimal('12.345') + i
+        })
+    return {'Items': items, 'LastEvaluatedKey': {'article_id': 'testid000099', 'sort_key': Decimal(1520150272000099)}}
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import os
+import sys
+import timeit
+
+#################################################################
+# 投げ銭・記事購入のリクエスト 1 件分（署名済みトランザクション 2 件）の検証コストを計測する。
+# トランザクション毎に Account.recover_transaction と RLP デコードを個別に行う方式（従来）と、
+# PrivateChainUtil.parse_raw_transaction で 1 度だけデコード・署名者を復元する方式を比較する。
+# after(cold) はキャッシュが空の状態（通常のリクエスト）、after(warm) は同一トランザクションの再検証を計測する。
+# リポジトリのルートで実行。
+# $ python misc/benchmarks/benchmark_raw_transaction.py [計測回数]
+#################################################################
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(ROOT_DIR, 'src', 'common'))
+
+os.environ.setdefault('PRIVATE_CHAIN_ALIS_TOKEN_ADDRESS', '0x' + '1' * 40)
+os.environ.setdefault('PRIVATE_CHAIN_BRIDGE_ADDRESS', '0x' + '2' * 40)
+
+from rlp import decode  # noqa: E402
+from web3 import Account  # noqa: E402
+from private_chain_util import PrivateChainUtil  # noqa: E402
+
+NONCE = 5
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    account = Account.create()
+    raw_transactions = [sign_transaction(account, NONCE + i) for i in range(2)]
+
+    def before():
+        for raw_transaction in raw_transactions:
+            if Account.recover_transaction(raw_transaction) != account.address:
+                raise Exception('Signature is invalid')
+        for raw_transaction in raw_transactions:
+            decode(bytes.fromhex(raw_transaction[2:]))[5].hex()
+
+    def after():
+        for raw_transaction in raw_transactions:
+            PrivateChainUtil.validate_raw_transaction_signature(raw_transaction, account.address)
+        for i, raw_transaction in enumerate(raw_transactions):
+            PrivateChainUtil.get_data_from_raw_transaction(raw_transaction, hex(NONCE + i))
+
+    def after_cold():
+        PrivateChainUtil.raw_transactions.clear()
+        after()
+
+    print(f'before: {measure(before, number):.1f} us')
+    print(f'after(cold): {measure(after_cold, number):.1f} us')
+    print(f'after(warm): {measure(after, number):.1f} us')
+
+
+def sign_transaction(account, nonce):
+    # method(transfer) + to_address + value
+    data = '0xa9059cbb' + format(10, '064x') + format(10 ** 18, '064x')
+    transaction = {
+        'nonce': nonce,
+        'gasPrice': 0,
+        'gas': 100000,
+        'to': os.environ['PRIVATE_CHAIN_ALIS_TOKEN_ADDRESS'],
+        'value': 0,
+        'data': data,
+        'chainId': 8995
+    }
+    return account.sign_transaction(transaction).rawTransaction.hex()
+
+
+def measure(func, number):
+    func()
+    return timeit.timeit(func, number=number) / number * 1000000
+
+
+if __name__ == '__main__':
+    main()
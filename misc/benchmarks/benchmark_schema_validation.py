@@ -0,0 +1,82 @@
+import glob
+import importlib
+import inspect
+import os
+import sys
+import timeit
+
+#################################################################
+# 各 handler の 1 リクエストあたりの検証コスト（get_schema() による schema の組み立てを含む）を計測する。
+# get_schema() + jsonschema.validate（従来）と LambdaBase.validate_schema（クラス毎に生成済みの validator）を比較する。
+# リポジトリのルートで実行。
+# $ python misc/benchmarks/benchmark_schema_validation.py [計測回数]
+#################################################################
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(ROOT_DIR, 'src', 'common'))
+
+from jsonschema import validate, ValidationError  # noqa: E402
+from lambda_base import LambdaBase  # noqa: E402
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    handlers = load_handlers()
+
+    total_before = 0
+    total_after = 0
+    print(f'{"handler":<45}{"before(us)":>12}{"after(us)":>12}')
+    for name, handler in handlers:
+        before = measure(lambda: validate({}, handler.get_schema()), number)
+        after = measure(lambda: handler.validate_schema({}), number)
+        total_before += before
+        total_after += after
+        print(f'{name:<45}{before:>12.1f}{after:>12.1f}')
+
+    print(f'{len(handlers)} handlers')
+    print(f'average before: {total_before / len(handlers):.1f} us, after: {total_after / len(handlers):.1f} us')
+
+
+def load_handlers():
+    handlers = []
+    for path in sorted(glob.glob(os.path.join(ROOT_DIR, 'src', 'handlers', '**', '*.py'), recursive=True)):
+        if os.path.basename(path) == 'handler.py':
+            continue
+
+        handler_dir = os.path.dirname(path)
+        sys.path.insert(0, handler_dir)
+        try:
+            module = importlib.import_module(os.path.splitext(os.path.basename(path))[0])
+        except Exception as e:
+            print(f'skip {path}: {e}')
+            continue
+        finally:
+            sys.path.remove(handler_dir)
+
+        for name, handler_class in inspect.getmembers(module, inspect.isclass):
+            if not issubclass(handler_class, LambdaBase) or handler_class is LambdaBase:
+                continue
+            try:
+                handler = handler_class({}, {})
+                schema = handler.get_schema()
+            except Exception as e:
+                print(f'skip {name}: {e}')
+                continue
+            if schema:
+                handlers.append((name, handler))
+    return handlers
+
+
+def measure(func, number):
+    def run():
+        try:
+            func()
+        except ValidationError:
+            pass
+
+    # 生成済み validator の初回生成コストは計測対象外とする
+    run()
+    return timeit.timeit(run, number=number) / number * 1000000
+
+
+if __name__ == '__main__':
+    main()
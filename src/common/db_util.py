@@ -1,12 +1,20 @@
 import os
+import math
+import queue
+import random
+import threading
 
 import settings
 import time
-from boto3.dynamodb.conditions import Key
+from concurrent.futures import ThreadPoolExecutor
+from boto3.dynamodb.conditions import Key, ConditionBase, ConditionExpressionBuilder
 from decimal import Decimal
 from jsonschema import ValidationError
 from record_not_found_error import RecordNotFoundError
 from not_authorized_error import NotAuthorizedError
+from dynamodb_item_memo import DynamoDBItemMemo
+from lambda_metrics import LambdaMetrics
+from screened_article_cache import ScreenedArticleCache
 
 
 class DBUtil:
@@ -14,7 +22,7 @@ class DBUtil:
     @staticmethod
     def exists_article(dynamodb, article_id, user_id=None, status=None):
         article_info_table = dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
-        article_info = article_info_table.get_item(Key={'article_id': article_id}).get('Item')
+        article_info = DynamoDBItemMemo.get_item(article_info_table, {'article_id': article_id})
 
         if article_info is None:
             return False
@@ -28,7 +36,7 @@ class DBUtil:
     def validate_article_existence(cls, dynamodb, article_id, user_id=None, status=None, version=None,
                                    is_purchased=None):
         article_info_table = dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
-        article_info = article_info_table.get_item(Key={'article_id': article_id}).get('Item')
+        article_info = DynamoDBItemMemo.get_item(article_info_table, {'article_id': article_id})
 
         if article_info is None:
             raise RecordNotFoundError('Record Not Found')
@@ -45,13 +53,7 @@ class DBUtil:
 
     @staticmethod
     def validate_write_blacklisted(dynamodb, user_id):
-        screened_article_table = dynamodb.Table(os.environ['SCREENED_ARTICLE_TABLE_NAME'])
-        write_blacklisted = screened_article_table.get_item(Key={'article_type': 'write_blacklisted'}).get('Item')
-
-        if not write_blacklisted or not write_blacklisted.get('users'):
-            return True
-
-        if user_id in write_blacklisted.get('users'):
+        if user_id in ScreenedArticleCache.get_write_blacklisted_users(dynamodb):
             raise ValidationError('Write restricted')
 
         return True
@@ -59,7 +61,7 @@ class DBUtil:
     @classmethod
     def validate_latest_price(cls, dynamodb, article_id, price_without_burn):
         article_info_table = dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
-        article_info = article_info_table.get_item(Key={'article_id': article_id}).get('Item')
+        article_info = DynamoDBItemMemo.get_item(article_info_table, {'article_id': article_id})
         if article_info.get('price') is None or \
            price_without_burn != int(Decimal(article_info['price']) * Decimal(9) / Decimal(10)):
             raise ValidationError('Price was changed')
@@ -68,7 +70,7 @@ class DBUtil:
     @classmethod
     def validate_exists_title_and_body(cls, dynamodb, article_id):
         article_content_table = dynamodb.Table(os.environ['ARTICLE_CONTENT_TABLE_NAME'])
-        article_content = article_content_table.get_item(Key={'article_id': article_id}).get('Item')
+        article_content = DynamoDBItemMemo.get_item(article_content_table, {'article_id': article_id})
         if article_content.get('title') is None or article_content.get('body') is None:
             raise ValidationError('Title and body is required')
 
@@ -101,7 +103,7 @@ class DBUtil:
     @staticmethod
     def validate_user_existence(dynamodb, user_id):
         users_table = dynamodb.Table(os.environ['USERS_TABLE_NAME'])
-        user = users_table.get_item(Key={'user_id': user_id}).get('Item')
+        user = DynamoDBItemMemo.get_item(users_table, {'user_id': user_id})
 
         if user is None:
             raise RecordNotFoundError('Record Not Found')
@@ -110,7 +112,7 @@ class DBUtil:
     @staticmethod
     def comment_existence(dynamodb, comment_id):
         table = dynamodb.Table(os.environ['COMMENT_TABLE_NAME'])
-        comment = table.get_item(Key={'comment_id': comment_id}).get('Item')
+        comment = DynamoDBItemMemo.get_item(table, {'comment_id': comment_id})
 
         if comment is None:
             return False
@@ -119,7 +121,7 @@ class DBUtil:
     @staticmethod
     def validate_comment_existence(dynamodb, comment_id):
         table = dynamodb.Table(os.environ['COMMENT_TABLE_NAME'])
-        comment = table.get_item(Key={'comment_id': comment_id}).get('Item')
+        comment = DynamoDBItemMemo.get_item(table, {'comment_id': comment_id})
 
         if comment is None:
             raise RecordNotFoundError('Record Not Found')
@@ -128,7 +130,7 @@ class DBUtil:
     @staticmethod
     def validate_parent_comment_existence(dynamodb, comment_id):
         table = dynamodb.Table(os.environ['COMMENT_TABLE_NAME'])
-        comment = table.get_item(Key={'comment_id': comment_id}).get('Item')
+        comment = DynamoDBItemMemo.get_item(table, {'comment_id': comment_id})
 
         if comment is None or comment.get('parent_id'):
             raise RecordNotFoundError('Record Not Found')
@@ -137,7 +139,7 @@ class DBUtil:
     @staticmethod
     def get_validated_comment(dynamodb, comment_id):
         table = dynamodb.Table(os.environ['COMMENT_TABLE_NAME'])
-        comment = table.get_item(Key={'comment_id': comment_id}).get('Item')
+        comment = DynamoDBItemMemo.get_item(table, {'comment_id': comment_id})
 
         if comment is None:
             raise RecordNotFoundError('Record Not Found')
@@ -149,18 +151,248 @@ class DBUtil:
             if v == '':
                 values[k] = None
 
+    @classmethod
+    def query_all_items(cls, dynamodb_table, query_params, projection_attributes=None):
+        return list(cls.query_all_items_iter(dynamodb_table, query_params, projection_attributes))
+
+    @classmethod
+    def query_all_items_iter(cls, dynamodb_table, query_params, projection_attributes=None):
+        # query_all_items のジェネレータ版。全ページを保持せず、取得したページ毎に item を返却する
+        # 呼び出し元で反復を中断した場合、以降のページは取得しない
+        query_params = cls.__add_projection(dict(query_params), projection_attributes)
+
+        while True:
+            response = dynamodb_table.query(**query_params)
+            yield from response['Items']
+
+            if 'LastEvaluatedKey' not in response:
+                return
+            query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    @classmethod
+    def scan_all_items_parallel(cls, dynamodb_table, scan_params=None, total_segments=None, projection_attributes=None):
+        # テーブル全体を Segment 単位に分割して並列に scan し、取得したページ毎に item を返却する（順序は保証しない）
+        # 管理用・集計用の処理での利用を想定している
+        # 呼び出し元で反復を中断した場合、各 Segment は実行中のページの取得後に停止する
+        total_segments = total_segments or settings.DYNAMO_PARALLEL_SCAN_TOTAL_SEGMENTS
+        scan_params = cls.build_condition_expressions(
+            cls.__add_projection(dict(scan_params or {}), projection_attributes)
+        )
+        # 各 Segment は並列に scan するため、スレッドセーフではない Table ではなく、Table が持つ client を利用する
+        client = dynamodb_table.meta.client
+        table_name = dynamodb_table.name
+        # 取得済みのページを無制限に保持しないよう、キューの上限に達した場合は Segment 側の取得を待機させる
+        pages = queue.Queue(maxsize=total_segments * 2)
+        stop_event = threading.Event()
+
+        def put_page(page):
+            while not stop_event.is_set():
+                try:
+                    pages.put(page, timeout=settings.DYNAMO_PARALLEL_SCAN_QUEUE_TIMEOUT)
+                    return
+                except queue.Full:
+                    continue
+
+        def scan_segment(segment):
+            params = dict(scan_params, TableName=table_name, Segment=segment, TotalSegments=total_segments)
+            try:
+                while not stop_event.is_set():
+                    response = client.scan(**params)
+                    put_page(response['Items'])
+
+                    if 'LastEvaluatedKey' not in response:
+                        break
+                    params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+                # Segment の終了を通知する
+                put_page(None)
+            except Exception as e:
+                put_page(e)
+
+        executor = ThreadPoolExecutor(max_workers=min(total_segments, settings.DYNAMO_PARALLEL_SCAN_MAX_WORKERS))
+        for segment in range(total_segments):
+            executor.submit(scan_segment, segment)
+
+        try:
+            finished_count = 0
+            while finished_count < total_segments:
+                page = pages.get()
+                if page is None:
+                    finished_count += 1
+                    continue
+                if isinstance(page, Exception):
+                    raise page
+                yield from page
+        finally:
+            stop_event.set()
+            executor.shutdown(wait=True)
+
     @staticmethod
-    def query_all_items(dynamodb_table, query_params):
+    def build_condition_expressions(params):
+        # KeyConditionExpression・FilterExpression に指定した Key・Attr を文字列の式とプレースホルダに変換する
+        # resource の client は Key・Attr の変換に client 毎に共有の ConditionExpressionBuilder を利用するため、
+        # 複数スレッドから client を呼び出す場合は、呼び出し元のスレッドで事前に変換しておく
+        builder = ConditionExpressionBuilder()
+        params = dict(params)
+        for name in ['KeyConditionExpression', 'FilterExpression']:
+            if not isinstance(params.get(name), ConditionBase):
+                continue
+            expression = builder.build_expression(params[name], is_key_condition=(name == 'KeyConditionExpression'))
+            params[name] = expression.condition_expression
+            params['ExpressionAttributeNames'] = dict(
+                params.get('ExpressionAttributeNames', {}),
+                **expression.attribute_name_placeholders
+            )
+            params['ExpressionAttributeValues'] = dict(
+                params.get('ExpressionAttributeValues', {}),
+                **expression.attribute_value_placeholders
+            )
+        return params
 
-        response = dynamodb_table.query(**query_params)
-        items = response['Items']
+    @staticmethod
+    def __add_projection(params, projection_attributes):
+        # 予約語と衝突しないよう属性名はプレースホルダで指定する
+        if not projection_attributes:
+            return params
+
+        placeholders = ['#projection' + str(i) for i in range(len(projection_attributes))]
+        params['ProjectionExpression'] = ', '.join(placeholders)
+        params['ExpressionAttributeNames'] = dict(
+            params.get('ExpressionAttributeNames', {}),
+            **dict(zip(placeholders, projection_attributes))
+        )
+        return params
 
-        while 'LastEvaluatedKey' in response:
-            query_params.update({'ExclusiveStartKey': response['LastEvaluatedKey']})
+    @classmethod
+    def query_with_limit(cls, dynamodb_table, query_params, limit):
+        # FilterExpression を指定した query で、フィルタ後の件数が limit 件になるまでページングして取得する
+        # 2 ページ目以降はそれまでのフィルタの選択率から必要な評価件数を見積もって Limit を調整し、往復回数を抑える
+        query_params = dict(query_params, Limit=limit)
+        key_names = list(query_params['ExclusiveStartKey'].keys()) if query_params.get('ExclusiveStartKey') else None
+        items = []
+        scanned_count = 0
+
+        while True:
             response = dynamodb_table.query(**query_params)
             items.extend(response['Items'])
+            scanned_count += response['ScannedCount']
+
+            if 'LastEvaluatedKey' not in response:
+                break
+            # LastEvaluatedKey にはテーブルとインデックスのキー項目が含まれるため、続きを取得するためのキー項目として利用する
+            key_names = list(response['LastEvaluatedKey'].keys())
+            if len(items) >= limit:
+                break
+
+            query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+            query_params['Limit'] = cls.__estimate_page_size(limit - len(items), len(items), scanned_count)
+
+        # limit 件を超えて取得した場合は、返却する最後の item を起点に続きを取得できるよう LastEvaluatedKey を作成する
+        # 1 ページ目は Limit が limit 件のため、limit 件を超えるのは LastEvaluatedKey を取得済みの 2 ページ目以降のみ
+        if len(items) > limit:
+            response['LastEvaluatedKey'] = {key_name: items[limit - 1][key_name] for key_name in key_names}
+
+        response['Items'] = items[:limit]
+        response['Count'] = len(response['Items'])
+        response['ScannedCount'] = scanned_count
+
+        # 評価件数と返却件数の比率からエンドポイント毎の読み込みコストを把握できるよう計測する
+        LambdaMetrics.add_current('dynamodb_query_scanned_count', scanned_count)
+        LambdaMetrics.add_current('dynamodb_query_returned_count', response['Count'])
+
+        return response
 
-        return items
+    @staticmethod
+    def __estimate_page_size(remaining_count, returned_count, scanned_count):
+        if returned_count == 0:
+            # 1 件も該当していない場合は選択率が見積もれないため、評価件数を倍にする
+            page_size = scanned_count * 2
+        else:
+            page_size = math.ceil(remaining_count * scanned_count / returned_count)
+
+        return max(remaining_count, min(page_size, settings.DYNAMO_QUERY_MAX_PAGE_SIZE))
+
+    @classmethod
+    def batch_get_items(cls, dynamodb, table_name, keys, projection_attributes=None):
+        # batch_get_item は 1 リクエストあたり 100 件までのため分割し、分割したリクエストは並列に実行する
+        # 取得結果は keys の順に並べて返却する（存在しない item は含まない）
+        if not keys:
+            return []
+
+        # 同一キーを含むリクエストは DynamoDB 側でエラーとなるため重複を除く
+        unique_keys = list({cls.__get_key_id(key): key for key in keys}.values())
+        split_keys = [
+            unique_keys[index:index + settings.DYNAMO_BATCH_GET_MAX]
+            for index
+            in range(0, len(unique_keys), settings.DYNAMO_BATCH_GET_MAX)
+        ]
+
+        key_names = list(keys[0].keys())
+        # 並べ替えのためにキー項目は必ず取得する
+        request = cls.__add_projection(
+            {},
+            list(dict.fromkeys(key_names + list(projection_attributes))) if projection_attributes else None
+        )
+
+        if len(split_keys) == 1:
+            results = [cls.__batch_get_split_items(dynamodb, table_name, split_keys[0], request)]
+        else:
+            max_workers = min(len(split_keys), settings.DYNAMO_BATCH_GET_MAX_WORKERS)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(
+                    lambda target_keys: cls.__batch_get_split_items(dynamodb, table_name, target_keys, request),
+                    split_keys
+                ))
+
+        # batch_get_item は順序が保証されないため、keys を駆動表にして順序を並べなおす
+        items = {}
+        for result in results:
+            for item in result:
+                items[cls.__get_key_id({key_name: item[key_name] for key_name in key_names})] = item
+
+        return [items[cls.__get_key_id(key)] for key in keys if cls.__get_key_id(key) in items]
+
+    @classmethod
+    def get_items_from_tables(cls, dynamodb, table_names, key):
+        # 同一のキーを持つ複数テーブルの item（記事の info と content 等）を 1 回の batch_get_item で取得する
+        # 取得結果は table_names の順に並べて返却する（存在しない item は None）
+        # boto3 はリクエストのキーをその場で型変換するため、テーブル毎にキーを複製して渡す
+        responses = cls.__batch_get_request_items(
+            dynamodb,
+            {table_name: {'Keys': [dict(key)]} for table_name in dict.fromkeys(table_names)}
+        )
+
+        return [(responses.get(table_name) or [None])[0] for table_name in table_names]
+
+    @classmethod
+    def __batch_get_split_items(cls, dynamodb, table_name, keys, request):
+        responses = cls.__batch_get_request_items(dynamodb, {table_name: dict(request, Keys=keys)})
+        return responses.get(table_name, [])
+
+    @staticmethod
+    def __batch_get_request_items(dynamodb, request_items):
+        # 分割したリクエストは並列に実行されるため、スレッドセーフではない resource ではなく、resource が持つ client を利用する
+        # resource の client は型変換の処理が登録済みのため、リクエスト・レスポンスとも resource と同一の形式となる
+        client = dynamodb.meta.client
+        responses = {}
+
+        for retry_count in range(settings.DYNAMO_BATCH_GET_MAX_RETRY + 1):
+            if retry_count > 0:
+                # スロットリング時に未処理となったキーは、待機時間を指数的に増やしながら（full jitter）再取得する
+                time.sleep(random.uniform(0, settings.DYNAMO_BATCH_GET_RETRY_BASE_WAIT * (2 ** (retry_count - 1))))
+
+            response = client.batch_get_item(RequestItems=request_items)
+            for table_name, items in response['Responses'].items():
+                responses.setdefault(table_name, []).extend(items)
+
+            request_items = response.get('UnprocessedKeys')
+            if not request_items:
+                return responses
+
+        raise Exception('Failed to batch get items. unprocessed keys remain: ' + ', '.join(request_items.keys()))
+
+    @staticmethod
+    def __get_key_id(key):
+        return tuple(sorted(key.items()))
 
     @staticmethod
     def validate_topic(dynamodb, topic_name):
@@ -0,0 +1,77 @@
+import copy
+
+
+class DynamoDBItemMemo:
+    # 1 invocation 内で get_item により取得した item を テーブル・キー 単位で保持し、同一 item の再取得を防ぐ
+    # LambdaBase.main で invocation 毎に生成・破棄するため、別の invocation に値が持ち越されることはない
+    # memo が有効でない場合（LambdaBase 外からの呼び出し等）は、都度 DynamoDB から取得する
+    current = None
+
+    def __init__(self):
+        self.items = {}
+
+    @classmethod
+    def start(cls):
+        cls.current = cls()
+        return cls.current
+
+    @classmethod
+    def stop(cls):
+        cls.current = None
+
+    @classmethod
+    def get_item(cls, table, key):
+        memo = cls.current
+        if memo is None:
+            return table.get_item(Key=key).get('Item')
+
+        # 存在しない item（None）も memo し、同一 invocation 内で再度問い合わせない
+        memo_key = cls.__get_memo_key(table, key)
+        if memo_key not in memo.items:
+            memo.items[memo_key] = table.get_item(Key=key).get('Item')
+
+        # 呼び出し元で item が変更されても memo に影響しないよう複製を返す
+        return copy.deepcopy(memo.items[memo_key])
+
+    @classmethod
+    def put_item(cls, table, **kwargs):
+        try:
+            return table.put_item(**kwargs)
+        finally:
+            # Item からキー項目を特定するにはテーブル定義の取得が必要となるため、テーブル単位で破棄する
+            cls.invalidate_table(table)
+
+    @classmethod
+    def update_item(cls, table, **kwargs):
+        try:
+            return table.update_item(**kwargs)
+        finally:
+            cls.invalidate(table, kwargs['Key'])
+
+    @classmethod
+    def delete_item(cls, table, **kwargs):
+        try:
+            return table.delete_item(**kwargs)
+        finally:
+            cls.invalidate(table, kwargs['Key'])
+
+    @classmethod
+    def invalidate(cls, table, key):
+        memo = cls.current
+        if memo is None:
+            return
+
+        memo.items.pop(cls.__get_memo_key(table, key), None)
+
+    @classmethod
+    def invalidate_table(cls, table):
+        memo = cls.current
+        if memo is None:
+            return
+
+        for memo_key in [memo_key for memo_key in memo.items if memo_key[0] == table.name]:
+            del memo.items[memo_key]
+
+    @staticmethod
+    def __get_memo_key(table, key):
+        return table.name, tuple(sorted(key.items()))
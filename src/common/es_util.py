@@ -1,13 +1,41 @@
 # -*- coding: utf-8 -*-
+import base64
+import json
 import settings
-import os
 import time
+from elasticsearch import NotFoundError
+from jsonschema import ValidationError
+from screened_article_cache import ScreenedArticleCache
+from ttl_cache import TTLCache
 
 
 class ESUtil:
+    # インデックス名（エイリアス名）毎に、実体のインデックス名の一覧をコンテナ内でキャッシュする（存在しない場合は空の tuple）
+    index_cache = TTLCache('es_index', settings.ES_INDEX_CACHE_MAX_SIZE, settings.ES_INDEX_CACHE_TTL)
+    # users インデックスの n-gram サブフィールドへの移行状況のコンテナ内キャッシュ
+    user_search_name_ngram_cache = TTLCache('es_user_search_name_ngram', 1, settings.ES_INDEX_CACHE_TTL)
+
+    @staticmethod
+    def get_indices(elasticsearch, index_name):
+        indices = ESUtil.index_cache.get(index_name)
+        if indices is None:
+            response = elasticsearch.indices.get_alias(index=index_name, ignore=[404])
+            indices = () if 'error' in response else tuple(sorted(response.keys()))
+            ESUtil.index_cache.set(index_name, indices)
+        return indices
 
     @staticmethod
     def search_tag(elasticsearch, word, limit, page):
+        hits = ESUtil.__search_tag_hits(elasticsearch, word, limit, page=page)
+        return [item['_source'] for item in hits]
+
+    @staticmethod
+    def search_tag_with_cursor(elasticsearch, word, limit, cursor):
+        hits = ESUtil.__search_tag_hits(elasticsearch, word, limit, cursor=cursor)
+        return [item['_source'] for item in hits], ESUtil.__get_next_cursor(hits, limit)
+
+    @staticmethod
+    def __search_tag_hits(elasticsearch, word, limit, page=None, cursor=None):
         body = {
             'query': {
                 'bool': {
@@ -25,19 +53,16 @@ class ESUtil:
             },
             'sort': [
                 {'count': 'desc'}
-            ],
-            'from': limit * (page - 1),
-            'size': limit
+            ]
         }
+        ESUtil.__paginate(body, limit, page, cursor, settings.ES_TAG_CURSOR_TIEBREAKER)
 
         response = elasticsearch.search(
             index='tags',
             body=body
         )
 
-        tags = [item['_source'] for item in response['hits']['hits']]
-
-        return tags
+        return response['hits']['hits']
 
     @staticmethod
     def search_tags_count(elasticsearch, tags, size=500, term=604800):
@@ -70,7 +95,16 @@ class ESUtil:
         return response['aggregations']['tags_count']['buckets']
 
     @staticmethod
-    def search_article(elasticsearch, limit, page, word=None, tag=None):
+    def search_article(elasticsearch, limit, page, word=None, tag=None, source_fields=None):
+        return ESUtil.__search_article(elasticsearch, limit, word, tag, source_fields, page=page)
+
+    @staticmethod
+    def search_article_with_cursor(elasticsearch, limit, cursor, word=None, tag=None, source_fields=None):
+        res = ESUtil.__search_article(elasticsearch, limit, word, tag, source_fields, cursor=cursor)
+        return res, ESUtil.__get_next_cursor(res['hits']['hits'], limit)
+
+    @staticmethod
+    def __search_article(elasticsearch, limit, word, tag, source_fields, page=None, cursor=None):
         body = {
             "query": {
                 "bool": {
@@ -81,8 +115,7 @@ class ESUtil:
             "sort": [
                 {"sort_key": "desc"}
             ],
-            "from": limit*(page-1),
-            "size": limit
+            "_source": source_fields or settings.ES_ARTICLE_SOURCE_FIELDS
         }
 
         # wordが渡ってきた場合は文字列検索をする
@@ -114,6 +147,8 @@ class ESUtil:
         if tag:
             body['query']['bool']['must'].append({'term': {'tags.keyword': tag}})
 
+        ESUtil.__paginate(body, limit, page, cursor, settings.ES_ARTICLE_CURSOR_TIEBREAKER)
+
         res = elasticsearch.search(
                 index="articles",
                 body=body
@@ -121,7 +156,9 @@ class ESUtil:
         return res
 
     @staticmethod
-    def search_random_article(elasticsearch):
+    def search_random_article_ids(elasticsearch, size):
+        # 記事を無作為に size 件抽出し、article_id のみを返却する
+        # 全件をスコアリングするため、呼び出し元で結果をキャッシュし、リクエスト毎には呼び出さないこと
         query = {
             "function_score": {
                 "query": {
@@ -133,23 +170,29 @@ class ESUtil:
 
         body = {
             "query": query,
-            "size": 1
+            "_source": False,
+            "size": size
         }
 
         res = elasticsearch.search(
             index="articles",
             body=body
         )
-        return res
+        return [hit['_id'] for hit in res['hits']['hits']]
 
     @staticmethod
     def search_user(elasticsearch, word, limit, page):
-        body = {
-            "query": {
+        if ESUtil.is_user_search_name_ngram_ready(elasticsearch):
+            query = ESUtil.__get_user_search_name_ngram_query(word)
+        else:
+            # n-gram サブフィールドへの移行前のインデックスは従来どおり wildcard で検索する
+            query = {
                 "wildcard": {
                     "search_name": f"*{word}*"
                 }
-            },
+            }
+        body = {
+            "query": query,
             "from": limit*(page-1),
             "size": limit
         }
@@ -160,10 +203,51 @@ class ESUtil:
         return res
 
     @staticmethod
-    def search_popular_articles(elasticsearch, dynamodb, params, limit, page):
-        if not elasticsearch.indices.exists(index='article_scores'):
-            return []
+    def is_user_search_name_ngram_ready(elasticsearch):
+        # users インデックスの search_name に n-gram サブフィールドが作成され、既存ドキュメントへの反映が完了しているか
+        # マッピングの _meta の値（elasticsearch-migrate-users-ngram.py で作成したインデックスに users エイリアスが向いた時点で設定済みとなる）をコンテナ内でキャッシュして判定する
+        ready = ESUtil.user_search_name_ngram_cache.get('users')
+        if ready is None:
+            response = elasticsearch.indices.get_mapping(index='users', doc_type='user', ignore=[404])
+            ready = any(
+                (mapping['mappings'].get('user', {}).get('_meta') or {}).get(settings.USERS_SEARCH_NAME_NGRAM_META_KEY) is True
+                for mapping in response.values() if isinstance(mapping, dict) and 'mappings' in mapping
+            )
+            ESUtil.user_search_name_ngram_cache.set('users', ready)
+        return ready
+
+    @staticmethod
+    def __get_user_search_name_ngram_query(word):
+        # いずれも大文字小文字を区別しない部分一致となり、従来の wildcard（*word*）と同じ結果となる
+        # 3 文字以上: 3-gram の連続（phrase）として一致させる
+        if len(word) >= 3:
+            return {
+                'match_phrase': {
+                    'search_name.ngram': word
+                }
+            }
+        # 1, 2 文字: 1, 2-gram のいずれかに一致させる（2 文字の場合は 2-gram 自体が一致する必要がある）
+        return {
+            'match': {
+                'search_name.short_ngram': {
+                    'query': word,
+                    'operator': 'and'
+                }
+            }
+        }
+
+    @staticmethod
+    def search_popular_articles(elasticsearch, dynamodb, params, limit, page, source_fields=None):
+        hits = ESUtil.__search_popular_article_hits(elasticsearch, dynamodb, params, limit, source_fields, page=page)
+        return [item['_source'] for item in hits]
 
+    @staticmethod
+    def search_popular_articles_with_cursor(elasticsearch, dynamodb, params, limit, cursor, source_fields=None):
+        hits = ESUtil.__search_popular_article_hits(elasticsearch, dynamodb, params, limit, source_fields, cursor=cursor)
+        return [item['_source'] for item in hits], ESUtil.__get_next_cursor(hits, limit)
+
+    @staticmethod
+    def __search_popular_article_hits(elasticsearch, dynamodb, params, limit, source_fields, page=None, cursor=None):
         body = {
             'query': {
                 'bool': {
@@ -174,29 +258,29 @@ class ESUtil:
             'sort': [
                 {'article_score': 'desc'}
             ],
-            'from': limit * (page - 1),
-            'size': limit
+            '_source': source_fields or settings.ES_POPULAR_ARTICLE_SOURCE_FIELDS
         }
+        ESUtil.__paginate(body, limit, page, cursor, settings.ES_ARTICLE_CURSOR_TIEBREAKER)
 
         if params.get('topic'):
             body['query']['bool']['must'].append({'match': {'topic': params.get('topic')}})
 
         ESUtil.__set_write_blacklisted(dynamodb, body)
 
-        response = elasticsearch.search(
-            index='article_scores',
-            body=body
-        )
-
-        articles = [item['_source'] for item in response['hits']['hits']]
+        return ESUtil.__search_hits_if_index_exists(elasticsearch, settings.ARTICLE_SCORE_INDEX_NAME, body)
 
-        return articles
+    @staticmethod
+    def search_tip_ranked_articles(elasticsearch, dynamodb, params, limit, page, source_fields=None):
+        hits = ESUtil.__search_tip_ranked_article_hits(elasticsearch, dynamodb, params, limit, source_fields, page=page)
+        return [item['_source'] for item in hits]
 
     @staticmethod
-    def search_tip_ranked_articles(elasticsearch, dynamodb, params, limit, page):
-        if not elasticsearch.indices.exists(index=settings.ARTICLE_TIP_RANKING_INDEX_NAME):
-            return []
+    def search_tip_ranked_articles_with_cursor(elasticsearch, dynamodb, params, limit, cursor, source_fields=None):
+        hits = ESUtil.__search_tip_ranked_article_hits(elasticsearch, dynamodb, params, limit, source_fields, cursor=cursor)
+        return [item['_source'] for item in hits], ESUtil.__get_next_cursor(hits, limit)
 
+    @staticmethod
+    def __search_tip_ranked_article_hits(elasticsearch, dynamodb, params, limit, source_fields, page=None, cursor=None):
         body = {
             'query': {
                 'bool': {
@@ -207,26 +291,29 @@ class ESUtil:
             'sort': [
                 {'sort_tip_value': 'desc'}
             ],
-            'from': limit * (page - 1),
-            'size': limit
+            '_source': source_fields or settings.ES_TIP_RANKED_ARTICLE_SOURCE_FIELDS
         }
+        ESUtil.__paginate(body, limit, page, cursor, settings.ES_ARTICLE_CURSOR_TIEBREAKER)
 
         if params.get('topic'):
             body['query']['bool']['must'].append({'match': {'topic': params.get('topic')}})
 
         ESUtil.__set_write_blacklisted(dynamodb, body)
 
-        response = elasticsearch.search(
-            index=settings.ARTICLE_TIP_RANKING_INDEX_NAME,
-            body=body
-        )
+        return ESUtil.__search_hits_if_index_exists(elasticsearch, settings.ARTICLE_TIP_RANKING_INDEX_NAME, body)
 
-        articles = [item['_source'] for item in response['hits']['hits']]
+    @staticmethod
+    def search_recent_articles(elasticsearch, dynamodb, params, limit, page, source_fields=None):
+        hits = ESUtil.__search_recent_article_hits(elasticsearch, dynamodb, params, limit, source_fields, page=page)
+        return [item['_source'] for item in hits]
 
-        return articles
+    @staticmethod
+    def search_recent_articles_with_cursor(elasticsearch, dynamodb, params, limit, cursor, source_fields=None):
+        hits = ESUtil.__search_recent_article_hits(elasticsearch, dynamodb, params, limit, source_fields, cursor=cursor)
+        return [item['_source'] for item in hits], ESUtil.__get_next_cursor(hits, limit)
 
     @staticmethod
-    def search_recent_articles(elasticsearch, dynamodb, params, limit, page):
+    def __search_recent_article_hits(elasticsearch, dynamodb, params, limit, source_fields, page=None, cursor=None):
         body = {
             'query': {
                 'bool': {
@@ -237,25 +324,9 @@ class ESUtil:
             'sort': [
                 {'sort_key': 'desc'}
             ],
-            "_source": [
-                "article_id",
-                "user_id",
-                "status",
-                "title",
-                "overview",
-                "eye_catch_url",
-                "created_at",
-                "published_at",
-                "sort_key",
-                "topic",
-                "tags",
-                "version",
-                "price",
-                "tip_value"
-            ],
-            'from': limit * (page - 1),
-            'size': limit
+            "_source": source_fields or settings.ES_ARTICLE_SOURCE_FIELDS
         }
+        ESUtil.__paginate(body, limit, page, cursor, settings.ES_ARTICLE_CURSOR_TIEBREAKER)
 
         if params.get('topic'):
             body['query']['bool']['must'].append({'match': {'topic': params.get('topic')}})
@@ -267,15 +338,72 @@ class ESUtil:
             doc_type='article',
             body=body
         )
-        articles = [item['_source'] for item in res['hits']['hits']]
 
-        return articles
+        return res['hits']['hits']
+
+    @staticmethod
+    def encode_cursor(sort_values):
+        # 最後に取得したドキュメントのソート値（search_after に指定する値）を、クライアントには不透明な文字列として返却する
+        return base64.urlsafe_b64encode(json.dumps(sort_values, separators=(',', ':')).encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor, sort_size):
+        try:
+            sort_values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode())
+        except ValueError:
+            raise ValidationError('cursor is invalid')
+
+        if not isinstance(sort_values, list) or len(sort_values) != sort_size or \
+                not all(isinstance(value, (str, int, float)) and not isinstance(value, bool) for value in sort_values):
+            raise ValidationError('cursor is invalid')
+
+        return sort_values
+
+    @staticmethod
+    def __paginate(body, limit, page, cursor, tiebreaker):
+        # cursor が指定されていない場合は従来どおり from / size でページングする
+        if cursor is None:
+            body['from'] = limit * (page - 1)
+            body['size'] = limit
+            return
+
+        # cursor モードでは並び順が一意となるようソート条件を追加し、search_after で前回の続きから取得する
+        # 取得位置によらず処理コストが一定となり、max_result_window の制限も受けない（空文字の場合は先頭から取得する）
+        body['sort'] = body['sort'] + tiebreaker
+        body['size'] = limit
+        if cursor:
+            body['search_after'] = ESUtil.decode_cursor(cursor, len(body['sort']))
+
+    @staticmethod
+    def __get_next_cursor(hits, limit):
+        # 取得件数が limit 未満の場合は続きが存在しないため cursor を返却しない
+        if len(hits) < limit:
+            return None
+        return ESUtil.encode_cursor(hits[-1]['sort'])
+
+    @staticmethod
+    def __search_hits_if_index_exists(elasticsearch, index_name, body):
+        # インデックスの存在確認はキャッシュした結果を利用し、通常時は検索のみを行う
+        if not ESUtil.get_indices(elasticsearch, index_name):
+            return []
+
+        try:
+            response = elasticsearch.search(index=index_name, body=body)
+        except NotFoundError as e:
+            # キャッシュの有効期間内にインデックスが削除された場合
+            if e.error != 'index_not_found_exception':
+                raise e
+            ESUtil.index_cache.set(index_name, ())
+            return []
+
+        return response['hits']['hits']
 
     @staticmethod
     def __set_write_blacklisted(dynamodb, body):
-        screened_article_table = dynamodb.Table(os.environ['SCREENED_ARTICLE_TABLE_NAME'])
-        write_blacklisted = screened_article_table.get_item(Key={'article_type': 'write_blacklisted'}).get('Item')
-        # must_not に該当 user を追加
-        if write_blacklisted and write_blacklisted.get('users'):
-            for target_user in write_blacklisted.get('users'):
-                body['query']['bool']['must_not'].append({'match': {'user_id': target_user}})
+        # 該当 user を単一の terms 句で除外する
+        # must_not はスコア計算を伴わない filter context で評価されるため、ES 側で結果がキャッシュされる
+        # user_id は動的マッピングの text 型のため、完全一致させる keyword サブフィールドを指定する
+        # user 一覧はソート済みの値をコンテナ内でキャッシュし、クエリ毎に並べ替えない
+        write_blacklisted_users = ScreenedArticleCache.get_sorted_write_blacklisted_users(dynamodb)
+        if write_blacklisted_users:
+            body['query']['bool']['must_not'].append({'terms': {'user_id.keyword': list(write_blacklisted_users)}})
@@ -12,9 +12,18 @@ from not_authorized_error import NotAuthorizedError
 from not_verified_user_error import NotVerifiedUserError
 from exceptions import LimitExceeded
 from user_util import UserUtil
+from lambda_metrics import LambdaMetrics
+from outbound_call_tracker import OutboundCallTracker
+from dynamodb_item_memo import DynamoDBItemMemo
+from tag_lookup_memo import TagLookupMemo
+from parameter_util import ParameterUtil
 
 
 class LambdaBase(metaclass=ABCMeta):
+    # get_schema() から生成した validator とパラメータのメタ情報をハンドラのクラス毎に保持する（コンテナ内で共有）
+    # schema はクラス毎に固定のため、2 回目以降の invocation では get_schema() の呼び出し（schema の組み立て）も行わない
+    compiled_schemas = {}
+
     def __init__(self, event, context, dynamodb=None, s3=None, cognito=None, elasticsearch=None):
         self.event = event
         self.context = context
@@ -24,6 +33,7 @@ class LambdaBase(metaclass=ABCMeta):
         self.elasticsearch = elasticsearch
         self.params = None
         self.headers = None
+        self.metrics = None
 
     @abstractmethod
     def get_schema(self):
@@ -38,21 +48,48 @@ class LambdaBase(metaclass=ABCMeta):
         pass
 
     def main(self):
+        # 処理フェーズ毎の処理時間を計測し、ハンドラ名とステータスコード単位でメトリクスとして出力する
+        self.metrics = LambdaMetrics(self.__class__.__name__)
+        # DynamoDB / Elasticsearch / private chain への呼び出し回数と処理時間もあわせて出力する
+        OutboundCallTracker.start(self.metrics.enabled, dynamodb=self.dynamodb, elasticsearch=self.elasticsearch)
+        # 同一 invocation 内で取得済みの DynamoDB の item は validate_params・exec_main_proc 間で共有する
+        DynamoDBItemMemo.start()
+        # Elasticsearch から検索したタグも同様に、タグ名の照合と件数の更新の間で共有する
+        TagLookupMemo.start()
+        response = None
+        try:
+            with self.metrics.measure('total'):
+                response = self.__main()
+        finally:
+            TagLookupMemo.stop()
+            DynamoDBItemMemo.stop()
+            outbound_calls = OutboundCallTracker.stop()
+            if outbound_calls is not None:
+                outbound_calls.report(self.metrics, self.__class__.__name__)
+            # __main の外に例外が送出された場合（update_event での DynamoDB のエラー等）も 500 として出力する
+            self.metrics.flush(response if response is not None else {'statusCode': 500})
+        return response
+
+    def __main(self):
         logger = logging.getLogger()
         logger.setLevel(logging.INFO)
 
-        self.__update_event()
+        with self.metrics.measure('update_event'):
+            self.__update_event()
 
         try:
             # init params
-            self.params = self.__get_params()
-            self.headers = self.__get_headers()
+            with self.metrics.measure('get_params'):
+                self.params = self.__get_params()
+                self.headers = self.__get_headers()
 
             # params validation
-            self.validate_params()
+            with self.metrics.measure('validate_params'):
+                self.validate_params()
 
             # exec main process
-            return self.exec_main_proc()
+            with self.metrics.measure('exec_main_proc'):
+                return self.exec_main_proc()
         except ValidationError as err:
             logger.fatal(err)
             logger.info(self.__filter_event_for_log(self.event))
@@ -112,6 +149,20 @@ class LambdaBase(metaclass=ABCMeta):
                 'body': json.dumps({'message': 'Internal server error: ' + self.__class__.__name__})
             }
 
+    def get_compiled_schema(self, schema_name='get_schema', use_format_checker=False):
+        key = (self.__class__, schema_name, use_format_checker)
+        compiled_schema = LambdaBase.compiled_schemas.get(key)
+        if compiled_schema is None:
+            compiled_schema = ParameterUtil.compile_schema(getattr(self, schema_name)(), use_format_checker)
+            LambdaBase.compiled_schemas[key] = compiled_schema
+        return compiled_schema
+
+    def validate_schema(self, params, schema_name='get_schema', use_format_checker=False):
+        ParameterUtil.validate_with_compiled_schema(params, self.get_compiled_schema(schema_name, use_format_checker))
+
+    def cast_params_to_int(self, params):
+        ParameterUtil.cast_parameter_to_int_with_compiled_schema(params, self.get_compiled_schema())
+
     def __get_params(self):
         target_params = [
             {
@@ -163,7 +214,7 @@ class LambdaBase(metaclass=ABCMeta):
             }
             # db 上に private_eth_address が設定されていた場合は追加
             if self.dynamodb:
-                address = UserUtil.get_private_eth_address_from_db(self.dynamodb, principal_id)
+                address = UserUtil.get_private_eth_address_with_cache(self.dynamodb, principal_id)
                 if address:
                     self.event['requestContext']['authorizer']['claims']['custom:private_eth_address'] = address
 
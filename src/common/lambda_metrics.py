@@ -0,0 +1,91 @@
+import os
+import sys
+import json
+import time
+import threading
+import settings
+from contextlib import contextmanager, nullcontext
+
+
+class LambdaMetrics:
+    # LambdaBase.main の処理フェーズ毎の処理時間を計測し、1 invocation につき 1 行の
+    # CloudWatch Embedded Metric Format（EMF）を標準出力に出力する
+    # 環境変数 LAMBDA_METRICS_ENABLED が 'true' の場合のみ有効（無効時は計測処理を行わない）
+    current = None
+
+    def __init__(self, handler_name):
+        self.handler_name = handler_name
+        self.enabled = os.environ.get('LAMBDA_METRICS_ENABLED') == 'true'
+        self.metrics = {}
+        self.units = {}
+        self.properties = {}
+        # private chain への並列の呼び出し等、複数スレッドから加算される場合がある
+        self.__lock = threading.Lock()
+        LambdaMetrics.current = self
+
+    def measure(self, phase):
+        if not self.enabled:
+            return nullcontext()
+        return self.__measure(phase)
+
+    @contextmanager
+    def __measure(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, (time.perf_counter() - start) * 1000, 'Milliseconds')
+
+    def add(self, name, value, unit='Count'):
+        if not self.enabled:
+            return
+
+        # 同一フェーズが複数回計測された場合は合算する
+        with self.__lock:
+            self.metrics[name] = self.metrics.get(name, 0) + value
+            self.units[name] = unit
+
+    def set_property(self, name, value):
+        # メトリクスとしては扱わず、ログの調査用に出力する値
+        if not self.enabled:
+            return
+
+        self.properties[name] = value
+
+    def flush(self, response):
+        LambdaMetrics.current = None
+        if not self.enabled:
+            return
+
+        status_code = response.get('statusCode') if isinstance(response, dict) else None
+        log = {
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [
+                    {
+                        'Namespace': settings.LAMBDA_METRICS_NAMESPACE,
+                        'Dimensions': [['Handler', 'StatusCode']],
+                        'Metrics': [{'Name': name, 'Unit': unit} for name, unit in self.units.items()]
+                    }
+                ]
+            },
+            'Handler': self.handler_name,
+            'StatusCode': str(status_code)
+        }
+        log.update(self.properties)
+        log.update(self.metrics)
+        sys.stdout.write(json.dumps(log) + '\n')
+        sys.stdout.flush()
+
+    @classmethod
+    def measure_current(cls, phase):
+        # LambdaBase 以外（ResponseBuilder 等）から実行中の invocation に対して計測する場合に利用する
+        if cls.current is None:
+            return nullcontext()
+        return cls.current.measure(phase)
+
+    @classmethod
+    def add_current(cls, name, value, unit='Count'):
+        if cls.current is None:
+            return
+        cls.current.add(name, value, unit)
@@ -0,0 +1,159 @@
+import os
+import time
+import logging
+import threading
+import requests
+from urllib.parse import urlparse
+
+
+class OutboundCallTracker:
+    # 1 invocation 内で実施された DynamoDB / Elasticsearch / private chain（HTTP）への呼び出し回数と処理時間を集計する
+    # DynamoDB は botocore のイベント、Elasticsearch は transport、HTTP は requests.Session.send をラップして計測する
+    current = None
+    is_requests_tracked = False
+
+    def __init__(self, table_call_threshold=None):
+        self.table_call_threshold = table_call_threshold
+        self.calls = {}
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def start(cls, enabled, dynamodb=None, elasticsearch=None):
+        # 環境変数 OUTBOUND_CALL_WARNING_THRESHOLD が指定されている場合は、メトリクス出力が無効でも集計する
+        threshold = os.environ.get('OUTBOUND_CALL_WARNING_THRESHOLD')
+        if not enabled and not threshold:
+            cls.current = None
+            return None
+
+        cls.__track_dynamodb(dynamodb)
+        cls.__track_elasticsearch(elasticsearch)
+        cls.__track_requests()
+        cls.current = cls(int(threshold) if threshold else None)
+        return cls.current
+
+    @classmethod
+    def stop(cls):
+        tracker = cls.current
+        cls.current = None
+        return tracker
+
+    @classmethod
+    def record(cls, service, target, elapsed):
+        tracker = cls.current
+        if tracker is None:
+            return
+
+        with tracker.__lock:
+            call = tracker.calls.setdefault((service, target), {'count': 0, 'time': 0})
+            call['count'] += 1
+            call['time'] += elapsed * 1000
+
+    def report(self, metrics, handler_name):
+        summary = {}
+        for (service, target), call in self.calls.items():
+            service_summary = summary.setdefault(service, {'count': 0, 'time': 0, 'targets': {}, 'target_times': {}})
+            service_summary['count'] += call['count']
+            service_summary['time'] += call['time']
+            service_summary['targets'][target] = call['count']
+            service_summary['target_times'][target] = round(call['time'], 3)
+
+        for service, service_summary in summary.items():
+            metrics.add(service + '_calls', service_summary['count'])
+            metrics.add(service + '_time', service_summary['time'], 'Milliseconds')
+            metrics.set_property(service + '_targets', service_summary['targets'])
+            # エンドポイント（テーブル）毎の処理時間の合計（ミリ秒）
+            metrics.set_property(service + '_target_times', service_summary['target_times'])
+
+        if self.table_call_threshold is None:
+            return
+
+        # 同一テーブルへの呼び出しが閾値を超えた場合は N+1 の可能性があるため警告する
+        for (service, target), call in self.calls.items():
+            if service == 'dynamodb' and call['count'] > self.table_call_threshold:
+                logging.getLogger().warning(
+                    f'{handler_name} called {target} {call["count"]} times in one invocation'
+                    f' (threshold: {self.table_call_threshold})'
+                )
+
+    @classmethod
+    def __track_dynamodb(cls, dynamodb):
+        if dynamodb is None:
+            return
+
+        # resource が渡された場合は内部の client に対して登録する
+        client = getattr(dynamodb.meta, 'client', dynamodb)
+        events = client.meta.events
+        # unique_id を指定しているため、ウォームスタート時に同一 client に重複して登録されることはない
+        events.register('before-parameter-build.dynamodb', cls.__before_dynamodb_call,
+                        unique_id='outbound_call_tracker_before')
+        events.register('after-call.dynamodb', cls.__after_dynamodb_call,
+                        unique_id='outbound_call_tracker_after')
+        events.register('after-call-error.dynamodb', cls.__after_dynamodb_call,
+                        unique_id='outbound_call_tracker_after_error')
+
+    @staticmethod
+    def __before_dynamodb_call(params, model, context, **kwargs):
+        if OutboundCallTracker.current is None:
+            return
+
+        if params.get('TableName'):
+            tables = [params['TableName']]
+        elif params.get('RequestItems'):
+            tables = list(params['RequestItems'].keys())
+        else:
+            tables = [model.name]
+        context['outbound_call_tracker'] = {'tables': tables, 'start': time.perf_counter()}
+
+    @staticmethod
+    def __after_dynamodb_call(context, **kwargs):
+        call = context.get('outbound_call_tracker')
+        if call is None:
+            return
+
+        elapsed = time.perf_counter() - call['start']
+        for table in call['tables']:
+            OutboundCallTracker.record('dynamodb', table, elapsed)
+
+    @classmethod
+    def __track_elasticsearch(cls, elasticsearch):
+        if elasticsearch is None or getattr(elasticsearch.transport, 'is_outbound_call_tracked', False):
+            return
+
+        transport = elasticsearch.transport
+        perform_request = transport.perform_request
+
+        def tracked_perform_request(method, url, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return perform_request(method, url, *args, **kwargs)
+            finally:
+                # url は /{index}/{type}/_search 等の形式のため、先頭をインデックス名とみなす
+                cls.record('elasticsearch', url.strip('/').split('/')[0], time.perf_counter() - start)
+
+        transport.perform_request = tracked_perform_request
+        transport.is_outbound_call_tracked = True
+
+    @classmethod
+    def __track_requests(cls):
+        if cls.is_requests_tracked:
+            return
+
+        send = requests.Session.send
+
+        def tracked_send(session, request, **kwargs):
+            if cls.current is None:
+                return send(session, request, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return send(session, request, **kwargs)
+            finally:
+                url = urlparse(request.url)
+                # Elasticsearch への通信は transport 側で計測済みのため対象外
+                if url.hostname != os.environ.get('ELASTIC_SEARCH_ENDPOINT'):
+                    service = 'private_chain' if url.hostname == os.environ.get('PRIVATE_CHAIN_EXECUTE_API_HOST') \
+                        else 'http'
+                    cls.record(service, url.path, time.perf_counter() - start)
+
+        requests.Session.send = tracked_send
+        cls.is_requests_tracked = True
@@ -1,18 +1,72 @@
-from jsonschema import ValidationError
+import copy
+from jsonschema import ValidationError, FormatChecker
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 
 
 class ParameterUtil:
+    # schema 毎に生成済みの validator とパラメータのメタ情報を保持する（コンテナ内で共有）
+    # LambdaBase を継承したハンドラは LambdaBase でクラス毎に保持するため、ここではそれ以外（cognito trigger 等）が対象
+    compiled_schemas = {}
+    format_checker = FormatChecker()
+
+    @classmethod
+    def compile_schema(cls, schema, use_format_checker=False):
+        schema = copy.deepcopy(schema)
+        validator_class = validator_for(schema)
+        # schema 自体の検証（jsonschema.validate で毎回実施されていた処理）は生成時の 1 回のみ実施する
+        validator_class.check_schema(schema)
+        properties = schema.get('properties') or {}
+        return {
+            'validator': validator_class(schema, format_checker=cls.format_checker if use_format_checker else None),
+            'integer_keys': frozenset(
+                name for name, value in properties.items() if isinstance(value, dict) and value.get('type') == 'integer'
+            )
+        }
+
+    @classmethod
+    def get_compiled_schema(cls, schema, use_format_checker=False):
+        # 呼び出し毎に生成される schema は、内容（repr）をキーとして同一 schema を判定する
+        key = (repr(schema), use_format_checker)
+        compiled_schema = cls.compiled_schemas.get(key)
+        if compiled_schema is None:
+            compiled_schema = cls.compile_schema(schema, use_format_checker)
+            cls.compiled_schemas[key] = compiled_schema
+        return compiled_schema
+
+    @classmethod
+    def validate(cls, params, schema, use_format_checker=False):
+        # jsonschema.validate と同等の検証を、生成済みの validator を利用して実施する
+        cls.validate_with_compiled_schema(params, cls.get_compiled_schema(schema, use_format_checker))
+
     @staticmethod
-    def cast_parameter_to_int(params, schema):
-        properties = schema['properties']
+    def validate_with_compiled_schema(params, compiled_schema):
+        error = best_match(compiled_schema['validator'].iter_errors(params))
+        if error is not None:
+            raise error
 
-        for key, value in params.items():
-            if properties.get(key) is None:
-                continue
+    @classmethod
+    def cast_parameter_to_int(cls, params, schema):
+        cls.cast_parameter_to_int_with_compiled_schema(params, cls.get_compiled_schema(schema))
 
-            if properties[key]['type'] == 'integer' and value.isdigit():
+    @staticmethod
+    def cast_parameter_to_int_with_compiled_schema(params, compiled_schema):
+        integer_keys = compiled_schema['integer_keys']
+
+        for key, value in params.items():
+            if key in integer_keys and value.isdigit():
                 params[key] = int(value)
 
+    @staticmethod
+    def validate_fields(fields, allowed_fields):
+        # fields はカンマ区切りの項目名。取得可能な項目以外が含まれる場合はエラーとする
+        if fields is None:
+            return
+
+        for field in fields.split(','):
+            if field not in allowed_fields:
+                raise ValidationError("fields doesn't support {field}".format(field=field))
+
     @staticmethod
     def validate_array_unique(items, key, case_insensitive=False):
         if len(items) != len(set(items)):
@@ -1,21 +1,31 @@
 import os
 import json
+import random
 import requests
 import settings
 import time
 import re
-from jsonschema import validate
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 from aws_requests_auth.aws_auth import AWSRequestsAuth
+from requests.adapters import HTTPAdapter
 from exceptions import SendTransactionError, ReceiptError
-from web3 import Web3, Account, HTTPProvider
+from lambda_metrics import LambdaMetrics
+from parameter_util import ParameterUtil
+from web3 import Web3, HTTPProvider
 from eth_account.messages import encode_defunct
 from jsonschema import ValidationError
-from rlp import decode
-from rlp.exceptions import DecodingError
+from raw_transaction import RawTransaction
+from ttl_cache import TTLCache
 
 
 class PrivateChainUtil:
     auth = None
+    # コンテナ内で共有する keep-alive の HTTP セッション（ウォームスタート時は TLS 接続を再利用する）
+    session = None
+    # 署名済みトランザクション毎の RawTransaction（デコード結果と復元済みの署名者）
+    # 署名の検証と data の取得で同じトランザクションを再デコード・再復元しないようにする
+    raw_transactions = TTLCache('raw_transaction', settings.RAW_TRANSACTION_CACHE_SIZE, settings.RAW_TRANSACTION_CACHE_TTL)
 
     @classmethod
     def __set_aws_requests_auth(cls):
@@ -29,26 +39,75 @@ class PrivateChainUtil:
             )
 
     @classmethod
-    def send_transaction(cls, request_url, payload_dict=None):
-        cls.__set_aws_requests_auth()
-        headers = {"content-type": "application/json"}
+    def __get_session(cls):
+        if cls.session is None:
+            cls.__set_aws_requests_auth()
+            session = requests.Session()
+            session.auth = cls.auth
+            session.headers.update({"content-type": "application/json"})
+            # 同一ホストへの接続をプールする。リトライは冪等な呼び出しのみ send_transaction で行う
+            session.mount('https://', HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=settings.PRIVATE_CHAIN_HTTP_POOL_MAX_SIZE,
+                max_retries=0
+            ))
+            cls.session = session
+        return cls.session
 
-        # send transaction
-        if payload_dict is None:
-            response = requests.post(request_url, auth=cls.auth, headers=headers)
-        else:
-            response = requests.post(request_url, auth=cls.auth, headers=headers, data=json.dumps(payload_dict))
+    @classmethod
+    def send_transaction(cls, request_url, payload_dict=None, idempotent=False):
+        # idempotent が True の場合（残高や block_number の取得等、参照のみの呼び出し）のみ、
+        # 通信エラー・タイムアウト・一時的なエラー（5xx）時にリトライする
+        # トランザクションの送信等はリトライにより二重に実行される恐れがあるためリトライしない
+        session = cls.__get_session()
+        data = None if payload_dict is None else json.dumps(payload_dict)
+        max_retry = settings.PRIVATE_CHAIN_READ_MAX_RETRY if idempotent else 0
+        endpoint = urlparse(request_url).path
+
+        for retry_count in range(max_retry + 1):
+            if retry_count > 0:
+                time.sleep(random.uniform(0, settings.PRIVATE_CHAIN_READ_RETRY_BASE_WAIT * (2 ** (retry_count - 1))))
+
+            start = time.perf_counter()
+            try:
+                response = session.post(
+                    request_url,
+                    data=data,
+                    timeout=(settings.PRIVATE_CHAIN_CONNECT_TIMEOUT, settings.PRIVATE_CHAIN_READ_TIMEOUT)
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                cls.__record_latency(endpoint, start, is_error=True, is_retry=retry_count > 0)
+                if retry_count < max_retry:
+                    continue
+                raise
+            cls.__record_latency(endpoint, start, is_error=response.status_code != 200, is_retry=retry_count > 0)
+
+            if response.status_code in settings.PRIVATE_CHAIN_RETRY_STATUS_CODES and retry_count < max_retry:
+                continue
+            break
 
         # validate status code
         if response.status_code != 200:
             raise SendTransactionError('status code not 200')
 
         # validate exists error
-        if json.loads(response.text).get('error'):
-            raise SendTransactionError(json.loads(response.text).get('error'))
+        result = json.loads(response.text)
+        if result.get('error'):
+            raise SendTransactionError(result.get('error'))
 
         # return result
-        return json.loads(response.text).get('result')
+        return result.get('result')
+
+    @staticmethod
+    def __record_latency(endpoint, start, is_error, is_retry):
+        # エンドポイント毎の処理時間（ミリ秒）・エラー回数と、リトライ回数を実行中の invocation のメトリクスとして出力する
+        # 例: /production/wallet/balance の場合は private_chain_wallet_balance_time
+        name = 'private_chain_' + endpoint.replace('/production/', '', 1).strip('/').replace('/', '_')
+        LambdaMetrics.add_current(name + '_time', (time.perf_counter() - start) * 1000, 'Milliseconds')
+        if is_error:
+            LambdaMetrics.add_current(name + '_errors', 1)
+        if is_retry:
+            LambdaMetrics.add_current('private_chain_retry_count', 1)
 
     @classmethod
     def send_raw_transaction(cls, raw_transaction):
@@ -62,21 +121,46 @@ class PrivateChainUtil:
 
     @classmethod
     def is_transaction_completed(cls, transaction):
-        count = 0
-        is_completed = False
-        while count < settings.TRANSACTION_CONFIRM_COUNT:
-            count += 1
-            # get receipt of target transaction
-            payload = {'transaction_hash': transaction}
-            request_url = 'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/transaction/receipt'
-            result = cls.send_transaction(request_url=request_url, payload_dict=payload)
-            # 完了しているかを確認
-            if PrivateChainUtil.__is_completed_receipt_result(result):
-                is_completed = True
+        return cls.wait_for_transactions([transaction])[transaction]
+
+    @classmethod
+    def wait_for_transactions(cls, transactions, deadline=None):
+        # 複数のトランザクションの receipt を 1 つのループでポーリングし、完了したかどうかを transaction 毎の dict で返却する
+        # 初回は即時に確認し、以降は待機時間を倍にしながら（上限 TRANSACTION_RECEIPT_MAX_INTERVAL 秒）再確認する
+        # deadline（秒）を過ぎるか、確認回数が TRANSACTION_CONFIRM_COUNT に達した時点で未完了のものは False とする
+        if deadline is None:
+            deadline = settings.TRANSACTION_RECEIPT_DEADLINE
+        start = time.time()
+        results = {transaction: False for transaction in transactions}
+        pending = list(results)
+        request_url = 'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/transaction/receipt'
+        interval = settings.TRANSACTION_RECEIPT_INITIAL_INTERVAL
+
+        for count in range(settings.TRANSACTION_CONFIRM_COUNT):
+            if count > 0:
+                remaining = start + deadline - time.time()
+                if remaining <= 0:
+                    break
+                time.sleep(min(interval, remaining))
+                interval = min(interval * 2, settings.TRANSACTION_RECEIPT_MAX_INTERVAL)
+
+            for transaction in list(pending):
+                # get receipt of target transaction
+                payload = {'transaction_hash': transaction}
+                result = cls.send_transaction(request_url=request_url, payload_dict=payload, idempotent=True)
+                # 完了しているかを確認
+                if PrivateChainUtil.__is_completed_receipt_result(result):
+                    results[transaction] = True
+                    pending.remove(transaction)
+                    LambdaMetrics.add_current(
+                        'transaction_confirmation_time', (time.time() - start) * 1000, 'Milliseconds'
+                    )
+            if not pending:
                 break
-            # 完了が確認できなかった場合は 1 秒待機後に再実施
-            time.sleep(1)
-        return is_completed
+
+        if pending:
+            LambdaMetrics.add_current('transaction_unconfirmed_count', len(pending))
+        return results
 
     @classmethod
     def __is_completed_receipt_result(cls, result):
@@ -97,7 +181,7 @@ class PrivateChainUtil:
             'private_eth_address': private_eth_address[2:]
         }
         url = 'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/wallet/balance'
-        return PrivateChainUtil.send_transaction(request_url=url, payload_dict=payload)
+        return PrivateChainUtil.send_transaction(request_url=url, payload_dict=payload, idempotent=True)
 
     @classmethod
     def get_transaction_count(cls, from_user_eth_address):
@@ -105,7 +189,23 @@ class PrivateChainUtil:
             'from_user_eth_address': from_user_eth_address
         }
         url = 'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/eth/get_transaction_count'
-        return PrivateChainUtil.send_transaction(request_url=url, payload_dict=payload)
+        return PrivateChainUtil.send_transaction(request_url=url, payload_dict=payload, idempotent=True)
+
+    @classmethod
+    def get_account_values(cls, eth_address, names):
+        # transaction_count / balance / allowance のうち names で指定した値を並列に取得し、名前毎の dict で返却する
+        # private chain の API は参照毎にエンドポイントが分かれており一括取得ができないため、セッションを共有して同時に呼び出す
+        getters = {
+            'transaction_count': cls.get_transaction_count,
+            'balance': cls.get_balance,
+            'allowance': cls.get_allowance
+        }
+        if len(names) == 1:
+            return {names[0]: getters[names[0]](eth_address)}
+
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            futures = {name: executor.submit(getters[name], eth_address) for name in names}
+        return {name: future.result() for name, future in futures.items()}
 
     @classmethod
     def increment_transaction_count(cls, hex_str):
@@ -119,7 +219,7 @@ class PrivateChainUtil:
             'spender_eth_address': os.environ['PRIVATE_CHAIN_BRIDGE_ADDRESS'][2:]
         }
         url = 'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/wallet/allowance'
-        return PrivateChainUtil.send_transaction(request_url=url, payload_dict=payload)
+        return PrivateChainUtil.send_transaction(request_url=url, payload_dict=payload, idempotent=True)
 
     @classmethod
     def validate_message_signature(cls, message, signature, address):
@@ -130,58 +230,55 @@ class PrivateChainUtil:
         ) != address:
             raise ValidationError('Signature is invalid')
 
+    @classmethod
+    def parse_raw_transaction(cls, raw_transaction):
+        if isinstance(raw_transaction, RawTransaction):
+            return raw_transaction
+
+        key = raw_transaction.lower()
+        transaction = cls.raw_transactions.get(key)
+        if transaction is None:
+            transaction = RawTransaction(raw_transaction)
+            cls.raw_transactions.set(key, transaction)
+        return transaction
+
     @classmethod
     def validate_raw_transaction_signature(cls, transaction, address):
-        if address != Account.recover_transaction(transaction):
+        if address != cls.parse_raw_transaction(transaction).sender:
             raise ValidationError('Signature is invalid')
 
     @classmethod
     def get_data_from_raw_transaction(cls, raw_transaction, transaction_count):
-        try:
-            # raw_transaction を decode すると下記パラメータを取得可能
-            # 検証パラメータと data を除いたパラメータが正しいことを確認後 data を返却する
-            # 0：nonce(transaction_count)
-            # 1：gasPrice（0）
-            # 2：gasLimit（0）
-            # 3：to_address
-            # 4：value（0）
-            # 5：data
-            # 6：v（検証で利用。但し、内部で chain_id が利用されているため確認対象）
-            # 7：r（検証で利用）
-            # 8：s（検証で利用）
-            byte_data_list = decode(bytes.fromhex(raw_transaction[2:]))
-            # 発生しない想定だが念の為個数を確認
-            if len(byte_data_list) != 9:
-                raise ValidationError('raw_transaction is invalid')
-            # nonce
-            if byte_data_list[0].hex() != '' and int(byte_data_list[0].hex(), 16) != int(transaction_count, 16):
-                raise ValidationError('nonce is invalid')
-            if byte_data_list[0].hex() == '' and int(transaction_count, 16) != 0:
-                raise ValidationError('nonce is invalid')
-            # gasPrice
-            if byte_data_list[1].hex() != '':
-                raise ValidationError('gasPrice is invalid')
-            # gasLimit
-            if byte_data_list[2].hex() != '0186a0':
-                raise ValidationError('gasLimit is invalid')
-            # to_address
-            # relay method の場合は to_address は PRIVATE_CHAIN_BRIDGE_ADDRESS
-            if byte_data_list[5].hex()[0:8] == 'eeec0e24':
-                to_address = os.environ['PRIVATE_CHAIN_BRIDGE_ADDRESS']
-            else:
-                to_address = os.environ['PRIVATE_CHAIN_ALIS_TOKEN_ADDRESS']
-            if byte_data_list[3].hex().lower() != to_address[2:].lower():
-                raise ValidationError('private_chain_alis_token_address is invalid')
-            # value
-            if byte_data_list[4].hex() != '':
-                raise ValidationError('value is invalid')
-            # v は検証パラメータだが、chain_id を含んでいるため確認する
-            if byte_data_list[6].hex() not in settings.PRIVATE_CHAIN_V_VALUES:
-                raise ValidationError('v is invalid')
-            # data を返す
-            return byte_data_list[5].hex()
-        except DecodingError:
-            raise ValidationError('raw_transaction is invalid')
+        # 検証パラメータと data を除いたパラメータが正しいことを確認後 data を返却する
+        # raw_transaction には署名済みトランザクションの文字列もしくは parse_raw_transaction の結果を指定する
+        byte_data_list = cls.parse_raw_transaction(raw_transaction).fields
+        # nonce
+        if byte_data_list[0].hex() != '' and int(byte_data_list[0].hex(), 16) != int(transaction_count, 16):
+            raise ValidationError('nonce is invalid')
+        if byte_data_list[0].hex() == '' and int(transaction_count, 16) != 0:
+            raise ValidationError('nonce is invalid')
+        # gasPrice
+        if byte_data_list[1].hex() != '':
+            raise ValidationError('gasPrice is invalid')
+        # gasLimit
+        if byte_data_list[2].hex() != '0186a0':
+            raise ValidationError('gasLimit is invalid')
+        # to_address
+        # relay method の場合は to_address は PRIVATE_CHAIN_BRIDGE_ADDRESS
+        if byte_data_list[5].hex()[0:8] == 'eeec0e24':
+            to_address = os.environ['PRIVATE_CHAIN_BRIDGE_ADDRESS']
+        else:
+            to_address = os.environ['PRIVATE_CHAIN_ALIS_TOKEN_ADDRESS']
+        if byte_data_list[3].hex().lower() != to_address[2:].lower():
+            raise ValidationError('private_chain_alis_token_address is invalid')
+        # value
+        if byte_data_list[4].hex() != '':
+            raise ValidationError('value is invalid')
+        # v は検証パラメータだが、chain_id を含んでいるため確認する
+        if byte_data_list[6].hex() not in settings.PRIVATE_CHAIN_V_VALUES:
+            raise ValidationError('v is invalid')
+        # data を返す
+        return byte_data_list[5].hex()
 
     @classmethod
     def validate_erc20_transfer_data(cls, data, to_address):
@@ -196,7 +293,7 @@ class PrivateChainUtil:
         if data[8:72][24:].lower() != to_address[2:].lower():
             raise ValidationError('to_address is invalid')
         # tip_value
-        validate(
+        ParameterUtil.validate(
             {'tip_value': int(data[72:], 16)},
             {
                 'type': 'object',
@@ -220,7 +317,7 @@ class PrivateChainUtil:
             raise ValidationError('spender_eth_address is invalid')
         # value
         if int(data[72:], 16) != 0:
-            validate(
+            ParameterUtil.validate(
                 {'token_send_value': int(data[72:], 16)},
                 {
                     'type': 'object',
@@ -243,7 +340,7 @@ class PrivateChainUtil:
         if not re.fullmatch(r'0{24}[0-9a-fA-F]{40}', data[8:72]):
             raise ValidationError('recipient_eth_address is invalid')
         # value
-        validate(
+        ParameterUtil.validate(
             {'token_send_value': int(data[72:], 16)},
             {
                 'type': 'object',
@@ -0,0 +1,77 @@
+import rlp
+from eth_keys import keys
+from eth_keys.exceptions import BadSignature
+from jsonschema import ValidationError
+from rlp.exceptions import DecodingError
+from web3 import Web3
+
+
+class RawTransaction:
+    # 署名済みトランザクション（legacy 形式）を 1 度だけ RLP デコードした結果を保持する
+    # decode すると下記パラメータを取得可能
+    # 0：nonce(transaction_count)
+    # 1：gasPrice
+    # 2：gasLimit
+    # 3：to_address
+    # 4：value
+    # 5：data
+    # 6：v（署名の検証で利用。chain_id を含む）
+    # 7：r（署名の検証で利用）
+    # 8：s（署名の検証で利用）
+    # 署名者の復元（ECDSA の公開鍵の復元）はコストが高いため、sender の初回参照時に 1 度だけ行う
+    def __init__(self, raw_transaction):
+        self.raw_transaction = raw_transaction
+        try:
+            self.fields = rlp.decode(bytes.fromhex(raw_transaction[2:]))
+        except (DecodingError, ValueError):
+            raise ValidationError('raw_transaction is invalid')
+        # 発生しない想定だが念の為個数を確認
+        if not isinstance(self.fields, list) or len(self.fields) != 9 or \
+                any(not isinstance(field, bytes) for field in self.fields):
+            raise ValidationError('raw_transaction is invalid')
+        self.__sender = None
+
+    @property
+    def nonce(self):
+        return int.from_bytes(self.fields[0], 'big')
+
+    @property
+    def to(self):
+        return '0x' + self.fields[3].hex()
+
+    @property
+    def data(self):
+        return self.fields[5].hex()
+
+    @property
+    def v(self):
+        return int.from_bytes(self.fields[6], 'big')
+
+    @property
+    def sender(self):
+        if self.__sender is None:
+            self.__sender = self.__recover_sender()
+        return self.__sender
+
+    def __recover_sender(self):
+        # Account.recover_transaction と同様に、署名対象（EIP-155 の場合は chain_id を含む）のハッシュから署名者を復元する
+        # デコード済みの値を利用するため、トランザクションの再デコードは行わない
+        v = self.v
+        if v >= 35:
+            chain_id = (v - 35) // 2
+            unsigned_fields = self.fields[:6] + [chain_id, b'', b'']
+            v_standard = v - chain_id * 2 - 35
+        else:
+            unsigned_fields = self.fields[:6]
+            v_standard = v - 27
+
+        message_hash = Web3.keccak(rlp.encode(unsigned_fields))
+        try:
+            signature = keys.Signature(vrs=(
+                v_standard,
+                int.from_bytes(self.fields[7], 'big'),
+                int.from_bytes(self.fields[8], 'big')
+            ))
+            return signature.recover_public_key_from_msg_hash(message_hash).to_checksum_address()
+        except (BadSignature, ValueError):
+            raise ValidationError('Signature is invalid')
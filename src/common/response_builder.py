@@ -1,5 +1,4 @@
-import json
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 
 
 class ResponseBuilder:
@@ -7,5 +6,5 @@ class ResponseBuilder:
     def response(status_code, body):
         return {
             'statusCode': status_code,
-            'body': json.dumps(body, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(body)
         }
@@ -0,0 +1,70 @@
+import os
+import time
+import settings
+
+
+class ScreenedArticleCache:
+    # SCREENED_ARTICLE テーブルの各行（write_blacklisted / blacklisted / recommended / eyecatch）のコンテナ内キャッシュ
+    # TTL（SCREENED_ARTICLE_CACHE_TTL 秒）経過後に行全体を再取得する。行の更新は最大で TTL の間反映されない
+    entries = {}
+
+    @classmethod
+    def get_write_blacklisted_users(cls, dynamodb):
+        return cls.__get_value(dynamodb, 'write_blacklisted', 'users', lambda item: frozenset(item.get('users') or []))
+
+    @classmethod
+    def get_sorted_write_blacklisted_users(cls, dynamodb):
+        # ES クエリ等、値の並びを固定したい用途向け
+        return cls.__get_value(
+            dynamodb,
+            'write_blacklisted',
+            'sorted_users',
+            lambda item: tuple(sorted(item.get('users') or []))
+        )
+
+    @classmethod
+    def get_blacklisted_article_ids(cls, dynamodb):
+        return cls.__get_value(dynamodb, 'blacklisted', 'articles', lambda item: frozenset(item.get('articles') or []))
+
+    @classmethod
+    def get_recommended_article_ids(cls, dynamodb):
+        # 掲載順を保持するため tuple で返却する
+        return cls.__get_value(dynamodb, 'recommended', 'articles', lambda item: tuple(item.get('articles') or []))
+
+    @classmethod
+    def get_eyecatch_article_ids(cls, dynamodb, topic):
+        return cls.__get_value(
+            dynamodb,
+            'eyecatch',
+            'articles:' + topic,
+            lambda item: tuple((item.get('articles') or {}).get(topic) or [])
+        )
+
+    @classmethod
+    def clear(cls):
+        cls.entries = {}
+
+    @classmethod
+    def __get_value(cls, dynamodb, article_type, name, convert):
+        # 行から変換した値（set 等）も行の取得毎に作り直さないようキャッシュする
+        entry = cls.__get_entry(dynamodb, article_type)
+        if name not in entry['values']:
+            entry['values'][name] = convert(entry['item'] or {})
+        return entry['values'][name]
+
+    @classmethod
+    def __get_entry(cls, dynamodb, article_type):
+        now = time.time()
+        entry = cls.entries.get(article_type)
+        if entry is not None and entry['expires_at'] > now:
+            return entry
+
+        screened_article_table = dynamodb.Table(os.environ['SCREENED_ARTICLE_TABLE_NAME'])
+        item = screened_article_table.get_item(Key={'article_type': article_type}).get('Item')
+        entry = {
+            'item': item,
+            'values': {},
+            'expires_at': now + settings.SCREENED_ARTICLE_CACHE_TTL
+        }
+        cls.entries[article_type] = entry
+        return entry
@@ -126,6 +126,18 @@ parameters = {
         'minimum': 1,
         'maximum': 100000
     },
+    'cursor': {
+        'type': 'string',
+        'maxLength': 1024
+    },
+    'fields': {
+        'type': 'string',
+        'minLength': 1,
+        'maxLength': 512
+    },
+    'async_settlement': {
+        'type': 'boolean'
+    },
     'query': {
         'type': 'string',
         'minLength': 1,
@@ -304,6 +316,7 @@ USERS_ARTICLE_INDEX_DEFAULT_LIMIT = 10
 USERS_ARTICLE_POPULAR_INDEX_DEFAULT_LIMIT = 3
 NOTIFICATION_INDEX_DEFAULT_LIMIT = 10
 COMMENT_INDEX_DEFAULT_LIMIT = 10
+COMMENT_REPLIES_MAX_WORKERS = 10
 TAG_SEARCH_DEFAULT_LIMIT = 100
 ARTICLES_RECOMMENDED_DEFAULT_LIMIT = 10
 
@@ -386,6 +399,8 @@ TAG_DENIED_SYMBOL_PATTERN = '([!-,./:-@[-`{-~]|--| {2})'
 TAG_ALLOWED_SYMBOLS = ['-', ' ']
 VIP_TAG_NAME = 'NFTオーナー'
 VIP_TAG_BADGE_TYPES = list(range(9, 109)) + [110]
+# TagUtil で大文字小文字を区別せずにタグを一括検索する際の取得件数の上限
+TAG_CASE_INSENSITIVE_SEARCH_SIZE = 100
 
 YAHOO_API_WELL_KNOWN_URL = 'https://auth.login.yahoo.co.jp/yconnect/v2/.well-known/openid-configuration'
 YAHOO_API_PUBLIC_KEY_URL = 'https://auth.login.yahoo.co.jp/yconnect/v2/public-keys'
@@ -420,7 +435,64 @@ LINE_REQUEST_SCOPE = '&scope=openid%20profile%20email'
 LINE_LOGIN_REQUEST_SCOPE = '&scope=openid%20profile'
 PASSWORD_LENGTH = 32
 AES_IV_BYTES = 16
+# LambdaBase で利用する private_eth_address のコンテナ内キャッシュ
+PRIVATE_ETH_ADDRESS_CACHE_MAX_SIZE = 1000
+PRIVATE_ETH_ADDRESS_CACHE_TTL = 300
+# SCREENED_ARTICLE テーブルの各行のコンテナ内キャッシュの有効期間（秒）
+SCREENED_ARTICLE_CACHE_TTL = 60
+# ESUtil で利用するインデックス（エイリアス）の解決結果のコンテナ内キャッシュ
+ES_INDEX_CACHE_MAX_SIZE = 100
+ES_INDEX_CACHE_TTL = 30
+# users インデックスの search_name の n-gram サブフィールドへの移行完了を示すマッピングの _meta のキー
+USERS_SEARCH_NAME_NGRAM_META_KEY = 'search_name_ngram_ready'
+# ESUtil の cursor（search_after）ページングで並び順を一意にするために追加するソート条件
+ES_ARTICLE_CURSOR_TIEBREAKER = [{'article_id.keyword': {'order': 'asc', 'unmapped_type': 'keyword'}}]
+ES_TAG_CURSOR_TIEBREAKER = [{'name': 'asc'}, {'created_at': 'asc'}]
+# ESUtil で記事を検索する際に取得する _source の項目（本文等の不要な項目は取得しない）
+# API の fields パラメータでは、この中から取得する項目を指定できる
+ES_ARTICLE_SOURCE_FIELDS = [
+    'article_id',
+    'user_id',
+    'status',
+    'title',
+    'overview',
+    'eye_catch_url',
+    'created_at',
+    'published_at',
+    'sort_key',
+    'topic',
+    'tags',
+    'version',
+    'price',
+    'tip_value'
+]
+ES_POPULAR_ARTICLE_SOURCE_FIELDS = ES_ARTICLE_SOURCE_FIELDS + ['article_score']
+ES_TIP_RANKED_ARTICLE_SOURCE_FIELDS = ES_ARTICLE_SOURCE_FIELDS + ['sort_tip_value']
+# labo/n/random で抽出元とする記事の候補（無作為に抽出した article_id）の件数と、コンテナ内で再抽出するまでの秒数
+LABO_RANDOM_ARTICLE_POOL_SIZE = 1000
+LABO_RANDOM_ARTICLE_POOL_TTL = 300
+# labo/n/random で候補の記事が取得できなかった場合（非公開化等）に、別の候補を選び直す回数の上限
+LABO_RANDOM_ARTICLE_MAX_PICK = 3
+# PrivateChainUtil.send_transaction の接続・読み込みのタイムアウト（秒）と、コンテナ内で保持する接続数の上限
+PRIVATE_CHAIN_CONNECT_TIMEOUT = 3.05
+PRIVATE_CHAIN_READ_TIMEOUT = 20
+PRIVATE_CHAIN_HTTP_POOL_MAX_SIZE = 10
+# 残高の取得等、冪等な private chain の呼び出しをリトライする回数と待機時間の基準値（秒）、リトライ対象のステータスコード
+PRIVATE_CHAIN_READ_MAX_RETRY = 2
+PRIVATE_CHAIN_READ_RETRY_BASE_WAIT = 0.1
+PRIVATE_CHAIN_RETRY_STATUS_CODES = [502, 503, 504]
+# LambdaBase の処理時間メトリクス（CloudWatch Embedded Metric Format）の名前空間
+LAMBDA_METRICS_NAMESPACE = 'ALIS/Lambda'
 DYNAMO_BATCH_GET_MAX = 100
+DYNAMO_BATCH_GET_MAX_WORKERS = 4
+DYNAMO_BATCH_GET_MAX_RETRY = 5
+DYNAMO_BATCH_GET_RETRY_BASE_WAIT = 0.05
+# DBUtil.query_with_limit で 2 ページ目以降に指定する Limit の上限
+DYNAMO_QUERY_MAX_PAGE_SIZE = 100
+# DBUtil.scan_all_items_parallel の既定の分割数と並列数
+DYNAMO_PARALLEL_SCAN_TOTAL_SEGMENTS = 4
+DYNAMO_PARALLEL_SCAN_MAX_WORKERS = 4
+DYNAMO_PARALLEL_SCAN_QUEUE_TIMEOUT = 0.1
 
 POLLING_INITIAL_COUNT = 0
 POLLING_MAX_COUNT = 10
@@ -432,7 +504,17 @@ ARTICLE_PURCHASE_ERROR_TYPE = 'purchase_error'
 # Private chain
 HISTORY_RANGE_DAYS = 30
 AVERAGE_BLOCK_TIME = 30
-TRANSACTION_CONFIRM_COUNT = 5
+# PrivateChainUtil.wait_for_transactions で receipt を確認する回数の上限と、待機時間（秒）の初期値・上限・全体の期限
+TRANSACTION_CONFIRM_COUNT = 10
+TRANSACTION_RECEIPT_INITIAL_INTERVAL = 0.2
+TRANSACTION_RECEIPT_MAX_INTERVAL = 1
+TRANSACTION_RECEIPT_DEADLINE = 5
+# PrivateChainUtil.parse_raw_transaction でデコード・署名者の復元結果をコンテナ内に保持する件数と有効期間（秒）
+RAW_TRANSACTION_CACHE_SIZE = 64
+RAW_TRANSACTION_CACHE_TTL = 300
+# 全トークン履歴の csv 出力で、ブロック番号毎の timestamp をコンテナ内に保持する件数と getBlock の並列数
+BLOCK_TIMESTAMP_CACHE_SIZE = 100000
+BLOCK_TIMESTAMP_FETCH_MAX_WORKERS = 8
 
 AUTHLETE_CLIENT_ENDPOINT = 'https://api.authlete.com/api/client'
 AUTHLETE_SCOPE_READ = 'read'
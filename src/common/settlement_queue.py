@@ -0,0 +1,51 @@
+import os
+import json
+import boto3
+
+
+class SettlementQueue:
+    # 投げ銭・記事購入の非同期決済（トランザクションの承認待ち・バーン・ステータス更新）を settlement worker に依頼するキュー
+    # 環境変数 SETTLEMENT_QUEUE_URL が設定されている場合は SQS に送信する
+    # テスト・ローカル環境では backend を LocalSettlementQueue 等の send(message) を持つオブジェクトに差し替える
+    backend = None
+
+    @classmethod
+    def is_enabled(cls):
+        return cls.backend is not None or bool(os.environ.get('SETTLEMENT_QUEUE_URL'))
+
+    @classmethod
+    def send(cls, message):
+        if cls.backend is None:
+            cls.backend = SqsSettlementQueue(os.environ['SETTLEMENT_QUEUE_URL'])
+        cls.backend.send(message)
+
+
+class SqsSettlementQueue:
+    def __init__(self, queue_url):
+        self.queue_url = queue_url
+        self.sqs = boto3.client('sqs')
+
+    def send(self, message):
+        self.sqs.send_message(
+            QueueUrl=self.queue_url,
+            MessageBody=json.dumps(message)
+        )
+
+
+class LocalSettlementQueue:
+    # SQS の代替となるメモリ上のキュー
+    # to_event で送信済みのメッセージを取り出し、settlement worker が受け取る SQS イベントと同じ形式で返却する
+    # receive_count には SQS の受信回数（ApproximateReceiveCount）として設定する値を指定する
+    def __init__(self):
+        self.messages = []
+
+    def send(self, message):
+        self.messages.append(json.dumps(message))
+
+    def to_event(self, receive_count=1):
+        records = [
+            {'messageId': str(i), 'body': body, 'attributes': {'ApproximateReceiveCount': str(receive_count)}}
+            for i, body in enumerate(self.messages)
+        ]
+        self.messages = []
+        return {'Records': records}
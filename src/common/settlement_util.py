@@ -0,0 +1,169 @@
+import os
+import time
+import hashlib
+import logging
+import traceback
+import settings
+from private_chain_util import PrivateChainUtil
+from time_util import TimeUtil
+from exceptions import SendTransactionError, ReceiptError
+
+
+class SettlementUtil:
+    # 投げ銭・記事購入で送信済みのトランザクションの承認以降の処理（バーン・ステータス更新・通知）
+    # 同期的に処理する API と、非同期決済を行う settlement worker の双方から利用する
+
+    @staticmethod
+    def get_transaction_status(transaction):
+        try:
+            if PrivateChainUtil.is_transaction_completed(transaction):
+                return 'done'
+            return 'doing'
+        except (SendTransactionError, ReceiptError) as e:
+            logging.info(e)
+            return 'fail'
+
+    @staticmethod
+    def settle_tip(dynamodb, user_id, sort_key, transaction_status, burn_signed_transaction):
+        # 非同期決済で作成した承認待ち（settlement_status が pending）の投げ銭データを更新する
+        # 承認待ちの間は設定していない uncompleted を設定し、uncompleted-index を参照するバッチの処理対象とする
+        burn_transaction = None
+        # 投げ銭が成功した時のみバーン処理を行う
+        if transaction_status == 'done':
+            try:
+                burn_transaction = PrivateChainUtil.send_raw_transaction(burn_signed_transaction)
+            except Exception as err:
+                logging.fatal(err)
+                traceback.print_exc()
+        else:
+            logging.info('Burn was not executed because tip transaction was uncompleted.')
+
+        tip_table = dynamodb.Table(os.environ['TIP_TABLE_NAME'])
+        tip_table.update_item(
+            Key={
+                'user_id': user_id,
+                'sort_key': sort_key
+            },
+            UpdateExpression='set burn_transaction = :burn_transaction, settlement_status = :settlement_status, '
+                             'uncompleted = :uncompleted',
+            ConditionExpression='settlement_status = :pending',
+            ExpressionAttributeValues={
+                ':burn_transaction': burn_transaction,
+                ':settlement_status': transaction_status,
+                ':uncompleted': 1,
+                ':pending': 'pending'
+            }
+        )
+
+    @classmethod
+    def settle_purchase(cls, dynamodb, article_info, user_id, sort_key, transaction_status, burn_signed_transaction):
+        paid_articles_table = dynamodb.Table(os.environ['PAID_ARTICLES_TABLE_NAME'])
+        paid_status_table = dynamodb.Table(os.environ['PAID_STATUS_TABLE_NAME'])
+        # トランザクションの承認状態をpaid_articleとpaid_statusに格納
+        cls.__update_transaction_status(article_info, paid_articles_table, transaction_status, sort_key,
+                                        paid_status_table, user_id)
+
+        # 購入のトランザクションが成功した時のみバーンのトランザクションを発行する
+        if transaction_status == 'done':
+            try:
+                # 購入に成功した場合、著者の未読通知フラグをTrueにする
+                cls.__update_unread_notification_manager(dynamodb, article_info['user_id'])
+                # 著者へ通知を作成
+                cls.__notify_author(dynamodb, article_info, user_id)
+                # バーンのトランザクション処理
+                burn_transaction = PrivateChainUtil.send_raw_transaction(burn_signed_transaction)
+                # バーンのトランザクションを購入テーブルに格納
+                cls.__add_burn_transaction_to_paid_article(burn_transaction, paid_articles_table,
+                                                           article_info, sort_key)
+            except Exception as err:
+                logging.fatal(err)
+                traceback.print_exc()
+        # 記事購入者へは購入処理中の場合以外で通知を作成
+        if transaction_status == 'done' or transaction_status == 'fail':
+            cls.__update_unread_notification_manager(dynamodb, user_id)
+            cls.__notify_purchaser(dynamodb, article_info, user_id, transaction_status)
+
+    @staticmethod
+    def __add_burn_transaction_to_paid_article(burn_transaction, paid_articles_table, article_info, sort_key):
+        burn_transaction = {
+            ':burn_transaction': burn_transaction
+        }
+        paid_articles_table.update_item(
+            Key={
+                'article_id': article_info['article_id'],
+                'sort_key': sort_key
+            },
+            UpdateExpression="set burn_transaction = :burn_transaction",
+            ExpressionAttributeValues=burn_transaction
+        )
+
+    @staticmethod
+    def __update_transaction_status(article_info, paid_articles_table, transaction_status, sort_key,
+                                    paid_status_table, user_id):
+        paid_articles_table.update_item(
+            Key={
+                'article_id': article_info['article_id'],
+                'sort_key': sort_key
+            },
+            UpdateExpression="set #attr = :transaction_status",
+            ExpressionAttributeNames={'#attr': 'status'},
+            ExpressionAttributeValues={':transaction_status': transaction_status}
+        )
+
+        # lock用のpaid_statusの:statusを更新
+        paid_status_table.update_item(
+            Key={
+                'article_id': article_info['article_id'],
+                'user_id': user_id
+            },
+            UpdateExpression="set #attr = :transaction_status",
+            ExpressionAttributeNames={'#attr': 'status'},
+            ExpressionAttributeValues={':transaction_status': transaction_status}
+        )
+
+    @staticmethod
+    def __update_unread_notification_manager(dynamodb, user_id):
+        unread_notification_manager_table = dynamodb.Table(os.environ['UNREAD_NOTIFICATION_MANAGER_TABLE_NAME'])
+        unread_notification_manager_table.update_item(
+            Key={'user_id': user_id},
+            UpdateExpression='set unread = :unread',
+            ExpressionAttributeValues={':unread': True}
+        )
+
+    @classmethod
+    def __notify_author(cls, dynamodb, article_info, user_id):
+        notification_table = dynamodb.Table(os.environ['NOTIFICATION_TABLE_NAME'])
+
+        notification_table.put_item(Item={
+            'notification_id': cls.__get_randomhash(),
+            'user_id': article_info['user_id'],
+            'acted_user_id': user_id,
+            'article_id': article_info['article_id'],
+            'article_user_id': article_info['user_id'],
+            'article_title': article_info['title'],
+            'sort_key': TimeUtil.generate_sort_key(),
+            'type': settings.ARTICLE_PURCHASED_TYPE,
+            'price': int(article_info['price']),
+            'created_at': int(time.time())
+        })
+
+    @classmethod
+    def __notify_purchaser(cls, dynamodb, article_info, user_id, transaction_status):
+        notification_table = dynamodb.Table(os.environ['NOTIFICATION_TABLE_NAME'])
+
+        notification_table.put_item(Item={
+            'notification_id': cls.__get_randomhash(),
+            'user_id': user_id,
+            'acted_user_id': user_id,
+            'article_id': article_info['article_id'],
+            'article_user_id': article_info['user_id'],
+            'article_title': article_info['title'],
+            'sort_key': TimeUtil.generate_sort_key(),
+            'type': settings.ARTICLE_PURCHASE_TYPE if transaction_status == 'done' else settings.ARTICLE_PURCHASE_ERROR_TYPE,
+            'price': int(article_info['price']),
+            'created_at': int(time.time())
+        })
+
+    @staticmethod
+    def __get_randomhash():
+        return hashlib.sha256((str(time.time()) + str(os.urandom(16))).encode('utf-8')).hexdigest()
@@ -0,0 +1,34 @@
+class TagLookupMemo:
+    # 1 invocation 内で TagUtil により検索したタグ（大文字小文字を区別しない検索の結果）を正規化済みのタグ名単位で保持する
+    # 記事の公開処理等で、タグ名の照合（get_tags_with_name_collation）と件数の更新（create_and_count）が同じタグを再検索しないようにする
+    # LambdaBase.main で invocation 毎に生成・破棄する。memo が有効でない場合は都度 Elasticsearch から取得する
+    current = None
+
+    def __init__(self):
+        self.tags = {}
+
+    @classmethod
+    def start(cls):
+        cls.current = cls()
+        return cls.current
+
+    @classmethod
+    def stop(cls):
+        cls.current = None
+
+    @classmethod
+    def get_many(cls, keys):
+        # memo 済みのキーのみを dict で返却する（存在しないタグは None として memo されている）
+        memo = cls.current
+        if memo is None:
+            return {}
+
+        return {key: memo.tags[key] for key in keys if key in memo.tags}
+
+    @classmethod
+    def set_many(cls, tags):
+        memo = cls.current
+        if memo is None:
+            return
+
+        memo.tags.update(tags)
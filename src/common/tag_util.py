@@ -3,6 +3,7 @@ import time
 import settings
 from jsonschema import ValidationError
 from web3_util import Web3Util
+from tag_lookup_memo import TagLookupMemo
 
 
 class TagUtil:
@@ -14,39 +15,38 @@ class TagUtil:
         if after_tag_names is None:
             after_tag_names = []
 
-        for tag_name in after_tag_names:
-            if before_tag_names is None or tag_name not in before_tag_names:
+        added_tag_names = [tag_name for tag_name in after_tag_names if tag_name not in before_tag_names]
+        removed_tag_names = [tag_name for tag_name in before_tag_names if tag_name not in after_tag_names]
 
-                # 大文字小文字区別せずに存在チェックを行いDB(ES)にすでに存在する値を取得する
-                tag = cls.__get_item_case_insensitive(elasticsearch, tag_name)
+        # 大文字小文字区別せずに存在チェックを行い、DB(ES)にすでに存在する値をまとめて取得する
+        tags = cls.get_items_case_insensitive(elasticsearch, added_tag_names + removed_tag_names)
 
-                if tag:
-                    # タグが追加された場合カウントを+1する
-                    cls.update_count(elasticsearch, tag['name'], 1)
-                # タグがDB(ES)に存在しない場合は新規作成する
-                else:
-                    cls.create_tag(elasticsearch, tag_name)
+        actions = []
+        for tag_name in added_tag_names:
+            tag = tags.get(tag_name)
+            if tag:
+                # タグが追加された場合カウントを+1する
+                actions.extend(cls.__get_update_count_actions(tag['name'], 1))
+            # タグがDB(ES)に存在しない場合は新規作成する
+            else:
+                actions.extend(cls.__get_create_tag_actions(tag_name))
 
         # タグが外された場合カウントを-1する
-        for tag_name in before_tag_names:
-            if tag_name not in after_tag_names:
-                tag = cls.__get_item_case_insensitive(elasticsearch, tag_name)
-                if tag and tag['count'] > 0:
-                    cls.update_count(elasticsearch, tag['name'], -1)
+        for tag_name in removed_tag_names:
+            tag = tags.get(tag_name)
+            if tag and tag['count'] > 0:
+                actions.extend(cls.__get_update_count_actions(tag['name'], -1))
+
+        # 作成・カウントの更新は _bulk でまとめて行う
+        if actions:
+            res = elasticsearch.bulk(body=actions)
+            if res['errors']:
+                errors = [result for item in res['items'] for result in item.values() if 'error' in result]
+                raise Exception(f'Failed to update tags: {errors}')
 
     @classmethod
     def update_count(cls, elasticsearch, tag_name, num):
-        update_script = {
-            'script': {
-                'source': 'ctx._source.count += params.count',
-                'lang': 'painless',
-                'params': {
-                    'count': num
-                }
-            }
-        }
-
-        elasticsearch.update(index='tags', doc_type='tag', id=tag_name, body=update_script)
+        elasticsearch.update(index='tags', doc_type='tag', id=tag_name, body=cls.__get_update_count_script(num))
 
     """
     ここで作成されたtagが検索対象になるまで(__get_item_case_insensitiveの条件として引っかかってくるまで)1sほどかかる
@@ -55,12 +55,7 @@ class TagUtil:
     """
     @classmethod
     def create_tag(cls, elasticsearch, tag_name):
-        tag = {
-            'name': tag_name,
-            'name_with_analyzer': tag_name,
-            'count': 1,
-            'created_at': int(time.time())
-        }
+        tag = cls.__get_new_tag(tag_name)
 
         elasticsearch.index(
             index='tags',
@@ -78,17 +73,51 @@ class TagUtil:
         if not tag_names:
             return tag_names
 
-        results = []
+        tags = cls.get_items_case_insensitive(elasticsearch, tag_names)
 
-        for tag_name in tag_names:
-            tag = cls.__get_item_case_insensitive(elasticsearch, tag_name)
+        return [tags[tag_name]['name'] if tags[tag_name] else tag_name for tag_name in tag_names]
 
-            if tag:
-                results.append(tag['name'])
-            else:
-                results.append(tag_name)
+    """
+    与えられたタグ名をElasticSearchに問い合わせ(大文字小文字区別せず)、タグ名をキーとした dict で返却する（存在しない場合は None）
+    正規化済みの name フィールドへの 1 回の terms クエリでまとめて検索し、同一 invocation 内では TagLookupMemo により結果を共有する
+    作成・更新したタグが検索対象になるまでには時間がかかるため（create_tag を参照）、memo した結果を更新後に利用しても検索結果と同等となる
+    """
+    @classmethod
+    def get_items_case_insensitive(cls, elasticsearch, tag_names):
+        keys = {tag_name: cls.__normalize(tag_name) for tag_name in tag_names}
+
+        items = TagLookupMemo.get_many(keys.values())
+        search_keys = list(dict.fromkeys(key for key in keys.values() if key not in items))
+
+        if search_keys:
+            body = {
+                'query': {
+                    'bool': {
+                        'filter': [
+                            {'terms': {'name': search_keys}}
+                        ]
+                    }
+                },
+                'size': settings.TAG_CASE_INSENSITIVE_SEARCH_SIZE
+            }
+
+            res = elasticsearch.search(
+                index='tags',
+                doc_type='tag',
+                body=body
+            )
+
+            searched_items = {key: None for key in search_keys}
+            for item in res['hits']['hits']:
+                key = cls.__normalize(item['_source']['name'])
+                # 大文字小文字違いのタグが複数存在する場合は、従来どおり最初にヒットしたものを利用する
+                if key in searched_items and searched_items[key] is None:
+                    searched_items[key] = item['_source']
 
-        return results
+            TagLookupMemo.set_many(searched_items)
+            items.update(searched_items)
+
+        return {tag_name: items[key] for tag_name, key in keys.items()}
 
     @staticmethod
     def validate_tags(tags, user_id=None):
@@ -110,27 +139,43 @@ class TagUtil:
             if len(set(settings.VIP_TAG_BADGE_TYPES) & set(user_types)) <= 0:
                 raise ValidationError(f"Tag name {settings.VIP_TAG_NAME} is not available")
 
+    @staticmethod
+    def __normalize(tag_name):
+        # name フィールドの lowercase_normalizer（1 文字単位の小文字化）と同じ結果となるよう 1 文字ずつ変換する
+        return ''.join(c.lower()[0] for c in tag_name)
+
     @classmethod
-    def __get_item_case_insensitive(cls, elasticsearch, tag_name):
-        body = {
-            'query': {
-                'bool': {
-                    'must': [
-                        {'term': {'name': tag_name}}
-                    ]
+    def __get_update_count_actions(cls, tag_name, num):
+        return [
+            {'update': {'_index': 'tags', '_type': 'tag', '_id': tag_name}},
+            cls.__get_update_count_script(num)
+        ]
+
+    @classmethod
+    def __get_create_tag_actions(cls, tag_name):
+        tag = cls.__get_new_tag(tag_name)
+        return [
+            {'index': {'_index': 'tags', '_type': 'tag', '_id': tag['name']}},
+            tag
+        ]
+
+    @staticmethod
+    def __get_update_count_script(num):
+        return {
+            'script': {
+                'source': 'ctx._source.count += params.count',
+                'lang': 'painless',
+                'params': {
+                    'count': num
                 }
             }
         }
 
-        res = elasticsearch.search(
-            index='tags',
-            doc_type='tag',
-            body=body
-        )
-
-        tags = [item['_source'] for item in res['hits']['hits']]
-
-        if not tags:
-            return None
-
-        return tags[0]
+    @staticmethod
+    def __get_new_tag(tag_name):
+        return {
+            'name': tag_name,
+            'name_with_analyzer': tag_name,
+            'count': 1,
+            'created_at': int(time.time())
+        }
@@ -0,0 +1,47 @@
+import time
+import threading
+from collections import OrderedDict
+from lambda_metrics import LambdaMetrics
+
+
+class TTLCache:
+    # Lambda のコンテナ内（ウォームスタート間）で値を共有するための LRU + TTL キャッシュ
+    # max_size を超えた場合は最も参照されていない値から破棄し、ttl（秒）を過ぎた値は参照時に破棄する
+    # ヒット数・ミス数は name を接頭辞として、実行中の invocation の LambdaMetrics に出力する
+    # 有効期限はシステム時刻の変更の影響を受けないよう time.monotonic() で判定する
+    def __init__(self, name, max_size, ttl):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.__items = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.__lock:
+            item = self.__items.get(key)
+            if item is not None and item[1] <= time.monotonic():
+                del self.__items[key]
+                item = None
+
+            if item is None:
+                LambdaMetrics.add_current(self.name + '_cache_misses', 1)
+                return default
+
+            self.__items.move_to_end(key)
+            LambdaMetrics.add_current(self.name + '_cache_hits', 1)
+            return item[0]
+
+    def set(self, key, value):
+        with self.__lock:
+            self.__items[key] = (value, time.monotonic() + self.ttl)
+            self.__items.move_to_end(key)
+            while len(self.__items) > self.max_size:
+                self.__items.popitem(last=False)
+
+    def delete(self, key):
+        with self.__lock:
+            self.__items.pop(key, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__items.clear()
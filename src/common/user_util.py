@@ -13,9 +13,14 @@ from record_not_found_error import RecordNotFoundError
 from not_authorized_error import NotAuthorizedError
 from not_verified_user_error import NotVerifiedUserError
 from boto3.dynamodb.conditions import Key
+from ttl_cache import TTLCache
+from dynamodb_item_memo import DynamoDBItemMemo
 
 
 class UserUtil:
+    # principal_id（user_id）をキーとした private_eth_address のコンテナ内キャッシュ
+    private_eth_address_cache = TTLCache('private_eth_address', settings.PRIVATE_ETH_ADDRESS_CACHE_MAX_SIZE,
+                                         settings.PRIVATE_ETH_ADDRESS_CACHE_TTL)
 
     @staticmethod
     def verified_phone_and_email(event):
@@ -43,9 +48,7 @@ class UserUtil:
     def exists_private_eth_address(dynamodb, user_id):
         # validate exists private_eth_address
         user_configurations_table = dynamodb.Table(os.environ['USER_CONFIGURATIONS_TABLE_NAME'])
-        user_configurations = user_configurations_table.get_item(Key={
-            'user_id': user_id
-        }).get('Item')
+        user_configurations = DynamoDBItemMemo.get_item(user_configurations_table, {'user_id': user_id})
         if user_configurations is not None and user_configurations.get('private_eth_address') is not None:
             return True
         return False
@@ -58,13 +61,28 @@ class UserUtil:
     @staticmethod
     def get_private_eth_address_from_db(dynamodb, user_id):
         user_configurations_table = dynamodb.Table(os.environ['USER_CONFIGURATIONS_TABLE_NAME'])
-        user_configurations = user_configurations_table.get_item(Key={
-            'user_id': user_id
-        }).get('Item')
+        user_configurations = DynamoDBItemMemo.get_item(user_configurations_table, {'user_id': user_id})
         if user_configurations is not None and user_configurations.get('private_eth_address') is not None:
             return user_configurations.get('private_eth_address')
         return None
 
+    @staticmethod
+    def get_private_eth_address_with_cache(dynamodb, user_id):
+        address = UserUtil.private_eth_address_cache.get(user_id)
+        if address is not None:
+            return address
+
+        address = UserUtil.get_private_eth_address_from_db(dynamodb, user_id)
+        # private_eth_address は一度登録されると変更されないため、存在する場合のみキャッシュする
+        # 未登録の状態をキャッシュすると、別コンテナで登録された直後も未登録として扱われてしまうためキャッシュしない
+        if address is not None:
+            UserUtil.private_eth_address_cache.set(user_id, address)
+        return address
+
+    @staticmethod
+    def invalidate_private_eth_address_cache(user_id):
+        UserUtil.private_eth_address_cache.delete(user_id)
+
     @staticmethod
     def get_cognito_user_info(cognito, user_id):
         try:
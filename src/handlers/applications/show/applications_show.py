@@ -2,8 +2,6 @@ import os
 import json
 import requests
 import settings
-from jsonschema import validate
-from parameter_util import ParameterUtil
 from authlete_util import AuthleteUtil
 from lambda_base import LambdaBase
 
@@ -19,8 +17,8 @@ class ApplicationShow(LambdaBase):
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
-        validate(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         try:
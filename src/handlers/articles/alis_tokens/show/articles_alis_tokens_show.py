@@ -4,8 +4,8 @@ import json
 import settings
 from db_util import DBUtil
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
-from decimal_encoder import DecimalEncoder
+from jsonschema import ValidationError
+from json_util import JsonUtil
 
 
 class ArticlesAlisTokensShow(LambdaBase):
@@ -25,7 +25,7 @@ class ArticlesAlisTokensShow(LambdaBase):
         if params is None:
             raise ValidationError('pathParameters is required')
 
-        validate(params, self.get_schema())
+        self.validate_schema(params)
         # relation
         DBUtil.validate_article_existence(
             self.dynamodb,
@@ -59,5 +59,5 @@ class ArticlesAlisTokensShow(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps(responce['Item'], cls=DecimalEncoder)
+            'body': JsonUtil.dumps(responce['Item'])
         }
@@ -1,13 +1,13 @@
 # -*- coding: utf-8 -*-
 import os
-import json
 import settings
 from db_util import DBUtil
+from jsonschema import ValidationError
+from record_not_found_error import RecordNotFoundError
 from lambda_base import LambdaBase
 from boto3.dynamodb.conditions import Key
-from jsonschema import validate
-from decimal_encoder import DecimalEncoder
-from parameter_util import ParameterUtil
+from concurrent.futures import ThreadPoolExecutor
+from json_util import JsonUtil
 
 
 class ArticlesCommentsIndex(LambdaBase):
@@ -18,24 +18,57 @@ class ArticlesCommentsIndex(LambdaBase):
                 'limit': settings.parameters['limit'],
                 'article_id': settings.parameters['article_id'],
                 'comment_id': settings.parameters['comment']['comment_id'],
-                'sort_key': settings.parameters['sort_key']
+                'sort_key': settings.parameters['sort_key'],
+                'reply_limit': settings.parameters['limit'],
+                'parent_id': settings.parameters['comment']['comment_id'],
+                'reply_comment_id': settings.parameters['comment']['comment_id'],
+                'reply_sort_key': settings.parameters['sort_key']
             },
             'required': ['article_id']
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
-        validate(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
+        self.validate_schema(self.params)
+
+        if (self.params.get('reply_comment_id') is not None or self.params.get('reply_sort_key') is not None) \
+                and self.params.get('parent_id') is None:
+            raise ValidationError('parent_id is required')
+
+        # 返信の続きの取得位置は reply_comment_id と reply_sort_key の両方で指定する
+        if (self.params.get('reply_comment_id') is None) != (self.params.get('reply_sort_key') is None):
+            raise ValidationError('reply_comment_id and reply_sort_key are required together')
 
         DBUtil.validate_article_existence(self.dynamodb, self.params['article_id'], status='public')
 
+        if self.params.get('parent_id') is not None:
+            parent_comment = DBUtil.get_validated_comment(self.dynamodb, self.params['parent_id'])
+            if parent_comment['article_id'] != self.params['article_id'] or parent_comment.get('parent_id'):
+                raise RecordNotFoundError('Record Not Found')
+
     def exec_main_proc(self):
+        # parent_id が指定された場合は、対象スレッドの返信の続きのみを返却する
+        if self.params.get('parent_id') is not None:
+            comment_table = self.dynamodb.Table(os.environ['COMMENT_TABLE_NAME'])
+            exclusive_start_key = None
+            if self.params.get('reply_comment_id') is not None:
+                exclusive_start_key = {
+                    'comment_id': self.params['reply_comment_id'],
+                    'parent_id': self.params['parent_id'],
+                    'sort_key': int(self.params['reply_sort_key'])
+                }
+
+            return {
+                'statusCode': 200,
+                'body': JsonUtil.dumps(self.__get_replies(comment_table, self.params['parent_id'], exclusive_start_key))
+            }
+
         response = self.__get_parent_comments()
         response['Items'] = self.__get_comments_with_replies(response['Items'])
 
         return {
             'statusCode': 200,
-            'body': json.dumps(response, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(response)
         }
 
     def __get_parent_comments(self):
@@ -46,7 +79,6 @@ class ArticlesCommentsIndex(LambdaBase):
             limit = int(self.params.get('limit'))
 
         query_params = {
-            'Limit': limit,
             'IndexName': 'article_id-sort_key-index',
             'KeyConditionExpression': Key('article_id').eq(self.params.get('article_id')),
             'FilterExpression': 'attribute_not_exists(parent_id)',
@@ -62,45 +94,61 @@ class ArticlesCommentsIndex(LambdaBase):
 
             query_params.update({'ExclusiveStartKey': last_evaluated_key})
 
-        response = comment_table.query(**query_params)
-
-        items = response['Items']
-
-        while 'LastEvaluatedKey' in response and len(response['Items']) < limit:
-            query_params.update({'ExclusiveStartKey': response['LastEvaluatedKey']})
-            response = comment_table.query(**query_params)
-            items.extend(response['Items'])
-
-            if len(items) >= limit:
-                last_evaluated_key = {
-                    'comment_id': items[limit - 1]['comment_id'],
-                    'article_id': items[limit - 1]['article_id'],
-                    'sort_key': int(items[limit - 1]['sort_key'])
-                }
-                response.update({'LastEvaluatedKey': last_evaluated_key})
-                break
-
-        response['Items'] = items[:limit]
+        response = DBUtil.query_with_limit(comment_table, query_params, limit)
 
         return response
 
     def __get_comments_with_replies(self, comments):
+        if not comments:
+            return comments
+
         comment_table = self.dynamodb.Table(os.environ['COMMENT_TABLE_NAME'])
 
-        items = []
+        # コメント毎の返信の取得は互いに依存しないため並列に実行する
+        max_workers = min(len(comments), settings.COMMENT_REPLIES_MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses = list(executor.map(
+                lambda comment: self.__get_replies(comment_table, comment['comment_id']),
+                comments
+            ))
 
-        for comment in comments:
-            query_params = {
-                'IndexName': 'parent_id-sort_key-index',
-                'KeyConditionExpression': Key('parent_id').eq(comment['comment_id']),
-                'ScanIndexForward': False
-            }
+        for comment, response in zip(comments, responses):
+            if response['Items']:
+                comment['replies'] = response['Items']
+            # 返信の続きが存在する場合は、続きを取得するためのキーを付与する
+            if 'LastEvaluatedKey' in response:
+                comment['replies_last_evaluated_key'] = response['LastEvaluatedKey']
 
-            replies = comment_table.query(**query_params)['Items']
+        return comments
 
-            if replies:
-                comment['replies'] = replies
+    def __get_replies(self, comment_table, parent_id, exclusive_start_key=None):
+        query_params = {
+            'IndexName': 'parent_id-sort_key-index',
+            'KeyConditionExpression': Key('parent_id').eq(parent_id),
+            'ScanIndexForward': False
+        }
 
-            items.append(comment)
+        reply_limit = int(self.params['reply_limit']) if self.params.get('reply_limit') else None
+        if reply_limit is not None:
+            # DynamoDB は Limit 件で打ち切った場合、続きが存在しなくても LastEvaluatedKey を返却するため、
+            # 1 件多く取得して続きの有無を判定する
+            query_params.update({'Limit': reply_limit + 1})
+
+        if exclusive_start_key is not None:
+            query_params.update({'ExclusiveStartKey': exclusive_start_key})
+
+        # コメント毎に並列に実行されるため、スレッドセーフではない Table ではなく、Table が持つ client を利用する
+        response = comment_table.meta.client.query(
+            TableName=comment_table.name,
+            **DBUtil.build_condition_expressions(query_params)
+        )
+
+        if reply_limit is not None and len(response['Items']) > reply_limit:
+            # 返却する最後の返信を起点に続きを取得できるよう LastEvaluatedKey を作成する
+            last_item = response['Items'][reply_limit - 1]
+            return {
+                'Items': response['Items'][:reply_limit],
+                'LastEvaluatedKey': {key: last_item[key] for key in ['comment_id', 'parent_id', 'sort_key']}
+            }
 
-        return items
+        return {key: response[key] for key in ['Items', 'LastEvaluatedKey'] if key in response}
@@ -2,9 +2,10 @@ import json
 import os
 import settings
 
-from jsonschema import validate
-from decimal_encoder import DecimalEncoder
+from db_util import DBUtil
+from json_util import JsonUtil
 from lambda_base import LambdaBase
+from screened_article_cache import ScreenedArticleCache
 
 
 class ArticlesEyecatch(LambdaBase):
@@ -18,35 +19,26 @@ class ArticlesEyecatch(LambdaBase):
         }
 
     def validate_params(self):
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
-        screened_article_table = self.dynamodb.Table(os.environ['SCREENED_ARTICLE_TABLE_NAME'])
-        eyecatch_articles = screened_article_table.get_item(Key={'article_type': 'eyecatch'}).get('Item')
+        eyecatch_article_ids = ScreenedArticleCache.get_eyecatch_article_ids(self.dynamodb, self.params['topic'])
 
-        if not eyecatch_articles \
-                or not eyecatch_articles.get('articles') \
-                or not eyecatch_articles.get('articles').get(self.params['topic']):
+        if not eyecatch_article_ids:
             items = []
             return {
                 'statusCode': 200,
                 'body': json.dumps({'Items': items})
             }
 
-        items = [self.__get_public_article(article_id) for article_id in
-                 eyecatch_articles.get('articles').get(self.params['topic'])]
-        items = [item for item in items if item is not None]
+        items = DBUtil.batch_get_items(
+            self.dynamodb,
+            os.environ['ARTICLE_INFO_TABLE_NAME'],
+            [{'article_id': article_id} for article_id in eyecatch_article_ids]
+        )
+        items = [item for item in items if item['status'] == 'public']
 
         return {
             'statusCode': 200,
-            'body': json.dumps({'Items': items}, cls=DecimalEncoder)
+            'body': JsonUtil.dumps({'Items': items})
         }
-
-    def __get_public_article(self, article_id):
-        article_info_table = self.dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
-        article_info = article_info_table.get_item(Key={'article_id': article_id}).get('Item')
-
-        if not article_info or not article_info['status'] == 'public':
-            return None
-
-        return article_info
@@ -1,12 +1,11 @@
 # -*- coding: utf-8 -*-
-import json
 import os
 import settings
 from db_util import DBUtil
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from boto3.dynamodb.conditions import Key
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 
 
 class ArticlesLikesShow(LambdaBase):
@@ -23,7 +22,7 @@ class ArticlesLikesShow(LambdaBase):
         # single
         if self.event.get('pathParameters') is None:
             raise ValidationError('pathParameters is required')
-        validate(self.event.get('pathParameters'), self.get_schema())
+        self.validate_schema(self.event.get('pathParameters'))
         # relation
 
         DBUtil.validate_article_existence(
@@ -42,5 +41,5 @@ class ArticlesLikesShow(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps({'count': response['Count']}, cls=DecimalEncoder)
+            'body': JsonUtil.dumps({'count': response['Count']})
         }
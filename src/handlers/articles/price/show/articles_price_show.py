@@ -4,8 +4,7 @@ import json
 import settings
 from db_util import DBUtil
 from lambda_base import LambdaBase
-from jsonschema import validate
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 
 
 class ArticlesPriceShow(LambdaBase):
@@ -20,7 +19,7 @@ class ArticlesPriceShow(LambdaBase):
 
     def validate_params(self):
         # single
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
         # relation
         DBUtil.validate_article_existence(
             self.dynamodb,
@@ -48,5 +47,5 @@ class ArticlesPriceShow(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps(response, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(response)
         }
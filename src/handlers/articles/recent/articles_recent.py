@@ -1,10 +1,8 @@
 # -*- coding: utf-8 -*-
-import json
 import settings
 from db_util import DBUtil
 from lambda_base import LambdaBase
-from jsonschema import validate
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from parameter_util import ParameterUtil
 from es_util import ESUtil
 
@@ -16,14 +14,18 @@ class ArticlesRecent(LambdaBase):
             'properties': {
                 'limit': settings.parameters['limit'],
                 'page': settings.parameters['page'],
+                'cursor': settings.parameters['cursor'],
+                'fields': settings.parameters['fields'],
                 'topic': settings.parameters['topic']
-            }
+            },
+            'not': {'required': ['page', 'cursor']}
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
 
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
+        ParameterUtil.validate_fields(self.params.get('fields'), settings.ES_ARTICLE_SOURCE_FIELDS)
 
         if self.params.get('topic'):
             DBUtil.validate_topic(self.dynamodb, self.params['topic'])
@@ -33,13 +35,27 @@ class ArticlesRecent(LambdaBase):
             else settings.article_recent_default_limit
         page = int(self.params.get('page')) if self.params.get('page') is not None else 1
 
-        articles = ESUtil.search_recent_articles(self.elasticsearch, self.dynamodb, self.params, limit, page)
-
-        response = {
-            'Items': articles
-        }
+        cursor = self.params.get('cursor')
+        # fields が指定された場合は指定された項目のみを取得する
+        source_fields = self.params['fields'].split(',') if self.params.get('fields') else None
+        if cursor is not None:
+            # cursor モードの場合は、次ページの取得に利用する cursor もあわせて返却する
+            articles, next_cursor = ESUtil.search_recent_articles_with_cursor(
+                self.elasticsearch, self.dynamodb, self.params, limit, cursor, source_fields=source_fields
+            )
+            response = {
+                'Items': articles,
+                'Cursor': next_cursor
+            }
+        else:
+            articles = ESUtil.search_recent_articles(
+                self.elasticsearch, self.dynamodb, self.params, limit, page, source_fields=source_fields
+            )
+            response = {
+                'Items': articles
+            }
 
         return {
             'statusCode': 200,
-            'body': json.dumps(response, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(response)
         }
@@ -4,8 +4,8 @@ import json
 import settings
 from db_util import DBUtil
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
-from decimal_encoder import DecimalEncoder
+from jsonschema import ValidationError
+from json_util import JsonUtil
 
 
 class ArticlesShow(LambdaBase):
@@ -25,7 +25,7 @@ class ArticlesShow(LambdaBase):
         if params is None:
             raise ValidationError('pathParameters is required')
 
-        validate(params, self.get_schema())
+        self.validate_schema(params)
         # relation
         DBUtil.validate_article_existence(
             self.dynamodb,
@@ -53,5 +53,5 @@ class ArticlesShow(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps(article_info, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(article_info)
         }
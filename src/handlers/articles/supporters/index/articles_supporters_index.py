@@ -1,14 +1,12 @@
-import json
-import math
 import os
 from itertools import groupby
 
 from boto3.dynamodb.conditions import Key
-from jsonschema import ValidationError, validate
+from jsonschema import ValidationError
 
 import settings
 from db_util import DBUtil
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from lambda_base import LambdaBase
 
 
@@ -29,7 +27,7 @@ class ArticlesSupportersIndex(LambdaBase):
         if params is None:
             raise ValidationError('pathParameters is required')
 
-        validate(params, self.get_schema())
+        self.validate_schema(params)
         # relation
         DBUtil.validate_article_existence(
             self.dynamodb,
@@ -53,7 +51,12 @@ class ArticlesSupportersIndex(LambdaBase):
             tip_value = sum([tip['tip_value'] for tip in g])
             users_tip_values[k] = {'tip_value': tip_value}
 
-        users = self.__bulk_get_users(list(users_tip_values.keys()))
+        users = DBUtil.batch_get_items(
+            self.dynamodb,
+            os.environ['USERS_TABLE_NAME'],
+            [{'user_id': user_id} for user_id in users_tip_values.keys()],
+            projection_attributes=['user_display_name', 'icon_image_url']
+        )
 
         users_with_tip = []
         for user in users:
@@ -73,31 +76,5 @@ class ArticlesSupportersIndex(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps({'Items': sorted_users_with_tip}, cls=DecimalEncoder)
+            'body': JsonUtil.dumps({'Items': sorted_users_with_tip})
         }
-
-    # user_idの配列を受け取ってDynamoDBにbulk_getをし、userオブジェクトの配列を返却するメソッド
-    def __bulk_get_users(self, user_ids):
-        # DynamoDBのbatchGetは100件までしか対応してないため、100件ごとにsplitする
-        split_user_ids = [
-            user_ids[index * settings.DYNAMO_BATCH_GET_MAX:(index + 1) * settings.DYNAMO_BATCH_GET_MAX]
-            for index
-            in range(math.ceil(len(user_ids) / settings.DYNAMO_BATCH_GET_MAX))
-        ]
-
-        users = []
-
-        user_table_name = os.environ['USERS_TABLE_NAME']
-
-        for split_user_id in split_user_ids:
-            response = self.dynamodb.batch_get_item(
-                RequestItems={
-                    user_table_name: {
-                        'Keys': [{'user_id': user_id} for user_id in split_user_id]
-                    }
-                }
-            )
-            for user in response['Responses'][user_table_name]:
-                users.append(user)
-
-        return users
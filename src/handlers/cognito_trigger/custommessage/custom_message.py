@@ -2,8 +2,9 @@
 import os
 import boto3
 import settings
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from cognito_trigger_base import CognitoTriggerBase
+from parameter_util import ParameterUtil
 from user_util import UserUtil
 from private_chain_util import PrivateChainUtil
 
@@ -27,7 +28,7 @@ class CustomMessage(CognitoTriggerBase):
         if params.get('phone_number', '') != '' and \
            params.get('phone_number_verified', '') != 'true' and \
            self.event['triggerSource'] != 'CustomMessage_ForgotPassword':
-            validate(params, self.get_schema())
+            ParameterUtil.validate(params, self.get_schema())
             client = boto3.client('cognito-idp')
             response = client.list_users(
                     UserPoolId=self.event['userPoolId'],
@@ -93,6 +94,6 @@ ALIS：https://alismedia.jp
         if address is not None:
             url = 'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/wallet/balance'
             payload = {'private_eth_address': address[2:]}
-            token = PrivateChainUtil.send_transaction(request_url=url, payload_dict=payload)
+            token = PrivateChainUtil.send_transaction(request_url=url, payload_dict=payload, idempotent=True)
             if token is not None and token != '0x0000000000000000000000000000000000000000000000000000000000000000':
                 raise ValidationError("Do not allow phone number updates")
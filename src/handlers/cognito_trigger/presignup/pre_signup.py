@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 import os
 import settings
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from lambda_base import LambdaBase
+from parameter_util import ParameterUtil
 from not_authorized_error import NotAuthorizedError
 from user_util import UserUtil
 
@@ -50,7 +51,7 @@ class PreSignUp(LambdaBase):
         params = self.event
         if params['userName'] in settings.ng_user_name:
             raise ValidationError('This username is not allowed')
-        validate(params, self.get_schema())
+        ParameterUtil.validate(params, self.get_schema())
         if params['triggerSource'] == 'PreSignUp_SignUp':
 
             # 通常サインアップユーザーにTwitter・LINE・Yahoo・Facebookから始まる名前を許可しないバリデーション
@@ -1,12 +1,10 @@
 # -*- coding: utf-8 -*-
-import json
 import os
 import settings
 
 from boto3.dynamodb.conditions import Key
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from lambda_base import LambdaBase
-from jsonschema import validate
 
 
 class CommentsLikesShow(LambdaBase):
@@ -20,7 +18,7 @@ class CommentsLikesShow(LambdaBase):
         }
 
     def validate_params(self):
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         comment_liked_user_table = self.dynamodb.Table(os.environ['COMMENT_LIKED_USER_TABLE_NAME'])
@@ -34,5 +32,5 @@ class CommentsLikesShow(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps({'count': response['Count']}, cls=DecimalEncoder)
+            'body': JsonUtil.dumps({'count': response['Count']})
         }
@@ -3,12 +3,10 @@ import os
 import json
 import boto3
 from botocore.config import Config
-from jsonschema import validate
 from jsonschema import ValidationError
 from web3 import Web3
 from eth_account.messages import encode_defunct
 from lambda_base import LambdaBase
-from parameter_util import ParameterUtil
 
 
 class LicenseTokenFileDownloadUrl(LambdaBase):
@@ -71,8 +69,8 @@ class LicenseTokenFileDownloadUrl(LambdaBase):
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
-        validate(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         s3_cli = boto3.client('s3', config=Config(signature_version='s3v4'), region_name='ap-northeast-1')
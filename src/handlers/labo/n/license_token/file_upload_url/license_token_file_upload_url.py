@@ -3,10 +3,8 @@ import os
 import json
 import boto3
 from botocore.config import Config
-from jsonschema import validate
 from jsonschema import ValidationError
 from lambda_base import LambdaBase
-from parameter_util import ParameterUtil
 
 
 class LicenseTokenFileUploadUrl(LambdaBase):
@@ -34,8 +32,8 @@ class LicenseTokenFileUploadUrl(LambdaBase):
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
-        validate(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         s3_cli = boto3.client('s3', config=Config(signature_version='s3v4'), region_name='ap-northeast-1')
@@ -2,7 +2,6 @@
 import os
 import time
 from lambda_base import LambdaBase
-from jsonschema import validate
 
 options_count = 4  # 選択肢の数
 valuation_level = 7  # n段階評価の、n
@@ -33,7 +32,7 @@ class LaboNMajorityJudgementCreate(LambdaBase):
         }
 
     def validate_params(self):
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         table = self.dynamodb.Table(os.environ['MAJORITY_JUDGEMENT_TABLE_NAME'])
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import os
+from db_util import DBUtil
 from lambda_base import LambdaBase
 
 
@@ -19,18 +20,9 @@ class LaboNMajorityJudgementDeleteAll(LambdaBase):
 
     @staticmethod
     def truncate_dynamo_items(dynamodb_table):
-        delete_items = []
-        parameters = {}
-        while True:
-            response = dynamodb_table.scan(**parameters)
-            delete_items.extend(response["Items"])
-            if ("LastEvaluatedKey" in response):
-                parameters["ExclusiveStartKey"] = response["LastEvaluatedKey"]
-            else:
-                break
-
         key_names = [x["AttributeName"] for x in dynamodb_table.key_schema]
-        delete_keys = [{k: v for k, v in x.items() if k in key_names} for x in delete_items]
+        # 削除に必要なキー項目のみを並列に scan し、取得したものから順に削除する
+        delete_keys = DBUtil.scan_all_items_parallel(dynamodb_table, projection_attributes=key_names)
 
         with dynamodb_table.batch_writer() as batch:
             for key in delete_keys:
@@ -3,7 +3,7 @@ import os
 import time
 import math
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 
 options_count = 6  # 選択肢の数
 credit_per_user = 100  # ユーザに付与されるクレジット(持ち越しは考慮しない)
@@ -35,7 +35,7 @@ class LaboNQuadraticVotingCreate(LambdaBase):
         }
 
     def validate_params(self):
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
         totalVotedValue = 0
         for key in self.params:
@@ -1,12 +1,20 @@
 # -*- coding: utf-8 -*-
 import os
 import json
+import random
+import settings
+from db_util import DBUtil
 from es_util import ESUtil
 from lambda_base import LambdaBase
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
+from ttl_cache import TTLCache
 
 
 class LaboNRandomArticle(LambdaBase):
+    # 無作為に抽出した article_id の候補のコンテナ内キャッシュ
+    # 記事全件をスコアリングする random_score の検索は TTL 毎に 1 回のみ行い、リクエスト毎には候補から選ぶ
+    article_pool = TTLCache('labo_random_article_pool', 1, settings.LABO_RANDOM_ARTICLE_POOL_TTL)
+
     def get_schema(self):
         pass
 
@@ -14,31 +22,42 @@ class LaboNRandomArticle(LambdaBase):
         pass
 
     def exec_main_proc(self):
-        article_id = self.__get_random_article()
+        table_names = [os.environ['ARTICLE_INFO_TABLE_NAME'], os.environ['ARTICLE_CONTENT_TABLE_NAME']]
+
+        for _ in range(settings.LABO_RANDOM_ARTICLE_MAX_PICK):
+            article_ids = self.__get_article_pool()
+            if not article_ids:
+                break
 
-        article_info_table = self.dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
-        article_content_table = self.dynamodb.Table(os.environ['ARTICLE_CONTENT_TABLE_NAME'])
+            article_id = random.choice(article_ids)
+            article_info, article_content = DBUtil.get_items_from_tables(
+                self.dynamodb,
+                table_names,
+                {'article_id': article_id}
+            )
 
-        article_info = article_info_table.get_item(Key={'article_id': article_id}).get('Item')
-        article_content = article_content_table.get_item(Key={'article_id': article_id}).get('Item')
+            # 候補の抽出後に非公開となった記事は返却しない
+            if article_info is not None and article_content is not None and article_info['status'] == 'public':
+                article_content.pop('paid_body', None)
+                article_info.update(article_content)
 
-        if article_info is None or article_content is None:
-            return {
-                'statusCode': 404,
-                'body': json.dumps({'message': 'Record Not Found'})
-            }
+                return {
+                    'statusCode': 200,
+                    'body': JsonUtil.dumps(article_info)
+                }
 
-        article_content.pop('paid_body', None)
-        article_info.update(article_content)
+            # 候補の抽出後に取得できなくなった記事・非公開となった記事は、以降の候補から除く（キャッシュの有効期間は延長しない）
+            article_ids.remove(article_id)
 
         return {
-            'statusCode': 200,
-            'body': json.dumps(article_info, cls=DecimalEncoder)
+            'statusCode': 404,
+            'body': json.dumps({'message': 'Record Not Found'})
         }
 
-    def __get_random_article(self):
-        response = ESUtil.search_random_article(self.elasticsearch)
-
-        article_id = response["hits"]["hits"][0]['_id']
+    def __get_article_pool(self):
+        article_ids = self.article_pool.get('article_ids')
+        if article_ids is None:
+            article_ids = ESUtil.search_random_article_ids(self.elasticsearch, settings.LABO_RANDOM_ARTICLE_POOL_SIZE)
+            self.article_pool.set('article_ids', article_ids)
 
-        return article_id
+        return article_ids
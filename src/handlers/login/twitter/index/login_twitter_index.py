@@ -9,7 +9,7 @@ from lambda_base import LambdaBase
 from twitter_util import TwitterUtil
 from user_util import UserUtil
 from crypto_util import CryptoUtil
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from botocore.exceptions import ClientError
 from exceptions import TwitterOauthError
 from response_builder import ResponseBuilder
@@ -29,7 +29,7 @@ class LoginTwitterIndex(LambdaBase):
     def validate_params(self):
         if not self.event.get('body'):
             raise ValidationError('Request parameter is required')
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         twitter = TwitterUtil(
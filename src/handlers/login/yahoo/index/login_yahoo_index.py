@@ -10,7 +10,7 @@ from lambda_base import LambdaBase
 from yahoo_util import YahooUtil
 from user_util import UserUtil
 from crypto_util import CryptoUtil
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from botocore.exceptions import ClientError
 from exceptions import YahooOauthError
 from exceptions import YahooVerifyException
@@ -31,7 +31,7 @@ class LoginYahooIndex(LambdaBase):
     def validate_params(self):
         if not self.event.get('body'):
             raise ValidationError('Request parameter is required')
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         yahoo = YahooUtil(
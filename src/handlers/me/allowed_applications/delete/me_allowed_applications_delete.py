@@ -1,6 +1,5 @@
 import os
 import requests
-from jsonschema import validate
 
 import settings
 from authlete_util import AuthleteUtil
@@ -18,7 +17,7 @@ class MeAllowedApplicationsDelete(LambdaBase):
         }
 
     def validate_params(self):
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         subject = self.event['requestContext']['authorizer']['claims']['cognito:username']
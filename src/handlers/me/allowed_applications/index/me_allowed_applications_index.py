@@ -5,8 +5,7 @@ import settings
 import json
 from authlete_util import AuthleteUtil
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
-from parameter_util import ParameterUtil
+from jsonschema import ValidationError
 
 
 class MeAllowedApplicationsIndex(LambdaBase):
@@ -24,8 +23,8 @@ class MeAllowedApplicationsIndex(LambdaBase):
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
-        validate(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
+        self.validate_schema(self.params)
         self.params['start'] = self.params.get('start', 0)
         self.params['end'] = self.params.get('end', 5)
         count = self.params['end'] - self.params['start']
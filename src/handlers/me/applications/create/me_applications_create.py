@@ -1,7 +1,6 @@
 import json
 import os
 import requests
-from jsonschema import validate, FormatChecker
 
 import settings
 from authlete_util import AuthleteUtil
@@ -24,7 +23,7 @@ class MeApplicationsCreate(LambdaBase):
 
     def validate_params(self):
         UserUtil.verified_phone_and_email(self.event)
-        validate(self.params, self.get_schema(), format_checker=FormatChecker())
+        self.validate_schema(self.params, use_format_checker=True)
 
     def exec_main_proc(self):
         create_params = {
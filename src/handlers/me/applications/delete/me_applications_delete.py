@@ -1,12 +1,10 @@
 import os
 import requests
-from jsonschema import validate
 
 import settings
 from authlete_util import AuthleteUtil
 from lambda_base import LambdaBase
 from no_permission_error import NoPermissionError
-from parameter_util import ParameterUtil
 
 
 class MeApplicationDelete(LambdaBase):
@@ -20,8 +18,8 @@ class MeApplicationDelete(LambdaBase):
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
-        validate(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
+        self.validate_schema(self.params)
 
         user_id = self.event['requestContext']['authorizer']['claims']['cognito:username']
 
@@ -2,13 +2,11 @@ import json
 import os
 
 import requests
-from jsonschema import validate, FormatChecker
 
 import settings
 from authlete_util import AuthleteUtil
 from lambda_base import LambdaBase
 from no_permission_error import NoPermissionError
-from parameter_util import ParameterUtil
 
 
 class MeApplicationUpdate(LambdaBase):
@@ -25,8 +23,8 @@ class MeApplicationUpdate(LambdaBase):
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
-        validate(self.params, self.get_schema(), format_checker=FormatChecker())
+        self.cast_params_to_int(self.params)
+        self.validate_schema(self.params, use_format_checker=True)
 
         user_id = self.event['requestContext']['authorizer']['claims']['cognito:username']
 
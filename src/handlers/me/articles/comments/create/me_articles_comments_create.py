@@ -10,7 +10,7 @@ import time
 from db_util import DBUtil
 from hashids import Hashids
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from time_util import TimeUtil
 from text_sanitizer import TextSanitizer
 from user_util import UserUtil
@@ -32,7 +32,7 @@ class MeArticlesCommentsCreate(LambdaBase):
         if not self.event.get('body'):
             raise ValidationError('Request parameter is required')
 
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
         DBUtil.validate_write_blacklisted(
             self.dynamodb,
             self.event['requestContext']['authorizer']['claims']['cognito:username']
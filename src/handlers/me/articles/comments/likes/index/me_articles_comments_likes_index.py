@@ -6,7 +6,6 @@ import settings
 from boto3.dynamodb.conditions import Key
 from db_util import DBUtil
 from lambda_base import LambdaBase
-from jsonschema import validate
 
 
 class MeArticlesCommentsLikesIndex(LambdaBase):
@@ -20,7 +19,7 @@ class MeArticlesCommentsLikesIndex(LambdaBase):
         }
 
     def validate_params(self):
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
         DBUtil.validate_article_existence(self.dynamodb, self.params['article_id'], status='public')
 
     def exec_main_proc(self):
@@ -33,7 +32,8 @@ class MeArticlesCommentsLikesIndex(LambdaBase):
             'KeyConditionExpression': Key('article_id').eq(self.params['article_id']),
         }
 
-        result = DBUtil.query_all_items(comment_liked_user_table, query_params)
+        result = DBUtil.query_all_items_iter(comment_liked_user_table, query_params,
+                                             projection_attributes=['comment_id', 'user_id'])
 
         comment_ids = [liked_user['comment_id'] for liked_user in result if liked_user['user_id'] == user_id]
 
@@ -1,11 +1,9 @@
 # -*- coding: utf-8 -*-
 import os
-import json
 import settings
 from boto3.dynamodb.conditions import Key
 from lambda_base import LambdaBase
-from jsonschema import validate
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from user_util import UserUtil
 from db_util import DBUtil
 
@@ -22,7 +20,7 @@ class MeArticlesContentEditHistoriesIndex(LambdaBase):
 
     def validate_params(self):
         UserUtil.verified_phone_and_email(self.event)
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
         # 該当 article_id が自分のものかつ、v2であることを確認
         DBUtil.validate_article_existence(
             self.dynamodb,
@@ -44,5 +42,5 @@ class MeArticlesContentEditHistoriesIndex(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps(response, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(response)
         }
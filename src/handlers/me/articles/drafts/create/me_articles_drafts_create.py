@@ -7,7 +7,7 @@ import settings
 import time
 from botocore.exceptions import ClientError
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError, FormatChecker
+from jsonschema import ValidationError
 from hashids import Hashids
 from text_sanitizer import TextSanitizer
 from time_util import TimeUtil
@@ -34,7 +34,7 @@ class MeArticlesDraftsCreate(LambdaBase):
 
         params = json.loads(self.event.get('body'))
 
-        validate(params, self.get_schema(), format_checker=FormatChecker())
+        self.validate_schema(params, use_format_checker=True)
 
     def exec_main_proc(self):
         sort_key = TimeUtil.generate_sort_key()
@@ -2,7 +2,6 @@ import os
 import settings
 
 from lambda_base import LambdaBase
-from jsonschema import validate
 from db_util import DBUtil
 from user_util import UserUtil
 
@@ -19,7 +18,7 @@ class MeArticlesDraftsDelete(LambdaBase):
 
     def validate_params(self):
         UserUtil.verified_phone_and_email(self.event)
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
         DBUtil.validate_article_existence(
             self.dynamodb,
@@ -1,12 +1,10 @@
 # -*- coding: utf-8 -*-
 import os
-import json
 import settings
 from boto3.dynamodb.conditions import Key, Attr
+from db_util import DBUtil
 from lambda_base import LambdaBase
-from jsonschema import validate
-from decimal_encoder import DecimalEncoder
-from parameter_util import ParameterUtil
+from json_util import JsonUtil
 from user_util import UserUtil
 
 
@@ -23,8 +21,8 @@ class MeArticlesDraftsIndex(LambdaBase):
 
     def validate_params(self):
         UserUtil.verified_phone_and_email(self.event)
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
-        validate(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         article_info_table = self.dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
@@ -35,7 +33,6 @@ class MeArticlesDraftsIndex(LambdaBase):
             limit = int(self.params.get('limit'))
 
         query_params = {
-            'Limit': limit,
             'IndexName': 'user_id-sort_key-index',
             'KeyConditionExpression': Key('user_id').eq(user_id),
             'FilterExpression': Attr('status').eq('draft'),
@@ -51,27 +48,9 @@ class MeArticlesDraftsIndex(LambdaBase):
 
             query_params.update({'ExclusiveStartKey': LastEvaluatedKey})
 
-        response = article_info_table.query(**query_params)
-
-        items = response['Items']
-
-        while 'LastEvaluatedKey' in response and len(response['Items']) < limit:
-            query_params.update({'ExclusiveStartKey': response['LastEvaluatedKey']})
-            response = article_info_table.query(**query_params)
-            items.extend(response['Items'])
-
-            if len(items) >= limit:
-                LastEvaluatedKey = {
-                    'user_id': user_id,
-                    'article_id': items[limit - 1]['article_id'],
-                    'sort_key': int(items[limit - 1]['sort_key'])
-                }
-                response.update({'LastEvaluatedKey': LastEvaluatedKey})
-                break
-
-        response['Items'] = items[:limit]
+        response = DBUtil.query_with_limit(article_info_table, query_params, limit)
 
         return {
             'statusCode': 200,
-            'body': json.dumps(response, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(response)
         }
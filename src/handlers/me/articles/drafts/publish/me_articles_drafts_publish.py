@@ -8,7 +8,7 @@ import time
 
 from boto3.dynamodb.conditions import Key
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from db_util import DBUtil
 from parameter_util import ParameterUtil
 from tag_util import TagUtil
@@ -33,7 +33,7 @@ class MeArticlesDraftsPublish(LambdaBase):
         if self.event['requestContext']['authorizer']['claims'].get('custom:private_eth_address') is None:
             raise ValidationError('not exists private_eth_address')
 
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
         if self.params.get('tags'):
             ParameterUtil.validate_array_unique(self.params['tags'], 'tags', case_insensitive=True)
@@ -8,7 +8,7 @@ import time
 
 from boto3.dynamodb.conditions import Key
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from text_sanitizer import TextSanitizer
 from db_util import DBUtil
 from parameter_util import ParameterUtil
@@ -42,7 +42,7 @@ class MeArticlesDraftsPublishWithHeader(LambdaBase):
         if self.params.get('price') is not None:
             self.params['price'] = int(self.params['price'])
 
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
         if self.params.get('eye_catch_url'):
             TextSanitizer.validate_img_url(self.params.get('eye_catch_url'))
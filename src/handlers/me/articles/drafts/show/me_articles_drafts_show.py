@@ -1,10 +1,8 @@
 # -*- coding: utf-8 -*-
 import os
-import json
 import settings
 from lambda_base import LambdaBase
-from jsonschema import validate
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from db_util import DBUtil
 from user_util import UserUtil
 
@@ -22,7 +20,7 @@ class MeArticlesDraftsShow(LambdaBase):
 
     def validate_params(self):
         UserUtil.verified_phone_and_email(self.event)
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         params = self.event.get('pathParameters')
@@ -59,5 +57,5 @@ class MeArticlesDraftsShow(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps(article_info, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(article_info)
         }
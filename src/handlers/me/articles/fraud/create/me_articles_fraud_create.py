@@ -6,7 +6,7 @@ import json
 from db_util import DBUtil
 from botocore.exceptions import ClientError
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError, FormatChecker
+from jsonschema import ValidationError
 
 from text_sanitizer import TextSanitizer
 from user_util import UserUtil
@@ -31,7 +31,7 @@ class MeArticlesFraudCreate(LambdaBase):
         # single
         if self.event.get('pathParameters') is None:
             raise ValidationError('pathParameters is required')
-        validate(self.params, self.get_schema(), format_checker=FormatChecker())
+        self.validate_schema(self.params, use_format_checker=True)
 
         # 著作権侵害の場合はオリジナル記事のURLを必須とする
         if self.params['reason'] == 'copyright_violation':
@@ -4,12 +4,10 @@ import uuid
 
 import boto3
 from botocore.config import Config
-from jsonschema import validate
 
 import settings
 from db_util import DBUtil
 from lambda_base import LambdaBase
-from parameter_util import ParameterUtil
 from user_util import UserUtil
 
 
@@ -26,9 +24,9 @@ class MeArticlesImageUploadUrlShow(LambdaBase):
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
         UserUtil.verified_phone_and_email(self.event)
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
         DBUtil.validate_article_existence(
             self.dynamodb,
             self.event['pathParameters']['article_id'],
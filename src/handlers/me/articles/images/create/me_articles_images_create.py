@@ -6,7 +6,7 @@ import base64
 import json
 from db_util import DBUtil
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from PIL import Image
 from io import BytesIO
 from user_util import UserUtil
@@ -63,10 +63,10 @@ class MeArticlesImagesCreate(LambdaBase):
         UserUtil.verified_phone_and_email(self.event)
         # single
         # params
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
         self.validate_image_data(self.params['article_image'])
         # headers
-        validate(self.event.get('headers'), self.get_headers_schema())
+        self.validate_schema(self.event.get('headers'), schema_name='get_headers_schema')
 
         # relation
         DBUtil.validate_article_existence(
@@ -7,9 +7,10 @@ import logging
 import traceback
 from boto3.dynamodb.conditions import Key
 from db_util import DBUtil
+from dynamodb_item_memo import DynamoDBItemMemo
 from botocore.exceptions import ClientError
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from time_util import TimeUtil
 from user_util import UserUtil
 from twitter_util import TwitterUtil
@@ -33,7 +34,7 @@ class MeArticlesLikeCreate(LambdaBase):
         # single
         if self.event.get('pathParameters') is None:
             raise ValidationError('pathParameters is required')
-        validate(self.event.get('pathParameters'), self.get_schema())
+        self.validate_schema(self.event.get('pathParameters'))
         # relation
         DBUtil.validate_article_existence(
             self.dynamodb,
@@ -62,7 +63,7 @@ class MeArticlesLikeCreate(LambdaBase):
         if article_user_id != self.event['requestContext']['authorizer']['claims']['cognito:username']:
             try:
                 article_info_table = self.dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
-                article_info = article_info_table.get_item(Key={'article_id': self.params['article_id']}).get('Item')
+                article_info = DynamoDBItemMemo.get_item(article_info_table, {'article_id': self.params['article_id']})
                 self.__create_like_notification(article_info, liked_count)
                 self.__update_unread_notification_manager(article_info)
             except Exception as e:
@@ -133,7 +134,7 @@ class MeArticlesLikeCreate(LambdaBase):
 
     def __get_article_info(self, article_id):
         article_info_table = self.dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
-        return article_info_table.get_item(Key={'article_id': article_id}).get('Item')
+        return DynamoDBItemMemo.get_item(article_info_table, {'article_id': article_id})
 
     def __get_article_likes_count(self):
         query_params = {
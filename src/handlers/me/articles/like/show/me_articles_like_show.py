@@ -4,7 +4,7 @@ import settings
 import json
 from db_util import DBUtil
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 
 
 class MeArticleLikeShow(LambdaBase):
@@ -21,7 +21,7 @@ class MeArticleLikeShow(LambdaBase):
         # single
         if self.event.get('pathParameters') is None:
             raise ValidationError('pathParameters is required')
-        validate(self.event.get('pathParameters'), self.get_schema())
+        self.validate_schema(self.event.get('pathParameters'))
         # relation
         DBUtil.validate_article_existence(
             self.dynamodb,
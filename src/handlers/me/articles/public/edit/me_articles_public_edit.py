@@ -1,11 +1,9 @@
 # -*- coding: utf-8 -*-
 import os
-import json
 import settings
 from user_util import UserUtil
 from lambda_base import LambdaBase
-from jsonschema import validate
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from db_util import DBUtil
 
 
@@ -22,7 +20,7 @@ class MeArticlesPublicEdit(LambdaBase):
 
     def validate_params(self):
         UserUtil.verified_phone_and_email(self.event)
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
         DBUtil.validate_article_existence(
             self.dynamodb,
@@ -68,5 +66,5 @@ class MeArticlesPublicEdit(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps(return_value, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(return_value)
         }
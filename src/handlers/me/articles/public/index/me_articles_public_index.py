@@ -1,12 +1,9 @@
 # -*- coding: utf-8 -*-
 import os
-import json
 import settings
 from boto3.dynamodb.conditions import Key, Attr
 from lambda_base import LambdaBase
-from jsonschema import validate
-from decimal_encoder import DecimalEncoder
-from parameter_util import ParameterUtil
+from json_util import JsonUtil
 
 
 class MeArticlesPublicIndex(LambdaBase):
@@ -21,8 +18,8 @@ class MeArticlesPublicIndex(LambdaBase):
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
-        validate(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         article_info_table = self.dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
@@ -71,5 +68,5 @@ class MeArticlesPublicIndex(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps(response, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(response)
         }
@@ -6,7 +6,7 @@ import traceback
 
 import settings
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from db_util import DBUtil
 from parameter_util import ParameterUtil
 from record_not_found_error import RecordNotFoundError
@@ -31,7 +31,7 @@ class MeArticlesPublicRepublish(LambdaBase):
         if self.event.get('pathParameters') is None:
             raise ValidationError('pathParameters is required')
 
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
         if self.params.get('tags'):
             ParameterUtil.validate_array_unique(self.params['tags'], 'tags', case_insensitive=True)
@@ -6,7 +6,7 @@ import traceback
 
 import settings
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from db_util import DBUtil
 from parameter_util import ParameterUtil
 from record_not_found_error import RecordNotFoundError
@@ -38,7 +38,7 @@ class MeArticlesPublicRepublishWithHeader(LambdaBase):
         if self.params.get('price') is not None:
             self.params['price'] = int(self.params['price'])
 
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
         if self.params.get('eye_catch_url'):
             TextSanitizer.validate_img_url(self.params.get('eye_catch_url'))
@@ -1,10 +1,9 @@
 # -*- coding: utf-8 -*-
 import os
-import json
 import settings
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
-from decimal_encoder import DecimalEncoder
+from jsonschema import ValidationError
+from json_util import JsonUtil
 from db_util import DBUtil
 
 
@@ -22,7 +21,7 @@ class MeArticlesPublicShow(LambdaBase):
         if self.event.get('pathParameters') is None:
             raise ValidationError('pathParameters is required')
 
-        validate(self.event.get('pathParameters'), self.get_schema())
+        self.validate_schema(self.event.get('pathParameters'))
 
         DBUtil.validate_article_existence(
             self.dynamodb,
@@ -46,5 +45,5 @@ class MeArticlesPublicShow(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps(article_info, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(article_info)
         }
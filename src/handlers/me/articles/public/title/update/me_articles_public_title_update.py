@@ -2,7 +2,6 @@
 import os
 import settings
 from lambda_base import LambdaBase
-from jsonschema import validate, FormatChecker
 from text_sanitizer import TextSanitizer
 from db_util import DBUtil
 from user_util import UserUtil
@@ -21,7 +20,7 @@ class MeArticlesPublicTitleUpdate(LambdaBase):
 
     def validate_params(self):
         UserUtil.verified_phone_and_email(self.event)
-        validate(self.params, self.get_schema(), format_checker=FormatChecker())
+        self.validate_schema(self.params, use_format_checker=True)
 
         DBUtil.validate_article_existence(
             self.dynamodb,
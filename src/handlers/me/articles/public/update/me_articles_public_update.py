@@ -3,7 +3,7 @@ import os
 import json
 import settings
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError, FormatChecker
+from jsonschema import ValidationError
 from text_sanitizer import TextSanitizer
 from db_util import DBUtil
 from user_util import UserUtil
@@ -30,7 +30,7 @@ class MeArticlesPublicUpdate(LambdaBase):
         if not self.event.get('body') or not json.loads(self.event.get('body')):
             raise ValidationError('Request parameter is required')
 
-        validate(self.params, self.get_schema(), format_checker=FormatChecker())
+        self.validate_schema(self.params, use_format_checker=True)
 
         DBUtil.validate_article_existence(
             self.dynamodb,
@@ -3,20 +3,21 @@ import os
 import settings
 import time
 import json
-import hashlib
 import logging
 import traceback
 from boto3.dynamodb.conditions import Key
 from db_util import DBUtil
+from dynamodb_item_memo import DynamoDBItemMemo
 from user_util import UserUtil
 from private_chain_util import PrivateChainUtil
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from time_util import TimeUtil
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from decimal import Decimal
 from botocore.exceptions import ClientError
-from exceptions import SendTransactionError, ReceiptError
+from settlement_queue import SettlementQueue
+from settlement_util import SettlementUtil
 
 
 class MeArticlesPurchaseCreate(LambdaBase):
@@ -26,7 +27,8 @@ class MeArticlesPurchaseCreate(LambdaBase):
             'properties': {
                 'article_id': settings.parameters['article_id'],
                 'purchase_signed_transaction': settings.parameters['raw_transaction'],
-                'burn_signed_transaction': settings.parameters['raw_transaction']
+                'burn_signed_transaction': settings.parameters['raw_transaction'],
+                'async_settlement': settings.parameters['async_settlement']
             },
             'required': ['article_id', 'purchase_signed_transaction', 'burn_signed_transaction']
         }
@@ -38,7 +40,7 @@ class MeArticlesPurchaseCreate(LambdaBase):
                                               self.event['requestContext']['authorizer']['claims']['cognito:username'])
 
         # single
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
         # 署名が正しいこと
         PrivateChainUtil.validate_raw_transaction_signature(
             self.params['purchase_signed_transaction'],
@@ -68,7 +70,7 @@ class MeArticlesPurchaseCreate(LambdaBase):
         ################
         # get article info
         article_info_table = self.dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
-        article_info = article_info_table.get_item(Key={'article_id': self.params['article_id']}).get('Item')
+        article_info = DynamoDBItemMemo.get_item(article_info_table, {'article_id': self.params['article_id']})
         # purchase article
         paid_articles_table = self.dynamodb.Table(os.environ['PAID_ARTICLES_TABLE_NAME'])
         paid_status_table = self.dynamodb.Table(os.environ['PAID_STATUS_TABLE_NAME'])
@@ -124,31 +126,20 @@ class MeArticlesPurchaseCreate(LambdaBase):
         purchase_transaction = PrivateChainUtil.send_raw_transaction(self.params['purchase_signed_transaction'])
         # 購入記事データを作成
         self.__create_paid_article(paid_articles_table, article_info, purchase_transaction, sort_key)
+        # 非同期決済の場合は承認以降の処理を settlement worker に依頼し、承認待ちとして返却する
+        if self.__is_async_settlement() and self.__request_settlement(article_info, user_id, sort_key,
+                                                                      purchase_transaction):
+            return {
+                'statusCode': 202,
+                'body': json.dumps({
+                    'status': 'doing'
+                })
+            }
         # プライベートチェーンへのポーリングを行いトランザクションの承認状態を取得
-        transaction_status = self.__polling_to_private_chain(purchase_transaction)
-        # トランザクションの承認状態をpaid_articleとpaid_statusに格納
-        self.__update_transaction_status(article_info, paid_articles_table, transaction_status, sort_key,
-                                         paid_status_table, user_id)
-
-        # 購入のトランザクションが成功した時のみバーンのトランザクションを発行する
-        if transaction_status == 'done':
-            try:
-                # 購入に成功した場合、著者の未読通知フラグをTrueにする
-                self.__update_unread_notification_manager(article_info['user_id'])
-                # 著者へ通知を作成
-                self.__notify_author(article_info, user_id)
-                # バーンのトランザクション処理
-                burn_transaction = PrivateChainUtil.send_raw_transaction(self.params['burn_signed_transaction'])
-                # バーンのトランザクションを購入テーブルに格納
-                self.__add_burn_transaction_to_paid_article(burn_transaction, paid_articles_table,
-                                                            article_info, sort_key)
-            except Exception as err:
-                logging.fatal(err)
-                traceback.print_exc()
-        # 記事購入者へは購入処理中の場合以外で通知を作成
-        if transaction_status == 'done' or transaction_status == 'fail':
-            self.__update_unread_notification_manager(user_id)
-            self.__notify_purchaser(article_info, user_id, transaction_status)
+        transaction_status = SettlementUtil.get_transaction_status(purchase_transaction)
+        # 承認状態の格納、バーンのトランザクション発行、通知の作成
+        SettlementUtil.settle_purchase(self.dynamodb, article_info, user_id, sort_key, transaction_status,
+                                       self.params['burn_signed_transaction'])
 
         return {
             'statusCode': 200,
@@ -157,6 +148,26 @@ class MeArticlesPurchaseCreate(LambdaBase):
             })
         }
 
+    def __is_async_settlement(self):
+        return self.params.get('async_settlement') is True and SettlementQueue.is_enabled()
+
+    def __request_settlement(self, article_info, user_id, sort_key, purchase_transaction):
+        try:
+            SettlementQueue.send({
+                'type': 'purchase',
+                'article_id': article_info['article_id'],
+                'user_id': user_id,
+                'sort_key': sort_key,
+                'purchase_transaction': purchase_transaction,
+                'burn_signed_transaction': self.params['burn_signed_transaction']
+            })
+            return True
+        except Exception as err:
+            # キューへの送信に失敗した場合は同期的に決済する
+            logging.fatal(err)
+            traceback.print_exc()
+            return False
+
     def __create_paid_article(self, paid_articles_table, article_info, purchase_transaction, sort_key):
         article_history_table = self.dynamodb.Table(os.environ['ARTICLE_HISTORY_TABLE_NAME'])
         article_histories = article_history_table.query(
@@ -165,7 +176,7 @@ class MeArticlesPurchaseCreate(LambdaBase):
         )['Items']
         history_created_at = None
         # 一番新しい記事historyデータを取得する
-        for Item in json.loads(json.dumps(article_histories, cls=DecimalEncoder)):
+        for Item in json.loads(JsonUtil.dumps(article_histories)):
             if Item.get('price') is not None and Item.get('price') == article_info['price']:
                 history_created_at = Item.get('created_at')
                 break
@@ -189,97 +200,6 @@ class MeArticlesPurchaseCreate(LambdaBase):
             Item=paid_article
         )
 
-    @staticmethod
-    def __add_burn_transaction_to_paid_article(burn_transaction, paid_articles_table, article_info, sort_key):
-        burn_transaction = {
-            ':burn_transaction': burn_transaction
-        }
-        paid_articles_table.update_item(
-            Key={
-                'article_id': article_info['article_id'],
-                'sort_key': sort_key
-            },
-            UpdateExpression="set burn_transaction = :burn_transaction",
-            ExpressionAttributeValues=burn_transaction
-        )
-
-    @staticmethod
-    def __update_transaction_status(article_info, paid_articles_table, transaction_status, sort_key,
-                                    paid_status_table, user_id):
-        paid_articles_table.update_item(
-            Key={
-                'article_id': article_info['article_id'],
-                'sort_key': sort_key
-            },
-            UpdateExpression="set #attr = :transaction_status",
-            ExpressionAttributeNames={'#attr': 'status'},
-            ExpressionAttributeValues={':transaction_status': transaction_status}
-        )
-
-        # lock用のpaid_statusの:statusを更新
-        paid_status_table.update_item(
-            Key={
-                'article_id': article_info['article_id'],
-                'user_id': user_id
-            },
-            UpdateExpression="set #attr = :transaction_status",
-            ExpressionAttributeNames={'#attr': 'status'},
-            ExpressionAttributeValues={':transaction_status': transaction_status}
-        )
-
-    def __polling_to_private_chain(self, purchase_transaction):
-        try:
-            if PrivateChainUtil.is_transaction_completed(purchase_transaction):
-                return 'done'
-            return 'doing'
-        except (SendTransactionError, ReceiptError) as e:
-            logging.info(e)
-            return 'fail'
-
-    def __update_unread_notification_manager(self, user_id):
-        unread_notification_manager_table = self.dynamodb.Table(os.environ['UNREAD_NOTIFICATION_MANAGER_TABLE_NAME'])
-        unread_notification_manager_table.update_item(
-            Key={'user_id': user_id},
-            UpdateExpression='set unread = :unread',
-            ExpressionAttributeValues={':unread': True}
-        )
-
-    def __notify_author(self, article_info, user_id):
-        notification_table = self.dynamodb.Table(os.environ['NOTIFICATION_TABLE_NAME'])
-
-        notification_table.put_item(Item={
-            'notification_id': self.__get_randomhash(),
-            'user_id': article_info['user_id'],
-            'acted_user_id': user_id,
-            'article_id': article_info['article_id'],
-            'article_user_id': article_info['user_id'],
-            'article_title': article_info['title'],
-            'sort_key': TimeUtil.generate_sort_key(),
-            'type': settings.ARTICLE_PURCHASED_TYPE,
-            'price': int(article_info['price']),
-            'created_at': int(time.time())
-        })
-
-    def __notify_purchaser(self, article_info, user_id, transaction_status):
-        notification_table = self.dynamodb.Table(os.environ['NOTIFICATION_TABLE_NAME'])
-
-        notification_table.put_item(Item={
-            'notification_id': self.__get_randomhash(),
-            'user_id': user_id,
-            'acted_user_id': user_id,
-            'article_id': article_info['article_id'],
-            'article_user_id': article_info['user_id'],
-            'article_title': article_info['title'],
-            'sort_key': TimeUtil.generate_sort_key(),
-            'type': settings.ARTICLE_PURCHASE_TYPE if transaction_status == 'done' else settings.ARTICLE_PURCHASE_ERROR_TYPE,
-            'price': int(article_info['price']),
-            'created_at': int(time.time())
-        })
-
-    @staticmethod
-    def __get_randomhash():
-        return hashlib.sha256((str(time.time()) + str(os.urandom(16))).encode('utf-8')).hexdigest()
-
     def __create_paid_status(self, paid_status_table, user_id):
         item = {
             'article_id': self.params['article_id'],
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import settings
+from lambda_base import LambdaBase
+from record_not_found_error import RecordNotFoundError
+
+
+class MeArticlesPurchaseStatus(LambdaBase):
+    def get_schema(self):
+        return {
+            'type': 'object',
+            'properties': {
+                'article_id': settings.parameters['article_id']
+            },
+            'required': ['article_id']
+        }
+
+    def validate_params(self):
+        self.validate_schema(self.params)
+
+    def exec_main_proc(self):
+        paid_status_table = self.dynamodb.Table(os.environ['PAID_STATUS_TABLE_NAME'])
+        user_id = self.event['requestContext']['authorizer']['claims']['cognito:username']
+
+        paid_status = paid_status_table.get_item(
+            Key={'article_id': self.params['article_id'], 'user_id': user_id}
+        ).get('Item')
+        if paid_status is None:
+            raise RecordNotFoundError('Record Not Found')
+
+        return {
+            'statusCode': 200,
+            'body': json.dumps({
+                'status': paid_status['status']
+            })
+        }
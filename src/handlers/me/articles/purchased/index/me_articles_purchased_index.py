@@ -1,12 +1,10 @@
 # -*- coding: utf-8 -*-
 import os
-import json
 import settings
 from boto3.dynamodb.conditions import Key, Attr
+from db_util import DBUtil
 from lambda_base import LambdaBase
-from jsonschema import validate
-from decimal_encoder import DecimalEncoder
-from parameter_util import ParameterUtil
+from json_util import JsonUtil
 
 
 class MeArticlesPurchasedIndex(LambdaBase):
@@ -21,8 +19,8 @@ class MeArticlesPurchasedIndex(LambdaBase):
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
-        validate(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         paid_articles_table = self.dynamodb.Table(os.environ['PAID_ARTICLES_TABLE_NAME'])
@@ -33,7 +31,6 @@ class MeArticlesPurchasedIndex(LambdaBase):
             limit = int(self.params.get('limit'))
 
         query_params = {
-            'Limit': limit,
             'IndexName': 'user_id-sort_key-index',
             'KeyConditionExpression': Key('user_id').eq(user_id),
             'FilterExpression': Attr('status').eq('done'),
@@ -49,35 +46,22 @@ class MeArticlesPurchasedIndex(LambdaBase):
 
             query_params.update({'ExclusiveStartKey': LastEvaluatedKey})
 
-        response = paid_articles_table.query(**query_params)
-
-        items = response['Items']
-
-        while 'LastEvaluatedKey' in response and len(response['Items']) < limit:
-            query_params.update({'ExclusiveStartKey': response['LastEvaluatedKey']})
-            response = paid_articles_table.query(**query_params)
-            items.extend(response['Items'])
-
-            if len(items) >= limit:
-                LastEvaluatedKey = {
-                    'user_id': user_id,
-                    'article_id': items[limit - 1]['article_id'],
-                    'sort_key': int(items[limit - 1]['sort_key'])
-                }
-                response.update({'LastEvaluatedKey': LastEvaluatedKey})
-                break
-
-        response['Items'] = items[:limit]
-        article_info_table = self.dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
+        response = DBUtil.query_with_limit(paid_articles_table, query_params, limit)
+        article_infos = DBUtil.batch_get_items(
+            self.dynamodb,
+            os.environ['ARTICLE_INFO_TABLE_NAME'],
+            [{'article_id': item['article_id']} for item in response['Items']]
+        )
+        article_infos = {article_info['article_id']: article_info for article_info in article_infos}
 
         for i in range(len(response['Items'])):
             article_id = response['Items'][i]['article_id']
-            article_info = article_info_table.get_item(Key={'article_id': article_id}).get('Item')
+            article_info = article_infos.get(article_id)
             if article_info is None:
                 raise Exception('Failed to get ArticleInfo. article_id: ' + article_id)
             response['Items'][i] = article_info
 
         return {
             'statusCode': 200,
-            'body': json.dumps(response, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(response)
         }
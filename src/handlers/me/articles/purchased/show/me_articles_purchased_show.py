@@ -1,10 +1,8 @@
 # -*- coding: utf-8 -*-
 import os
-import json
 import settings
 from lambda_base import LambdaBase
-from jsonschema import validate
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from db_util import DBUtil
 from not_authorized_error import NotAuthorizedError
 from boto3.dynamodb.conditions import Key
@@ -21,7 +19,7 @@ class MeArticlesPurchasedShow(LambdaBase):
         }
 
     def validate_params(self):
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
         DBUtil.validate_article_existence(
             self.dynamodb,
@@ -55,5 +53,5 @@ class MeArticlesPurchasedShow(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps(article_info, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(article_info)
         }
@@ -5,7 +5,7 @@ import time
 from db_util import DBUtil
 from botocore.exceptions import ClientError
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from time_util import TimeUtil
 from user_util import UserUtil
 
@@ -25,7 +25,7 @@ class MeArticlesPvCreate(LambdaBase):
         # single
         if self.event.get('pathParameters') is None:
             raise ValidationError('pathParameters is required')
-        validate(self.event.get('pathParameters'), self.get_schema())
+        self.validate_schema(self.event.get('pathParameters'))
         # relation
         DBUtil.validate_article_existence(
             self.dynamodb,
@@ -8,7 +8,6 @@ import settings
 
 from db_util import DBUtil
 from lambda_base import LambdaBase
-from jsonschema import validate
 from not_authorized_error import NotAuthorizedError
 from user_util import UserUtil
 
@@ -25,7 +24,7 @@ class MeCommentsDelete(LambdaBase):
 
     def validate_params(self):
         UserUtil.verified_phone_and_email(self.event)
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
         comment = DBUtil.get_validated_comment(self.dynamodb, self.params['comment_id'])
         DBUtil.validate_article_existence(self.dynamodb, comment['article_id'], status='public')
 
@@ -3,7 +3,7 @@ import os
 import settings
 from db_util import DBUtil
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from exceptions import LimitExceeded
 
 
@@ -19,7 +19,7 @@ class MeConfigurationsMuteUsersAdd(LambdaBase):
 
     def validate_params(self):
         # single
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
         # relation
         DBUtil.validate_user_existence(
             self.dynamodb,
@@ -3,7 +3,6 @@ import os
 import settings
 from db_util import DBUtil
 from lambda_base import LambdaBase
-from jsonschema import validate
 
 
 class MeConfigurationsMuteUsersDelete(LambdaBase):
@@ -18,7 +17,7 @@ class MeConfigurationsMuteUsersDelete(LambdaBase):
 
     def validate_params(self):
         # single
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
         # relation
         DBUtil.validate_user_existence(
             self.dynamodb,
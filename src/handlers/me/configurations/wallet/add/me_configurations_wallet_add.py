@@ -3,8 +3,9 @@ import os
 import settings
 from private_chain_util import PrivateChainUtil
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from user_util import UserUtil
+from dynamodb_item_memo import DynamoDBItemMemo
 
 
 class MeConfigurationsWalletAdd(LambdaBase):
@@ -22,7 +23,7 @@ class MeConfigurationsWalletAdd(LambdaBase):
 
     def validate_params(self):
         # single
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
         # relational
         PrivateChainUtil.validate_message_signature(
             self.event['requestContext']['authorizer']['claims']['cognito:username'],
@@ -52,13 +53,18 @@ class MeConfigurationsWalletAdd(LambdaBase):
 
         # ウォレット情報をDBに登録
         user_configurations_table = self.dynamodb.Table(os.environ['USER_CONFIGURATIONS_TABLE_NAME'])
-        user_configurations_table.update_item(
+        DynamoDBItemMemo.update_item(
+            user_configurations_table,
             Key={
                 'user_id': self.event['requestContext']['authorizer']['claims']['cognito:username'],
             },
             UpdateExpression=update_expression,
             ExpressionAttributeValues=expression_attribute_values
         )
+        # コンテナ内にキャッシュされた private_eth_address を破棄
+        UserUtil.invalidate_private_eth_address_cache(
+            self.event['requestContext']['authorizer']['claims']['cognito:username']
+        )
 
         # ウォレットアドレスを cognito に登録
         self.update_private_eth_address(self.params['wallet_address'])
@@ -3,7 +3,7 @@ import json
 import os
 import settings
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from user_util import UserUtil
 from crypto_util import CryptoUtil
 from record_not_found_error import RecordNotFoundError
@@ -22,7 +22,7 @@ class MeExternalProviderUserCreate(LambdaBase):
         params = json.loads(self.event.get('body'))
         if params['user_id'] in settings.ng_user_name:
             raise ValidationError('This username is not allowed')
-        validate(params, self.get_schema())
+        self.validate_schema(params)
 
     def exec_main_proc(self):
         params = self.event
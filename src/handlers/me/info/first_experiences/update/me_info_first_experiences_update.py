@@ -1,7 +1,5 @@
 import os
 
-from jsonschema import validate
-
 import settings
 from lambda_base import LambdaBase
 
@@ -18,7 +16,7 @@ class MeInfoFirstExperiencesUpdate(LambdaBase):
         }
 
     def validate_params(self):
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         user_id = self.event['requestContext']['authorizer']['claims']['cognito:username']
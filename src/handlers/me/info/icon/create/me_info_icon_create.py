@@ -5,7 +5,7 @@ import uuid
 import base64
 import json
 from lambda_base import LambdaBase
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 from PIL import Image
 from io import BytesIO
 
@@ -59,10 +59,10 @@ class MeInfoIconCreate(LambdaBase):
     def validate_params(self):
         # single
         # params
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
         self.validate_image_data(self.params['icon_image'])
         # headers
-        validate(self.event.get('headers'), self.get_headers_schema())
+        self.validate_schema(self.event.get('headers'), schema_name='get_headers_schema')
 
     def exec_main_proc(self):
         content_type = self.headers.get('content-type') \
@@ -1,8 +1,7 @@
 # -*- coding: utf-8 -*-
-import json
 import os
 from lambda_base import LambdaBase
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from record_not_found_error import RecordNotFoundError
 
 
@@ -29,5 +28,5 @@ class MeInfoShow(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps(user, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(user)
         }
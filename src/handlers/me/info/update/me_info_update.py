@@ -3,7 +3,6 @@ import os
 import settings
 from db_util import DBUtil
 from lambda_base import LambdaBase
-from jsonschema import validate
 from text_sanitizer import TextSanitizer
 
 
@@ -20,7 +19,7 @@ class MeInfoUpdate(LambdaBase):
 
     def validate_params(self):
         # single
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
         # relation
         DBUtil.validate_user_existence(
             self.dynamodb,
@@ -1,12 +1,9 @@
 # -*- coding: utf-8 -*-
 import os
 import settings
-import json
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from boto3.dynamodb.conditions import Key
-from parameter_util import ParameterUtil
 from lambda_base import LambdaBase
-from jsonschema import validate
 
 
 class MeNotificationsIndex(LambdaBase):
@@ -21,8 +18,8 @@ class MeNotificationsIndex(LambdaBase):
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
-        validate(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         notification_table = self.dynamodb.Table(os.environ['NOTIFICATION_TABLE_NAME'])
@@ -52,5 +49,5 @@ class MeNotificationsIndex(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps(response, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(response)
         }
@@ -3,7 +3,7 @@ import os
 import time
 
 from botocore.exceptions import ClientError
-from jsonschema import validate, ValidationError, FormatChecker
+from jsonschema import ValidationError
 
 import settings
 from db_util import DBUtil
@@ -28,7 +28,7 @@ class MeUsersFraudCreate(LambdaBase):
     def validate_params(self):
         UserUtil.verified_phone_and_email(self.event)
 
-        validate(self.params, self.get_schema(), format_checker=FormatChecker())
+        self.validate_schema(self.params, use_format_checker=True)
 
         self.__validate_reporting_myself()
 
@@ -1,10 +1,9 @@
-import json
 import os
 
 from boto3.dynamodb.conditions import Key
 
 from db_util import DBUtil
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from lambda_base import LambdaBase
 
 
@@ -24,7 +23,9 @@ class MeWalletDistributedTokensShow(LambdaBase):
             'IndexName': 'user_id-sort_key-index',
             'KeyConditionExpression': Key('user_id').eq(user_id)
         }
-        items = DBUtil.query_all_items(token_distribution_table, query_params)
+        # 配布履歴は件数が多くなり得るため、全件を保持せずにページ毎に集計する
+        items = DBUtil.query_all_items_iter(token_distribution_table, query_params,
+                                            projection_attributes=['distribution_type', 'quantity'])
 
         result = {
             'article': 0,
@@ -37,5 +38,5 @@ class MeWalletDistributedTokensShow(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps(result, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(result)
         }
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import json
 import logging
 import os
 import traceback
@@ -8,9 +9,11 @@ import settings
 import time
 
 from private_chain_util import PrivateChainUtil
+from settlement_queue import SettlementQueue
+from settlement_util import SettlementUtil
 from time_util import TimeUtil
 from db_util import DBUtil
-from jsonschema import validate
+from dynamodb_item_memo import DynamoDBItemMemo
 from lambda_base import LambdaBase
 from jsonschema import ValidationError
 from user_util import UserUtil
@@ -24,7 +27,8 @@ class MeWalletTip(LambdaBase):
             'properties': {
                 'article_id': settings.parameters['article_id'],
                 'tip_signed_transaction': settings.parameters['raw_transaction'],
-                'burn_signed_transaction': settings.parameters['raw_transaction']
+                'burn_signed_transaction': settings.parameters['raw_transaction'],
+                'async_settlement': settings.parameters['async_settlement']
             },
             'required': ['article_id', 'tip_signed_transaction', 'burn_signed_transaction']
         }
@@ -36,7 +40,7 @@ class MeWalletTip(LambdaBase):
                                               self.event['requestContext']['authorizer']['claims']['cognito:username'])
 
         # single
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
         # 署名が正しいこと
         PrivateChainUtil.validate_raw_transaction_signature(
             self.params['tip_signed_transaction'],
@@ -61,12 +65,13 @@ class MeWalletTip(LambdaBase):
         ################
         # article info
         article_info_table = self.dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
-        article_info = article_info_table.get_item(Key={'article_id': self.params['article_id']}).get('Item')
+        article_info = DynamoDBItemMemo.get_item(article_info_table, {'article_id': self.params['article_id']})
         # eth_address
         from_user_eth_address = self.event['requestContext']['authorizer']['claims']['custom:private_eth_address']
         to_user_eth_address = UserUtil.get_private_eth_address(self.cognito, article_info['user_id'])
-        # transaction_count
-        transaction_count = PrivateChainUtil.get_transaction_count(from_user_eth_address)
+        # transaction_count, balance
+        account_values = PrivateChainUtil.get_account_values(from_user_eth_address, ['transaction_count', 'balance'])
+        transaction_count = account_values['transaction_count']
 
         ################
         # validation
@@ -98,17 +103,26 @@ class MeWalletTip(LambdaBase):
             raise ValidationError('burn_value is invalid.')
 
         # 残高が足りていること
-        if not self.__is_burnable_user(from_user_eth_address, tip_value, burn_value):
+        if not self.__is_burnable_user(account_values['balance'], tip_value, burn_value):
             raise ValidationError('Required at least {token} token'.format(token=tip_value + burn_value))
 
         #######################
         # send_raw_transaction
         #######################
         transaction_hash = PrivateChainUtil.send_raw_transaction(self.params['tip_signed_transaction'])
+        # 非同期決済の場合は承認待ちの投げ銭データを作成し、承認以降の処理を settlement worker に依頼する
+        if self.__is_async_settlement():
+            return self.__request_settlement(transaction_hash, tip_value, article_info)
+
+        # 承認を確認できなかった場合（確認中の例外を含む）は、以降に決済する処理は存在しないため unknown とする
+        settlement_status = 'unknown'
         burn_transaction = None
         try:
+            transaction_status = SettlementUtil.get_transaction_status(transaction_hash)
+            if transaction_status != 'doing':
+                settlement_status = transaction_status
             # 投げ銭が成功した時のみバーン処理を行う
-            if PrivateChainUtil.is_transaction_completed(transaction_hash):
+            if transaction_status == 'done':
                 # バーンのトランザクション処理
                 burn_transaction = PrivateChainUtil.send_raw_transaction(self.params['burn_signed_transaction'])
             else:
@@ -118,23 +132,57 @@ class MeWalletTip(LambdaBase):
             traceback.print_exc()
         finally:
             # create tip info
-            self.__create_tip_info(transaction_hash, tip_value, burn_transaction, article_info)
+            self.__create_tip_info(transaction_hash, tip_value, burn_transaction, article_info,
+                                   settlement_status=settlement_status)
 
         return {
             'statusCode': 200
         }
 
-    @staticmethod
-    def __is_burnable_user(eth_address, tip_value, burn_value):
-        # get_balance
-        token = PrivateChainUtil.get_balance(eth_address)
+    def __is_async_settlement(self):
+        return self.params.get('async_settlement') is True and SettlementQueue.is_enabled()
 
+    def __request_settlement(self, transaction_hash, tip_value, article_info):
+        sort_key = self.__create_tip_info(transaction_hash, tip_value, None, article_info, settlement_status='pending')
+        user_id = self.event['requestContext']['authorizer']['claims']['cognito:username']
+        try:
+            SettlementQueue.send({
+                'type': 'tip',
+                'user_id': user_id,
+                'sort_key': sort_key,
+                'transaction': transaction_hash,
+                'burn_signed_transaction': self.params['burn_signed_transaction']
+            })
+        except Exception as err:
+            # キューへの送信に失敗した場合は同期的に決済する
+            # 承認を確認できなかった場合も以降に決済する処理は存在しないため、unknown としてバーンせずに決済を終える
+            logging.fatal(err)
+            traceback.print_exc()
+            transaction_status = SettlementUtil.get_transaction_status(transaction_hash)
+            if transaction_status == 'doing':
+                transaction_status = 'unknown'
+            SettlementUtil.settle_tip(self.dynamodb, user_id, sort_key, transaction_status,
+                                      self.params['burn_signed_transaction'])
+            return {
+                'statusCode': 200
+            }
+
+        return {
+            'statusCode': 202,
+            'body': json.dumps({
+                'sort_key': sort_key,
+                'transaction': transaction_hash
+            })
+        }
+
+    @staticmethod
+    def __is_burnable_user(token, tip_value, burn_value):
         # return result
         if int(token, 16) >= tip_value + burn_value:
             return True
         return False
 
-    def __create_tip_info(self, transaction_hash, tip_value, burn_transaction, article_info):
+    def __create_tip_info(self, transaction_hash, tip_value, burn_transaction, article_info, settlement_status=None):
         tip_table = self.dynamodb.Table(os.environ['TIP_TABLE_NAME'])
 
         sort_key = TimeUtil.generate_sort_key()
@@ -155,8 +203,16 @@ class MeWalletTip(LambdaBase):
             'target_date': time.strftime('%Y-%m-%d', time.gmtime(epoch)),
             'created_at': epoch
         }
+        if settlement_status is not None:
+            tip_info['settlement_status'] = settlement_status
+        # 承認待ちの投げ銭データは、uncompleted-index を参照するバッチの処理対象とならないよう uncompleted を設定しない
+        # （決済時に SettlementUtil.settle_tip で設定する）
+        if settlement_status == 'pending':
+            del tip_info['uncompleted']
 
         tip_table.put_item(
             Item=tip_info,
             ConditionExpression='attribute_not_exists(user_id)'
         )
+
+        return sort_key
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+import boto3
+from me_wallet_tip_status import MeWalletTipStatus
+
+dynamodb = boto3.resource('dynamodb')
+
+
+def lambda_handler(event, context):
+    me_wallet_tip_status = MeWalletTipStatus(event, context, dynamodb)
+    return me_wallet_tip_status.main()
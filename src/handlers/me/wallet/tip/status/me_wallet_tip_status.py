@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import settings
+from lambda_base import LambdaBase
+from record_not_found_error import RecordNotFoundError
+
+
+class MeWalletTipStatus(LambdaBase):
+    def get_schema(self):
+        return {
+            'type': 'object',
+            'properties': {
+                'sort_key': settings.parameters['sort_key']
+            },
+            'required': ['sort_key']
+        }
+
+    def validate_params(self):
+        self.cast_params_to_int(self.params)
+        self.validate_schema(self.params)
+
+    def exec_main_proc(self):
+        tip_table = self.dynamodb.Table(os.environ['TIP_TABLE_NAME'])
+        user_id = self.event['requestContext']['authorizer']['claims']['cognito:username']
+
+        tip = tip_table.get_item(Key={'user_id': user_id, 'sort_key': self.params['sort_key']}).get('Item')
+        if tip is None:
+            raise RecordNotFoundError('Record Not Found')
+
+        # settlement_status の記録前に作成された投げ銭データは、バーンの有無から状態を返却する
+        # バーンが存在しない場合は、投げ銭の失敗・承認の未確認・バーンの失敗のいずれかを判別できないため unknown とする
+        status = tip.get('settlement_status')
+        if status is None:
+            status = 'done' if tip.get('burn_transaction') is not None else 'unknown'
+
+        return {
+            'statusCode': 200,
+            'body': json.dumps({
+                'status': status,
+                'transaction': tip['transaction'],
+                'burn_transaction': tip.get('burn_transaction')
+            })
+        }
@@ -8,17 +8,22 @@ import io
 import csv
 import pytz
 from decimal import Decimal, ROUND_FLOOR
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from db_util import DBUtil
 from time_util import TimeUtil
 from user_util import UserUtil
 from web3 import Web3, HTTPProvider
 from lambda_base import LambdaBase
 from record_not_found_error import RecordNotFoundError
+from ttl_cache import TTLCache
 
 
 class MeWalletTokenAllhistoriesCreate(LambdaBase):
     web3 = None
     jst = pytz.timezone('Asia/Tokyo')
+    # ブロック番号毎の timestamp のコンテナ内キャッシュ（ブロックは変更されないため有効期間は設けず、件数の上限のみで破棄する）
+    block_timestamps = TTLCache('block_timestamp', settings.BLOCK_TIMESTAMP_CACHE_SIZE, float('inf'))
 
     def get_schema(self):
         pass
@@ -97,9 +102,9 @@ class MeWalletTokenAllhistoriesCreate(LambdaBase):
 
     def filter_transfer_data(self, transfer_result, eoa, data_for_csv):
         # 取得したデータのうち、csvファイルに書き込むデータのみを抽出し、data_for_csvに成型して書き込む
+        block_timestamps = self.__get_block_timestamps(transfer_result)
         for i in range(len(transfer_result)):
-            time = datetime.fromtimestamp(
-                self.web3.eth.getBlock(transfer_result[i]['blockNumber'])['timestamp']).astimezone(self.jst)
+            time = datetime.fromtimestamp(block_timestamps[transfer_result[i]['blockNumber']]).astimezone(self.jst)
             strtime = datetime.strftime(time, "%Y/%m/%d %H:%M:%S")
             transactionHash = transfer_result[i]['transactionHash'].hex()
             type = self.add_type(self.removeLeft(transfer_result[i]['topics'][1].hex()),
@@ -142,9 +147,9 @@ class MeWalletTokenAllhistoriesCreate(LambdaBase):
     def filter_mint_data(self, mint_result, eoa, data_for_csv, remove_token):
         # 取得したデータのうち、csvファイルに書き込むデータのみを抽出し、data_for_csvに成型して書き込む
         is_removed = False
+        block_timestamps = self.__get_block_timestamps(mint_result)
         for i in range(len(mint_result)):
-            time = datetime.fromtimestamp(
-                self.web3.eth.getBlock(mint_result[i]['blockNumber'])['timestamp']).astimezone(self.jst)
+            time = datetime.fromtimestamp(block_timestamps[mint_result[i]['blockNumber']]).astimezone(self.jst)
             strtime = time.strftime("%Y/%m/%d %H:%M:%S")
             transactionHash = mint_result[i]['transactionHash'].hex()
             # mintデータの場合はfromを'---'に設定し、typeを判別している
@@ -175,6 +180,48 @@ class MeWalletTokenAllhistoriesCreate(LambdaBase):
         mint_result = to_filter.get_all_entries()
         self.filter_mint_data(mint_result, eoa, data_for_csv, remove_token)
 
+    def __get_block_timestamps(self, logs):
+        # ログ毎に getBlock を呼び出さないよう、ブロック番号毎に 1 度だけ timestamp を取得する
+        # コンテナ内のキャッシュ、BlockTimestamp テーブル、private chain の順に参照し、
+        # private chain から取得した timestamp はテーブルに保存して以降の全ユーザーの出力で共有する
+        block_timestamps = {}
+        for block_number in dict.fromkeys(log['blockNumber'] for log in logs):
+            timestamp = self.block_timestamps.get(block_number)
+            if timestamp is not None:
+                block_timestamps[block_number] = timestamp
+
+        block_numbers = [block_number for block_number in dict.fromkeys(log['blockNumber'] for log in logs)
+                         if block_number not in block_timestamps]
+        if block_numbers:
+            items = DBUtil.batch_get_items(
+                self.dynamodb,
+                os.environ['BLOCK_TIMESTAMP_TABLE_NAME'],
+                [{'block_number': block_number} for block_number in block_numbers]
+            )
+            for item in items:
+                block_timestamps[int(item['block_number'])] = int(item['timestamp'])
+
+        block_numbers = [block_number for block_number in block_numbers if block_number not in block_timestamps]
+        if block_numbers:
+            fetched_block_timestamps = self.__fetch_block_timestamps(block_numbers)
+            block_timestamp_table = self.dynamodb.Table(os.environ['BLOCK_TIMESTAMP_TABLE_NAME'])
+            with block_timestamp_table.batch_writer() as batch:
+                for block_number, timestamp in fetched_block_timestamps.items():
+                    batch.put_item(Item={'block_number': block_number, 'timestamp': timestamp})
+            block_timestamps.update(fetched_block_timestamps)
+
+        for block_number, timestamp in block_timestamps.items():
+            self.block_timestamps.set(block_number, timestamp)
+        return block_timestamps
+
+    def __fetch_block_timestamps(self, block_numbers):
+        # getBlock はブロック毎の RPC のため並列に実行する
+        max_workers = min(len(block_numbers), settings.BLOCK_TIMESTAMP_FETCH_MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            timestamps = executor.map(lambda block_number: self.web3.eth.getBlock(block_number)['timestamp'],
+                                      block_numbers)
+            return dict(zip(block_numbers, timestamps))
+
     def extract_file_to_s3(self, user_id, data_for_csv):
         bucket = os.environ['ALL_TOKEN_HISTORY_CSV_DOWNLOAD_S3_BUCKET']
         # identityIdの項目はeventの中に存在するが、IAM認証でないと取得できないためlambda側でidtokenを使い取得する実装をした
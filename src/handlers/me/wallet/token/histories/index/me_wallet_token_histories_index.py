@@ -49,14 +49,14 @@ class MeWalletTokenHistoriesIndex(LambdaBase):
 
     def __get_current_block_number(self):
         url = 'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/eth/block_number'
-        return PrivateChainUtil.send_transaction(request_url=url)
+        return PrivateChainUtil.send_transaction(request_url=url, idempotent=True)
 
     def __get_timestamp_by_block_number(self, block_number):
         url = 'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/eth/get_block_by_number'
         payload_dict = {
             'block_num': block_number,
         }
-        return PrivateChainUtil.send_transaction(request_url=url, payload_dict=payload_dict).get('timestamp')
+        return PrivateChainUtil.send_transaction(request_url=url, payload_dict=payload_dict, idempotent=True).get('timestamp')
 
     def __get_relay_events_specified_block_range(self, from_block, to_block, user_eth_address):
         url = 'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/wallet/relay_events'
@@ -65,7 +65,7 @@ class MeWalletTokenHistoriesIndex(LambdaBase):
             'to_block': to_block,
             'sender_eth_address': user_eth_address[2:],
         }
-        return PrivateChainUtil.send_transaction(request_url=url, payload_dict=payload_dict)
+        return PrivateChainUtil.send_transaction(request_url=url, payload_dict=payload_dict, idempotent=True)
 
     def __get_apply_relay_events_specified_block_range(self, from_block, to_block, user_eth_address):
         url = 'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/wallet/apply_relay_events'
@@ -74,4 +74,4 @@ class MeWalletTokenHistoriesIndex(LambdaBase):
             'to_block': to_block,
             'recipient_eth_address': user_eth_address[2:],
         }
-        return PrivateChainUtil.send_transaction(request_url=url, payload_dict=payload_dict)
+        return PrivateChainUtil.send_transaction(request_url=url, payload_dict=payload_dict, idempotent=True)
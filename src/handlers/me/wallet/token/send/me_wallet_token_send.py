@@ -9,7 +9,6 @@ from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
 from private_chain_util import PrivateChainUtil
 from time_util import TimeUtil
-from jsonschema import validate
 from lambda_base import LambdaBase
 from jsonschema import ValidationError
 from user_util import UserUtil
@@ -37,7 +36,7 @@ class MeWalletTokenSend(LambdaBase):
         UserUtil.validate_private_eth_address(self.dynamodb,
                                               self.event['requestContext']['authorizer']['claims']['cognito:username'])
         # single
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
         # 署名が正しいこと
         if self.params.get('init_approve_signed_transaction') is not None:
             PrivateChainUtil.validate_raw_transaction_signature(
@@ -63,8 +62,9 @@ class MeWalletTokenSend(LambdaBase):
         sort_key = TimeUtil.generate_sort_key()
         from_user_eth_address = self.event['requestContext']['authorizer']['claims']['custom:private_eth_address']
         user_id = self.event['requestContext']['authorizer']['claims']['cognito:username']
-        allowance = PrivateChainUtil.get_allowance(from_user_eth_address)
-        transaction_count = PrivateChainUtil.get_transaction_count(from_user_eth_address)
+        account_values = PrivateChainUtil.get_account_values(from_user_eth_address, ['allowance', 'transaction_count'])
+        allowance = account_values['allowance']
+        transaction_count = account_values['transaction_count']
 
         ################
         # validation
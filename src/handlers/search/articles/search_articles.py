@@ -1,10 +1,8 @@
 # -*- coding: utf-8 -*-
-import json
 import settings
 from es_util import ESUtil
 from lambda_base import LambdaBase
-from jsonschema import validate
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from parameter_util import ParameterUtil
 
 
@@ -15,30 +13,45 @@ class SearchArticles(LambdaBase):
             'properties': {
                 'limit': settings.parameters['limit'],
                 'page': settings.parameters['page'],
+                'cursor': settings.parameters['cursor'],
+                'fields': settings.parameters['fields'],
                 'query': settings.parameters['query'],
                 'tag': settings.parameters['tag']
             },
             'anyOf': [
                 {'required': ['query']},
                 {'required': ['tag']},
-            ]
+            ],
+            'not': {'required': ['page', 'cursor']}
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
-        validate(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
+        self.validate_schema(self.params)
+        ParameterUtil.validate_fields(self.params.get('fields'), settings.ES_ARTICLE_SOURCE_FIELDS)
 
     def exec_main_proc(self):
         query = self.params.get('query')
         tag = self.params.get('tag')
         limit = int(self.params.get('limit')) if self.params.get('limit') is not None else settings.article_recent_default_limit
         page = int(self.params.get('page')) if self.params.get('page') is not None else 1
-        response = ESUtil.search_article(self.elasticsearch, limit, page, word=query, tag=tag)
-        result = []
-        for a in response["hits"]["hits"]:
-            del(a["_source"]["body"])
-            result.append(a["_source"])
+        cursor = self.params.get('cursor')
+        # 本文等は ES から取得しない。fields が指定された場合は指定された項目のみを取得する
+        source_fields = self.params['fields'].split(',') if self.params.get('fields') else None
+        if cursor is not None:
+            # cursor モードの場合は、次ページの取得に利用する cursor もあわせて返却する
+            response, next_cursor = ESUtil.search_article_with_cursor(
+                self.elasticsearch, limit, cursor, word=query, tag=tag, source_fields=source_fields
+            )
+        else:
+            response = ESUtil.search_article(self.elasticsearch, limit, page, word=query, tag=tag, source_fields=source_fields)
+        result = [a["_source"] for a in response["hits"]["hits"]]
+        if cursor is not None:
+            result = {
+                'Items': result,
+                'Cursor': next_cursor
+            }
         return {
             'statusCode': 200,
-            'body': json.dumps(result, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(result)
         }
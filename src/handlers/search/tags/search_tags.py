@@ -1,12 +1,7 @@
-import json
-
-from jsonschema import validate
-
 import settings
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from es_util import ESUtil
 from lambda_base import LambdaBase
-from parameter_util import ParameterUtil
 
 
 class SearchTags(LambdaBase):
@@ -16,22 +11,33 @@ class SearchTags(LambdaBase):
             'properties': {
                 'limit': settings.parameters['limit'],
                 'page': settings.parameters['page'],
+                'cursor': settings.parameters['cursor'],
                 'query': settings.parameters['query']
             },
-            'required': ['query']
+            'required': ['query'],
+            'not': {'required': ['page', 'cursor']}
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
-        validate(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         query = self.params['query']
         limit = int(self.params.get('limit')) if self.params.get('limit') is not None else settings.TAG_SEARCH_DEFAULT_LIMIT
         page = int(self.params.get('page')) if self.params.get('page') is not None else 1
+        cursor = self.params.get('cursor')
 
-        result = ESUtil.search_tag(self.elasticsearch, query, limit, page)
+        if cursor is not None:
+            # cursor モードの場合は、次ページの取得に利用する cursor もあわせて返却する
+            tags, next_cursor = ESUtil.search_tag_with_cursor(self.elasticsearch, query, limit, cursor)
+            result = {
+                'Items': tags,
+                'Cursor': next_cursor
+            }
+        else:
+            result = ESUtil.search_tag(self.elasticsearch, query, limit, page)
         return {
             'statusCode': 200,
-            'body': json.dumps(result, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(result)
         }
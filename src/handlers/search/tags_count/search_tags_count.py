@@ -1,12 +1,7 @@
-import json
-
-from jsonschema import validate
-
 import settings
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from es_util import ESUtil
 from lambda_base import LambdaBase
-from parameter_util import ParameterUtil
 
 
 class SearchTagsCount(LambdaBase):
@@ -21,9 +16,9 @@ class SearchTagsCount(LambdaBase):
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
         self.params['tags'] = self.event['multiValueQueryStringParameters'].get('tags')
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         # 直近１週間分のタグを集計
@@ -43,5 +38,5 @@ class SearchTagsCount(LambdaBase):
         result = sorted(temp, key=lambda x: x['count'], reverse=True)
         return {
             'statusCode': 200,
-            'body': json.dumps(result, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(result)
         }
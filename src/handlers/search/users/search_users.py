@@ -1,11 +1,8 @@
 # -*- coding: utf-8 -*-
-import json
 import settings
 from es_util import ESUtil
 from lambda_base import LambdaBase
-from jsonschema import validate
-from decimal_encoder import DecimalEncoder
-from parameter_util import ParameterUtil
+from json_util import JsonUtil
 
 
 class SearchUsers(LambdaBase):
@@ -21,8 +18,8 @@ class SearchUsers(LambdaBase):
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
-        validate(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         query = self.params['query']
@@ -34,5 +31,5 @@ class SearchUsers(LambdaBase):
             result.append(u["_source"])
         return {
             'statusCode': 200,
-            'body': json.dumps(result, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(result)
         }
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+import boto3
+from settlement_worker import SettlementWorker
+
+dynamodb = boto3.resource('dynamodb')
+
+
+def lambda_handler(event, context):
+    settlement_worker = SettlementWorker(event, context, dynamodb)
+    return settlement_worker.main()
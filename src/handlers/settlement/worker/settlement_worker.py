@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import logging
+from private_chain_util import PrivateChainUtil
+from settlement_util import SettlementUtil
+from exceptions import SendTransactionError, ReceiptError
+
+
+class SettlementWorker:
+    # SettlementQueue に送信された投げ銭・記事購入の非同期決済を行う
+    # トランザクションが承認待ちの場合は例外を送出し、キューの可視性タイムアウト後に再実行させる
+    # receipt API の呼び出しエラー（SendTransactionError）は一時的な障害の可能性があるため、同様に再実行させる
+    # receipt は存在するがログが無い（ReceiptError）場合はトランザクションが失敗しているため、再実行せず決済失敗とする
+    # 投げ銭は、再実行の上限（SETTLEMENT_MAX_RECEIVE_COUNT）に達した場合に dead letter queue に移される前に unknown として決済を終える
+    # 記事購入は、承認待ちのトランザクションが後から承認される恐れがあるため、従来どおり doing（購入のロック）のまま
+    # dead letter queue に移し、運用で確認する
+    def __init__(self, event, context, dynamodb):
+        self.event = event
+        self.context = context
+        self.dynamodb = dynamodb
+
+    def main(self):
+        logger = logging.getLogger()
+        logger.setLevel(logging.INFO)
+
+        for record in self.event['Records']:
+            message = json.loads(record['body'])
+            is_last_receive = int(record['attributes']['ApproximateReceiveCount']) >= \
+                int(os.environ['SETTLEMENT_MAX_RECEIVE_COUNT'])
+            if message['type'] == 'tip':
+                self.__settle_tip(message, is_last_receive)
+            elif message['type'] == 'purchase':
+                self.__settle_purchase(message)
+            else:
+                raise Exception('Unknown settlement type: ' + str(message['type']))
+
+    def __settle_tip(self, message, is_last_receive):
+        tip_table = self.dynamodb.Table(os.environ['TIP_TABLE_NAME'])
+        tip = tip_table.get_item(Key={'user_id': message['user_id'], 'sort_key': message['sort_key']}).get('Item')
+        # 決済済みの場合は処理しない（キューのメッセージは重複して配信される場合がある）
+        if tip is None or tip.get('settlement_status') != 'pending':
+            logging.info('Tip was already settled: ' + message['transaction'])
+            return
+
+        transaction_status = self.__get_transaction_status(message['transaction'], is_last_receive)
+        # 再実行の上限に達しても承認されない場合は、同期的に処理する API と同様に unknown とする
+        if transaction_status == 'doing':
+            transaction_status = 'unknown'
+
+        SettlementUtil.settle_tip(self.dynamodb, message['user_id'], message['sort_key'], transaction_status,
+                                  message['burn_signed_transaction'])
+
+    def __settle_purchase(self, message):
+        paid_articles_table = self.dynamodb.Table(os.environ['PAID_ARTICLES_TABLE_NAME'])
+        paid_article = paid_articles_table.get_item(
+            Key={'article_id': message['article_id'], 'sort_key': message['sort_key']}
+        ).get('Item')
+        # 決済済みの場合は処理しない（キューのメッセージは重複して配信される場合がある）
+        if paid_article is None or paid_article.get('status') != 'doing':
+            logging.info('Purchase was already settled: ' + message['purchase_transaction'])
+            return
+
+        # 再実行の上限に達しても承認されない場合は例外を送出し、doing のまま dead letter queue に移す
+        transaction_status = self.__get_transaction_status(message['purchase_transaction'], is_last_receive=False)
+
+        article_info_table = self.dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
+        article_info = article_info_table.get_item(Key={'article_id': message['article_id']})['Item']
+        SettlementUtil.settle_purchase(self.dynamodb, article_info, message['user_id'], message['sort_key'],
+                                       transaction_status, message['burn_signed_transaction'])
+
+    @staticmethod
+    def __get_transaction_status(transaction, is_last_receive):
+        # 承認待ちの場合、再実行の上限に達していなければ例外を送出して再実行させ、達していれば doing を返却する
+        try:
+            if PrivateChainUtil.is_transaction_completed(transaction):
+                return 'done'
+        except ReceiptError as e:
+            logging.info(e)
+            return 'fail'
+        except SendTransactionError:
+            if not is_last_receive:
+                raise
+            logging.info('Receipt API error on last receive: ' + transaction)
+            return 'doing'
+
+        if not is_last_receive:
+            raise Exception('Transaction is not completed yet: ' + transaction)
+        return 'doing'
@@ -1,9 +1,7 @@
 import requests
 import json
 import settings
-from jsonschema import validate
 from lambda_base import LambdaBase
-from parameter_util import ParameterUtil
 
 
 class TopicsCryptoRankingIndex(LambdaBase):
@@ -16,8 +14,8 @@ class TopicsCryptoRankingIndex(LambdaBase):
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
-        validate(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         limit = int(self.params['limit']) if self.params.get('limit') else settings.CRYPTO_RAKING_DEFAULT_LIMIT
@@ -1,9 +1,8 @@
 import os
-import json
 import nft_games_info
 import settings
 from boto3.dynamodb.conditions import Key
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from es_util import ESUtil
 from db_util import DBUtil
 from lambda_base import LambdaBase
@@ -58,5 +57,5 @@ class TopicsGameNftGamesRankingIndex(LambdaBase):
         result = sorted(list(temp.values()), key=lambda x: x.get('tag_count'), reverse=True)
         return {
             'statusCode': 200,
-            'body': json.dumps(result, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(result)
         }
@@ -1,10 +1,8 @@
 import os
-import json
 import nft_games_info
 import settings
 import copy
-from jsonschema import validate
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from es_util import ESUtil
 from lambda_base import LambdaBase
 
@@ -20,7 +18,7 @@ class TopicsGameNftGamesShow(LambdaBase):
         }
 
     def validate_params(self):
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         # 該当タグに紐づくゲーム情報が存在しない場合は空を返却
@@ -67,5 +65,5 @@ class TopicsGameNftGamesShow(LambdaBase):
         # 取得結果を返却
         return {
             'statusCode': 200,
-            'body': json.dumps(game_info, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(game_info)
         }
@@ -1,10 +1,9 @@
 # -*- coding: utf-8 -*-
-import json
 import os
 
 import settings
 from boto3.dynamodb.conditions import Key
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from lambda_base import LambdaBase
 
 
@@ -27,5 +26,5 @@ class TopicsIndex(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps(topics, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(topics)
         }
@@ -1,11 +1,9 @@
 import os
-import json
 import settings
+from db_util import DBUtil
 from lambda_base import LambdaBase
 from boto3.dynamodb.conditions import Key, Attr
-from jsonschema import validate
-from decimal_encoder import DecimalEncoder
-from parameter_util import ParameterUtil
+from json_util import JsonUtil
 
 
 class UsersArticlesPopular(LambdaBase):
@@ -22,15 +20,14 @@ class UsersArticlesPopular(LambdaBase):
         }
 
     def validate_params(self):
-        ParameterUtil.cast_parameter_to_int(self.params, self.get_schema())
-        validate(self.params, self.get_schema())
+        self.cast_params_to_int(self.params)
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         article_info_table = self.dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
         limit = UsersArticlesPopular.get_index_limit(self.params)
 
         query_params = {
-            'Limit': limit,
             'IndexName': 'user_id-popular_sort_key-index',
             'KeyConditionExpression': Key('user_id').eq(self.params['user_id']),
             'FilterExpression': Attr('status').eq('public'),
@@ -46,29 +43,11 @@ class UsersArticlesPopular(LambdaBase):
 
             query_params.update({'ExclusiveStartKey': last_evaluated_key})
 
-        response = article_info_table.query(**query_params)
-
-        items = response['Items']
-
-        while 'LastEvaluatedKey' in response and len(response['Items']) < limit:
-            query_params.update({'ExclusiveStartKey': response['LastEvaluatedKey']})
-            response = article_info_table.query(**query_params)
-            items.extend(response['Items'])
-
-            if len(items) >= limit:
-                last_evaluated_key = {
-                    'user_id': self.params['user_id'],
-                    'article_id': items[limit - 1]['article_id'],
-                    'popular_sort_key': int(items[limit - 1]['popular_sort_key'])
-                }
-                response.update({'LastEvaluatedKey': last_evaluated_key})
-                break
-
-        response['Items'] = items[:limit]
+        response = DBUtil.query_with_limit(article_info_table, query_params, limit)
 
         return {
             'statusCode': 200,
-            'body': json.dumps(response, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(response)
         }
 
     @staticmethod
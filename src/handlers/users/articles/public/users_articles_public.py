@@ -1,12 +1,11 @@
 # -*- coding: utf-8 -*-
 import os
-import json
 import settings
+from db_util import DBUtil
 from lambda_base import LambdaBase
 from boto3.dynamodb.conditions import Key, Attr
-from jsonschema import validate, ValidationError
-from decimal_encoder import DecimalEncoder
-from parameter_util import ParameterUtil
+from jsonschema import ValidationError
+from json_util import JsonUtil
 
 
 class UsersArticlesPublic(LambdaBase):
@@ -30,9 +29,9 @@ class UsersArticlesPublic(LambdaBase):
 
         if self.event.get('queryStringParameters') is not None:
             params.update(self.event.get('queryStringParameters'))
-        ParameterUtil.cast_parameter_to_int(params, self.get_schema())
+        self.cast_params_to_int(params)
 
-        validate(params, self.get_schema())
+        self.validate_schema(params)
 
     def exec_main_proc(self):
         article_info_table = self.dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
@@ -40,7 +39,6 @@ class UsersArticlesPublic(LambdaBase):
         limit = self.__get_index_limit(self.event.get('queryStringParameters'))
 
         query_params = {
-            'Limit': limit,
             'IndexName': 'user_id-sort_key-index',
             'KeyConditionExpression': Key('user_id').eq(self.event['pathParameters']['user_id']),
             'FilterExpression': Attr('status').eq('public'),
@@ -56,29 +54,11 @@ class UsersArticlesPublic(LambdaBase):
 
             query_params.update({'ExclusiveStartKey': LastEvaluatedKey})
 
-        response = article_info_table.query(**query_params)
-
-        items = response['Items']
-
-        while 'LastEvaluatedKey' in response and len(response['Items']) < limit:
-            query_params.update({'ExclusiveStartKey': response['LastEvaluatedKey']})
-            response = article_info_table.query(**query_params)
-            items.extend(response['Items'])
-
-            if len(items) >= limit:
-                LastEvaluatedKey = {
-                    'user_id': self.params['user_id'],
-                    'article_id': items[limit - 1]['article_id'],
-                    'sort_key': int(items[limit - 1]['sort_key'])
-                }
-                response.update({'LastEvaluatedKey': LastEvaluatedKey})
-                break
-
-        response['Items'] = items[:limit]
+        response = DBUtil.query_with_limit(article_info_table, query_params, limit)
 
         return {
             'statusCode': 200,
-            'body': json.dumps(response, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(response)
         }
 
     def __get_index_limit(self, params):
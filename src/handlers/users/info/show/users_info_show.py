@@ -1,10 +1,8 @@
 # -*- coding: utf-8 -*-
-import json
 import os
 import settings
 from lambda_base import LambdaBase
-from jsonschema import validate
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from record_not_found_error import RecordNotFoundError
 
 
@@ -20,7 +18,7 @@ class UsersInfoShow(LambdaBase):
 
     def validate_params(self):
         # single
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         users_table = self.dynamodb.Table(os.environ['USERS_TABLE_NAME'])
@@ -31,5 +29,5 @@ class UsersInfoShow(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps(response['Item'], cls=DecimalEncoder)
+            'body': JsonUtil.dumps(response['Item'])
         }
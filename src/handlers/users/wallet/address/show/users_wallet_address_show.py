@@ -2,7 +2,6 @@ import json
 import settings
 from user_util import UserUtil
 from lambda_base import LambdaBase
-from jsonschema import validate
 
 
 class UsersWalletAddressShow(LambdaBase):
@@ -16,7 +15,7 @@ class UsersWalletAddressShow(LambdaBase):
         }
 
     def validate_params(self):
-        validate(self.params, self.get_schema())
+        self.validate_schema(self.params)
 
     def exec_main_proc(self):
         # get private_eth_address
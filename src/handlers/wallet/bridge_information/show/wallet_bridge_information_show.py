@@ -1,8 +1,7 @@
 # -*- coding: utf-8 -*-
 import os
-import json
 from lambda_base import LambdaBase
-from decimal_encoder import DecimalEncoder
+from json_util import JsonUtil
 from private_chain_util import PrivateChainUtil
 
 
@@ -28,25 +27,29 @@ class WalletBridgeInformationShow(LambdaBase):
 
         return {
             'statusCode': 200,
-            'body': json.dumps(result, cls=DecimalEncoder)
+            'body': JsonUtil.dumps(result)
         }
 
     @staticmethod
     def __get_max_single_relay_amount():
         return PrivateChainUtil.send_transaction(
-            'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/wallet/max_single_relay_amount')
+            'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/wallet/max_single_relay_amount',
+            idempotent=True)
 
     @staticmethod
     def __get_min_single_relay_amount():
         return PrivateChainUtil.send_transaction(
-            'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/wallet/min_single_relay_amount')
+            'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/wallet/min_single_relay_amount',
+            idempotent=True)
 
     @staticmethod
     def __get_relay_fee():
         return PrivateChainUtil.send_transaction(
-            'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/wallet/relay_fee')
+            'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/wallet/relay_fee',
+            idempotent=True)
 
     @staticmethod
     def __get_relay_paused():
         return PrivateChainUtil.send_transaction(
-            'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/wallet/relay_paused')
+            'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/wallet/relay_paused',
+            idempotent=True)
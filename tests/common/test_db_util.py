@@ -1,13 +1,16 @@
 import os
 import settings
 import datetime
+import time
 from freezegun import freeze_time
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Key, Attr
 from db_util import DBUtil
 from decimal import Decimal
 from jsonschema import ValidationError
 from tests_util import TestsUtil
+from screened_article_cache import ScreenedArticleCache
 from unittest import TestCase
+from unittest.mock import patch, MagicMock
 from record_not_found_error import RecordNotFoundError
 from not_authorized_error import NotAuthorizedError
 
@@ -256,6 +259,7 @@ class TestDBUtil(TestCase):
         TestsUtil.create_table(cls.dynamodb, os.environ['TOPIC_TABLE_NAME'], topic_items)
 
     def setUp(self):
+        ScreenedArticleCache.clear()
         # create tables
         TestsUtil.create_table(self.dynamodb, os.environ['ARTICLE_CONTENT_EDIT_HISTORY_TABLE_NAME'], [])
         TestsUtil.create_table(self.dynamodb, os.environ['SCREENED_ARTICLE_TABLE_NAME'], [])
@@ -632,6 +636,281 @@ class TestDBUtil(TestCase):
 
         self.assertEqual(len(response), 4)
 
+    def test_query_with_limit_ok(self):
+        article_info_table = self.dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
+        for i in range(1, 8):
+            article_info_table.put_item(Item={
+                'article_id': 'limitid' + str(i).zfill(5),
+                'user_id': 'limituser',
+                'status': 'public' if i % 2 == 1 else 'draft',
+                'sort_key': 1520150272000000 + i
+            })
+        query_params = {
+            'IndexName': 'user_id-sort_key-index',
+            'KeyConditionExpression': Key('user_id').eq('limituser'),
+            'FilterExpression': Attr('status').eq('public'),
+            'ScanIndexForward': False
+        }
+
+        response = DBUtil.query_with_limit(article_info_table, query_params, 2)
+        self.assertEqual([item['article_id'] for item in response['Items']], ['limitid00007', 'limitid00005'])
+        self.assertEqual(response['Count'], 2)
+
+        # LastEvaluatedKey を指定して続きが取得できること
+        query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        response = DBUtil.query_with_limit(article_info_table, query_params, 2)
+        self.assertEqual([item['article_id'] for item in response['Items']], ['limitid00003', 'limitid00001'])
+
+        for i in range(1, 8):
+            article_info_table.delete_item(Key={'article_id': 'limitid' + str(i).zfill(5)})
+
+    def test_query_with_limit_ok_with_over_limit(self):
+        table = MagicMock()
+        table.query.side_effect = [
+            {
+                'Items': [{'id': 'a1', 'sort_key': 9}],
+                'Count': 1,
+                'ScannedCount': 4,
+                'LastEvaluatedKey': {'id': 'a4', 'sort_key': 6}
+            },
+            {
+                'Items': [{'id': 'a5', 'sort_key': 5}, {'id': 'a6', 'sort_key': 4}, {'id': 'a7', 'sort_key': 3},
+                          {'id': 'a9', 'sort_key': 2}],
+                'Count': 4,
+                'ScannedCount': 12,
+                'LastEvaluatedKey': {'id': 'a16', 'sort_key': 1}
+            }
+        ]
+
+        response = DBUtil.query_with_limit(table, {'IndexName': 'test-index'}, 4)
+
+        # 2 ページ目は 1 ページ目の選択率（1 / 4）から、残り 3 件の取得に必要な件数を Limit とすること
+        _, kwargs = table.query.call_args
+        self.assertEqual(kwargs, {'IndexName': 'test-index', 'Limit': 12, 'ExclusiveStartKey': {'id': 'a4', 'sort_key': 6}})
+        # limit 件を超えた場合は、返却する最後の item を起点とした LastEvaluatedKey が返却されること
+        self.assertEqual([item['id'] for item in response['Items']], ['a1', 'a5', 'a6', 'a7'])
+        self.assertEqual(response['LastEvaluatedKey'], {'id': 'a7', 'sort_key': 3})
+        self.assertEqual(response['Count'], 4)
+        self.assertEqual(response['ScannedCount'], 16)
+
+    def test_query_with_limit_ok_with_no_match(self):
+        table = MagicMock()
+        table.query.side_effect = [
+            {'Items': [], 'Count': 0, 'ScannedCount': 10, 'LastEvaluatedKey': {'id': 'a10'}},
+            {'Items': [], 'Count': 0, 'ScannedCount': 20, 'LastEvaluatedKey': {'id': 'a30'}},
+            {'Items': [{'id': 'a80'}], 'Count': 1, 'ScannedCount': 70}
+        ]
+
+        with patch('settings.DYNAMO_QUERY_MAX_PAGE_SIZE', 70):
+            response = DBUtil.query_with_limit(table, {}, 10)
+
+        # 該当がない場合は評価件数を倍にし、上限値を超えないこと
+        self.assertEqual([kwargs['Limit'] for _, kwargs in table.query.call_args_list], [10, 20, 60])
+        self.assertEqual(response['Items'], [{'id': 'a80'}])
+        self.assertNotIn('LastEvaluatedKey', response)
+        self.assertEqual(response['ScannedCount'], 100)
+
+    def test_batch_get_items_ok(self):
+        keys = [{'article_id': article_id} for article_id in
+                ['testid000003', 'testid000001', 'testid999999', 'testid000002', 'testid000001']]
+
+        items = DBUtil.batch_get_items(self.dynamodb, os.environ['ARTICLE_INFO_TABLE_NAME'], keys)
+
+        # keys の順に並び、存在しない item は含まれないこと
+        self.assertEqual(
+            [item['article_id'] for item in items],
+            ['testid000003', 'testid000001', 'testid000002', 'testid000001']
+        )
+        self.assertEqual(items[0], self.article_info_table_items[2])
+
+    def test_batch_get_items_ok_over_batch_get_max(self):
+        keys = [{'article_id': article_id} for article_id in ['testid000002', 'testid000003', 'testid000001']]
+
+        with patch('settings.DYNAMO_BATCH_GET_MAX', 1):
+            items = DBUtil.batch_get_items(self.dynamodb, os.environ['ARTICLE_INFO_TABLE_NAME'], keys)
+
+        self.assertEqual([item['article_id'] for item in items], ['testid000002', 'testid000003', 'testid000001'])
+
+    def test_batch_get_items_ok_with_number_key(self):
+        article_pv_user_table = self.dynamodb.Table(os.environ['ARTICLE_PV_USER_TABLE_NAME'])
+        expected = article_pv_user_table.scan(Limit=2)['Items']
+        keys = [{'article_id': item['article_id'], 'user_id': item['user_id']} for item in expected]
+
+        with patch('settings.DYNAMO_BATCH_GET_MAX', 1):
+            items = DBUtil.batch_get_items(self.dynamodb, os.environ['ARTICLE_PV_USER_TABLE_NAME'], keys)
+
+        # 並列に取得した場合も resource で取得した場合と同一の型で返却されること
+        self.assertEqual(items, expected)
+
+    def test_batch_get_items_ok_with_projection_attributes(self):
+        items = DBUtil.batch_get_items(self.dynamodb, os.environ['USERS_TABLE_NAME'], [{'user_id': 'test01'}],
+                                       projection_attributes=['user_display_name'])
+
+        self.assertEqual(items, [{'user_id': 'test01', 'user_display_name': 'test_display_name01'}])
+
+    def test_batch_get_items_ok_with_empty_keys(self):
+        dynamodb = MagicMock()
+        self.assertEqual(DBUtil.batch_get_items(dynamodb, 'Test', []), [])
+        self.assertFalse(dynamodb.meta.client.batch_get_item.called)
+
+    def test_batch_get_items_ok_with_unprocessed_keys(self):
+        dynamodb = MagicMock()
+        dynamodb.meta.client.batch_get_item.side_effect = [
+            {
+                'Responses': {'Test': [{'article_id': 'testid000002'}]},
+                'UnprocessedKeys': {'Test': {'Keys': [{'article_id': 'testid000001'}]}}
+            },
+            {
+                'Responses': {'Test': [{'article_id': 'testid000001'}]},
+                'UnprocessedKeys': {}
+            }
+        ]
+
+        with patch('time.sleep') as mock_sleep:
+            items = DBUtil.batch_get_items(dynamodb, 'Test', [{'article_id': 'testid000001'},
+                                                              {'article_id': 'testid000002'}])
+
+        self.assertEqual(items, [{'article_id': 'testid000001'}, {'article_id': 'testid000002'}])
+        self.assertEqual(mock_sleep.call_count, 1)
+        _, kwargs = dynamodb.meta.client.batch_get_item.call_args
+        self.assertEqual(kwargs['RequestItems'], {'Test': {'Keys': [{'article_id': 'testid000001'}]}})
+
+    def test_batch_get_items_ng_unprocessed_keys_remain(self):
+        dynamodb = MagicMock()
+        dynamodb.meta.client.batch_get_item.return_value = {
+            'Responses': {'Test': []},
+            'UnprocessedKeys': {'Test': {'Keys': [{'article_id': 'testid000001'}]}}
+        }
+
+        with patch('time.sleep'), self.assertRaises(Exception):
+            DBUtil.batch_get_items(dynamodb, 'Test', [{'article_id': 'testid000001'}])
+        self.assertEqual(dynamodb.meta.client.batch_get_item.call_count, settings.DYNAMO_BATCH_GET_MAX_RETRY + 1)
+
+    def test_get_items_from_tables_ok(self):
+        table_names = [os.environ['ARTICLE_INFO_TABLE_NAME'], os.environ['ARTICLE_CONTENT_TABLE_NAME']]
+
+        items = DBUtil.get_items_from_tables(self.dynamodb, table_names, {'article_id': 'testid000002'})
+
+        # table_names の順に並ぶこと
+        self.assertEqual(items, [self.article_info_table_items[1], self.article_content_table_items[1]])
+
+    def test_get_items_from_tables_ok_with_not_exists(self):
+        table_names = [os.environ['ARTICLE_INFO_TABLE_NAME'], os.environ['ARTICLE_CONTENT_TABLE_NAME']]
+
+        items = DBUtil.get_items_from_tables(self.dynamodb, table_names, {'article_id': 'testid999999'})
+
+        # 存在しない item は None となること
+        self.assertEqual(items, [None, None])
+
+    def test_get_items_from_tables_ok_with_unprocessed_keys(self):
+        dynamodb = MagicMock()
+        dynamodb.meta.client.batch_get_item.side_effect = [
+            {
+                'Responses': {'Info': [{'article_id': 'testid000001'}]},
+                'UnprocessedKeys': {'Content': {'Keys': [{'article_id': 'testid000001'}]}}
+            },
+            {
+                'Responses': {'Content': [{'article_id': 'testid000001', 'body': 'test_body'}]},
+                'UnprocessedKeys': {}
+            }
+        ]
+
+        with patch('time.sleep'):
+            items = DBUtil.get_items_from_tables(dynamodb, ['Info', 'Content'], {'article_id': 'testid000001'})
+
+        self.assertEqual(items, [{'article_id': 'testid000001'}, {'article_id': 'testid000001', 'body': 'test_body'}])
+        self.assertEqual(dynamodb.meta.client.batch_get_item.call_count, 2)
+
+    def test_query_all_items_iter_ok_with_projection_attributes(self):
+        article_pv_user_table = self.dynamodb.Table(os.environ['ARTICLE_PV_USER_TABLE_NAME'])
+        query_params = {
+            'IndexName': 'target_date-sort_key-index',
+            'KeyConditionExpression': Key('target_date').eq('2018-05-01'),
+            'Limit': 1
+        }
+
+        items = list(DBUtil.query_all_items_iter(article_pv_user_table, query_params, projection_attributes=['user_id']))
+
+        self.assertEqual(len(items), 4)
+        self.assertEqual(set(items[0].keys()), {'user_id'})
+        # 呼び出し元の query_params は変更されないこと
+        self.assertNotIn('ExclusiveStartKey', query_params)
+
+    def test_query_all_items_iter_ok_stop_iteration(self):
+        table = MagicMock()
+        table.query.side_effect = [
+            {'Items': [{'id': 'a1'}, {'id': 'a2'}], 'LastEvaluatedKey': {'id': 'a2'}},
+            {'Items': [{'id': 'a3'}]}
+        ]
+
+        for item in DBUtil.query_all_items_iter(table, {}):
+            if item['id'] == 'a2':
+                break
+
+        # 反復を中断した場合は以降のページを取得しないこと
+        self.assertEqual(table.query.call_count, 1)
+
+    def test_scan_all_items_parallel_ok(self):
+        article_pv_user_table = self.dynamodb.Table(os.environ['ARTICLE_PV_USER_TABLE_NAME'])
+        expected = sorted([item['user_id'] for item in article_pv_user_table.scan()['Items']])
+
+        items = list(DBUtil.scan_all_items_parallel(article_pv_user_table, scan_params={'Limit': 1}, total_segments=3,
+                                                    projection_attributes=['user_id']))
+
+        self.assertEqual(sorted([item['user_id'] for item in items]), expected)
+        self.assertEqual(set(items[0].keys()), {'user_id'})
+
+    def test_scan_all_items_parallel_ok_with_filter_expression(self):
+        article_pv_user_table = self.dynamodb.Table(os.environ['ARTICLE_PV_USER_TABLE_NAME'])
+        expected = sorted([item['user_id'] for item in article_pv_user_table.scan()['Items']
+                           if item['target_date'] == '2018-05-01'])
+
+        items = list(DBUtil.scan_all_items_parallel(
+            article_pv_user_table,
+            scan_params={'FilterExpression': Attr('target_date').eq('2018-05-01')},
+            total_segments=3,
+            projection_attributes=['user_id']
+        ))
+
+        self.assertEqual(sorted([item['user_id'] for item in items]), expected)
+
+    def test_build_condition_expressions(self):
+        params = {
+            'KeyConditionExpression': Key('article_id').eq('article01'),
+            'FilterExpression': Attr('status').eq('public'),
+            'ExpressionAttributeNames': {'#projection0': 'user_id'}
+        }
+
+        result = DBUtil.build_condition_expressions(params)
+
+        # KeyConditionExpression と FilterExpression でプレースホルダが重複しないこと
+        self.assertEqual(result['KeyConditionExpression'], '#n0 = :v0')
+        self.assertEqual(result['FilterExpression'], '#n1 = :v1')
+        self.assertEqual(result['ExpressionAttributeNames'], {'#projection0': 'user_id', '#n0': 'article_id', '#n1': 'status'})
+        self.assertEqual(result['ExpressionAttributeValues'], {':v0': 'article01', ':v1': 'public'})
+        # 呼び出し元の params は変更されないこと
+        self.assertNotIsInstance(params['KeyConditionExpression'], str)
+
+    def test_scan_all_items_parallel_ok_stop_iteration(self):
+        table = MagicMock()
+        table.meta.client.scan.return_value = {'Items': [{'id': 'a1'}], 'LastEvaluatedKey': {'id': 'a1'}}
+
+        items = DBUtil.scan_all_items_parallel(table, total_segments=2)
+        self.assertEqual(next(items), {'id': 'a1'})
+        items.close()
+
+        # 反復を中断した後は各 Segment の scan が停止すること
+        call_count = table.meta.client.scan.call_count
+        time.sleep(0.3)
+        self.assertEqual(table.meta.client.scan.call_count, call_count)
+
+    def test_scan_all_items_parallel_ng(self):
+        table = MagicMock()
+        table.meta.client.scan.side_effect = Exception('scan error')
+
+        with self.assertRaisesRegex(Exception, 'scan error'):
+            list(DBUtil.scan_all_items_parallel(table, total_segments=2))
+
     def test_validate_topic_ok(self):
         self.assertTrue(DBUtil.validate_topic(self.dynamodb, 'crypto'))
 
@@ -0,0 +1,86 @@
+import os
+from tests_util import TestsUtil
+from unittest import TestCase
+from unittest.mock import MagicMock
+from dynamodb_item_memo import DynamoDBItemMemo
+
+
+class TestDynamoDBItemMemo(TestCase):
+    dynamodb = TestsUtil.get_dynamodb_client()
+
+    @classmethod
+    def setUpClass(cls):
+        TestsUtil.set_all_tables_name_to_env()
+        TestsUtil.delete_all_tables(cls.dynamodb)
+
+    def setUp(self):
+        TestsUtil.delete_all_tables(self.dynamodb)
+        article_info_items = [
+            {'article_id': 'testid000001', 'user_id': 'test01', 'status': 'public'},
+            {'article_id': 'testid000002', 'user_id': 'test02', 'status': 'public'}
+        ]
+        TestsUtil.create_table(self.dynamodb, os.environ['ARTICLE_INFO_TABLE_NAME'], article_info_items)
+        self.table = self.dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
+        self.table.get_item = MagicMock(wraps=self.table.get_item)
+        DynamoDBItemMemo.start()
+
+    def tearDown(self):
+        DynamoDBItemMemo.stop()
+
+    @classmethod
+    def tearDownClass(cls):
+        TestsUtil.delete_all_tables(cls.dynamodb)
+
+    def test_get_item_ok(self):
+        item = DynamoDBItemMemo.get_item(self.table, {'article_id': 'testid000001'})
+        self.assertEqual(item, {'article_id': 'testid000001', 'user_id': 'test01', 'status': 'public'})
+
+        # 取得済みの item は memo から返却されること
+        item['status'] = 'draft'
+        self.assertEqual(DynamoDBItemMemo.get_item(self.table, {'article_id': 'testid000001'})['status'], 'public')
+        DynamoDBItemMemo.get_item(self.table, {'article_id': 'testid000002'})
+        self.assertEqual(self.table.get_item.call_count, 2)
+
+    def test_get_item_ok_not_exists(self):
+        self.assertIsNone(DynamoDBItemMemo.get_item(self.table, {'article_id': 'testid000003'}))
+        self.assertIsNone(DynamoDBItemMemo.get_item(self.table, {'article_id': 'testid000003'}))
+        self.assertEqual(self.table.get_item.call_count, 1)
+
+    def test_get_item_ok_without_memo(self):
+        DynamoDBItemMemo.stop()
+        DynamoDBItemMemo.get_item(self.table, {'article_id': 'testid000001'})
+        DynamoDBItemMemo.get_item(self.table, {'article_id': 'testid000001'})
+        self.assertEqual(self.table.get_item.call_count, 2)
+
+    def test_update_item_ok(self):
+        DynamoDBItemMemo.get_item(self.table, {'article_id': 'testid000001'})
+        DynamoDBItemMemo.get_item(self.table, {'article_id': 'testid000002'})
+        DynamoDBItemMemo.update_item(
+            self.table,
+            Key={'article_id': 'testid000001'},
+            UpdateExpression='set #attr = :status',
+            ExpressionAttributeNames={'#attr': 'status'},
+            ExpressionAttributeValues={':status': 'draft'}
+        )
+
+        # 更新した item のみ再取得されること
+        self.assertEqual(DynamoDBItemMemo.get_item(self.table, {'article_id': 'testid000001'})['status'], 'draft')
+        DynamoDBItemMemo.get_item(self.table, {'article_id': 'testid000002'})
+        self.assertEqual(self.table.get_item.call_count, 3)
+
+    def test_put_item_ok(self):
+        DynamoDBItemMemo.get_item(self.table, {'article_id': 'testid000001'})
+        DynamoDBItemMemo.put_item(
+            self.table,
+            Item={'article_id': 'testid000001', 'user_id': 'test01', 'status': 'delete'}
+        )
+
+        self.assertEqual(DynamoDBItemMemo.get_item(self.table, {'article_id': 'testid000001'})['status'], 'delete')
+        self.assertEqual(self.table.get_item.call_count, 2)
+
+    def test_delete_item_ok(self):
+        DynamoDBItemMemo.get_item(self.table, {'article_id': 'testid000001'})
+        DynamoDBItemMemo.delete_item(self.table, Key={'article_id': 'testid000001'})
+
+        self.assertIsNone(DynamoDBItemMemo.get_item(self.table, {'article_id': 'testid000001'}))
+        self.assertEqual(self.table.get_item.call_count, 2)
@@ -1,6 +1,10 @@
 from unittest import TestCase
+from unittest.mock import MagicMock, patch
 
-from elasticsearch import Elasticsearch
+from jsonschema import ValidationError
+
+import settings
+from elasticsearch import Elasticsearch, NotFoundError
 from tests_es_util import TestsEsUtil
 
 from es_util import ESUtil
@@ -45,6 +49,195 @@ class TestDBUtil(TestCase):
         self.assertEquals(len(result), 2)
         self.assertEquals([tag['name'] for tag in result], ['A8', 'A7'])
 
+    def test_search_recent_articles_with_write_blacklisted(self):
+        elasticsearch = MagicMock()
+        elasticsearch.search.return_value = {'hits': {'hits': []}}
+
+        with patch('screened_article_cache.ScreenedArticleCache.get_sorted_write_blacklisted_users',
+                   return_value=('user01', 'user02', 'user03')):
+            ESUtil.search_recent_articles(elasticsearch, MagicMock(), {}, 10, 1)
+
+        # blacklist の件数によらず単一の terms 句で除外すること
+        _, kwargs = elasticsearch.search.call_args
+        self.assertEqual(
+            kwargs['body']['query']['bool']['must_not'],
+            [{'terms': {'user_id.keyword': ['user01', 'user02', 'user03']}}]
+        )
+
+    def test_search_recent_articles_without_write_blacklisted(self):
+        elasticsearch = MagicMock()
+        elasticsearch.search.return_value = {'hits': {'hits': []}}
+
+        with patch('screened_article_cache.ScreenedArticleCache.get_sorted_write_blacklisted_users', return_value=()):
+            ESUtil.search_recent_articles(elasticsearch, MagicMock(), {}, 10, 1)
+
+        _, kwargs = elasticsearch.search.call_args
+        self.assertEqual(kwargs['body']['query']['bool']['must_not'], [])
+
+    @patch('screened_article_cache.ScreenedArticleCache.get_sorted_write_blacklisted_users', MagicMock(return_value=()))
+    def test_search_popular_articles_with_index_cache(self):
+        ESUtil.index_cache.clear()
+        elasticsearch = MagicMock()
+        elasticsearch.indices.get_alias.return_value = {'article_scores_01': {'aliases': {'article_scores': {}}}}
+        elasticsearch.search.return_value = {'hits': {'hits': [{'_source': {'article_id': 'testid000001'}}]}}
+
+        for _ in range(3):
+            result = ESUtil.search_popular_articles(elasticsearch, MagicMock(), {}, 10, 1)
+            self.assertEqual(result, [{'article_id': 'testid000001'}])
+
+        # インデックスの解決は初回のみ行い、以降は検索のみを行うこと
+        self.assertEqual(elasticsearch.indices.get_alias.call_count, 1)
+        self.assertEqual(elasticsearch.search.call_count, 3)
+        self.assertFalse(elasticsearch.indices.exists.called)
+        self.assertEqual(ESUtil.get_indices(elasticsearch, settings.ARTICLE_SCORE_INDEX_NAME), ('article_scores_01',))
+
+    @patch('screened_article_cache.ScreenedArticleCache.get_sorted_write_blacklisted_users', MagicMock(return_value=()))
+    def test_search_popular_articles_with_no_index(self):
+        ESUtil.index_cache.clear()
+        elasticsearch = MagicMock()
+        elasticsearch.indices.get_alias.return_value = {'error': {'type': 'index_not_found_exception'}, 'status': 404}
+
+        for _ in range(2):
+            self.assertEqual(ESUtil.search_popular_articles(elasticsearch, MagicMock(), {}, 10, 1), [])
+
+        self.assertEqual(elasticsearch.indices.get_alias.call_count, 1)
+        self.assertFalse(elasticsearch.search.called)
+
+    @patch('screened_article_cache.ScreenedArticleCache.get_sorted_write_blacklisted_users', MagicMock(return_value=()))
+    def test_search_tip_ranked_articles_with_index_not_found(self):
+        ESUtil.index_cache.clear()
+        elasticsearch = MagicMock()
+        elasticsearch.indices.get_alias.return_value = {'tip_ranking_01': {'aliases': {'tip_ranking': {}}}}
+        elasticsearch.search.side_effect = NotFoundError(404, 'index_not_found_exception', {})
+
+        # キャッシュ後にインデックスが削除された場合も空の結果を返却すること
+        self.assertEqual(ESUtil.search_tip_ranked_articles(elasticsearch, MagicMock(), {}, 10, 1), [])
+        self.assertEqual(ESUtil.search_tip_ranked_articles(elasticsearch, MagicMock(), {}, 10, 1), [])
+        self.assertEqual(elasticsearch.search.call_count, 1)
+        self.assertEqual(ESUtil.get_indices(elasticsearch, settings.ARTICLE_TIP_RANKING_INDEX_NAME), ())
+
+    @patch('screened_article_cache.ScreenedArticleCache.get_sorted_write_blacklisted_users', MagicMock(return_value=()))
+    def test_search_tip_ranked_articles_with_other_not_found_error(self):
+        ESUtil.index_cache.clear()
+        elasticsearch = MagicMock()
+        elasticsearch.indices.get_alias.return_value = {'tip_ranking_01': {'aliases': {'tip_ranking': {}}}}
+        elasticsearch.search.side_effect = NotFoundError(404, 'resource_not_found_exception', {})
+
+        with self.assertRaises(NotFoundError):
+            ESUtil.search_tip_ranked_articles(elasticsearch, MagicMock(), {}, 10, 1)
+
+    def test_search_user_before_ngram_migration(self):
+        ESUtil.user_search_name_ngram_cache.clear()
+        elasticsearch = MagicMock()
+        elasticsearch.indices.get_mapping.return_value = {'users': {'mappings': {'user': {'properties': {}}}}}
+
+        ESUtil.search_user(elasticsearch, 'abc', 10, 1)
+        ESUtil.search_user(elasticsearch, 'abc', 10, 1)
+
+        # 移行完了前は従来の wildcard で検索し、マッピングの確認はキャッシュすること
+        _, kwargs = elasticsearch.search.call_args
+        self.assertEqual(kwargs['body']['query'], {'wildcard': {'search_name': '*abc*'}})
+        self.assertEqual(elasticsearch.indices.get_mapping.call_count, 1)
+
+    def test_search_user_after_ngram_migration(self):
+        ESUtil.user_search_name_ngram_cache.clear()
+        elasticsearch = MagicMock()
+        elasticsearch.indices.get_mapping.return_value = {
+            'users': {'mappings': {'user': {'_meta': {'search_name_ngram_ready': True}, 'properties': {}}}}
+        }
+
+        ESUtil.search_user(elasticsearch, 'abc', 10, 1)
+        _, kwargs = elasticsearch.search.call_args
+        self.assertEqual(kwargs['body']['query'], {'match_phrase': {'search_name.ngram': 'abc'}})
+
+        ESUtil.search_user(elasticsearch, 'ab', 10, 1)
+        _, kwargs = elasticsearch.search.call_args
+        self.assertEqual(
+            kwargs['body']['query'],
+            {'match': {'search_name.short_ngram': {'query': 'ab', 'operator': 'and'}}}
+        )
+
+    def test_encode_and_decode_cursor(self):
+        sort_values = [12.5, 1520150272000001, 'testid000001']
+        cursor = ESUtil.encode_cursor(sort_values)
+
+        self.assertNotIn('=', cursor)
+        self.assertEqual(ESUtil.decode_cursor(cursor, 3), sort_values)
+
+    def test_decode_cursor_with_invalid_cursor(self):
+        for cursor in ['invalid', ESUtil.encode_cursor({'a': 1}), ESUtil.encode_cursor([1, 2, 3]),
+                       ESUtil.encode_cursor([1, None]), ESUtil.encode_cursor([1, True])]:
+            with self.assertRaises(ValidationError):
+                ESUtil.decode_cursor(cursor, 2)
+
+    @patch('screened_article_cache.ScreenedArticleCache.get_sorted_write_blacklisted_users', MagicMock(return_value=()))
+    def test_search_recent_articles_with_cursor(self):
+        elasticsearch = MagicMock()
+        elasticsearch.search.return_value = {'hits': {'hits': [
+            {'_source': {'article_id': 'testid000002'}, 'sort': [1520150272000002, 'testid000002']},
+            {'_source': {'article_id': 'testid000001'}, 'sort': [1520150272000001, 'testid000001']}
+        ]}}
+
+        # 先頭ページ
+        articles, cursor = ESUtil.search_recent_articles_with_cursor(elasticsearch, MagicMock(), {}, 2, '')
+
+        self.assertEqual(articles, [{'article_id': 'testid000002'}, {'article_id': 'testid000001'}])
+        self.assertEqual(ESUtil.decode_cursor(cursor, 2), [1520150272000001, 'testid000001'])
+        _, kwargs = elasticsearch.search.call_args
+        self.assertEqual(kwargs['body']['sort'], [{'sort_key': 'desc'}] + settings.ES_ARTICLE_CURSOR_TIEBREAKER)
+        self.assertNotIn('from', kwargs['body'])
+        self.assertNotIn('search_after', kwargs['body'])
+
+        # 続きのページは search_after で取得し、limit 未満の場合は cursor を返却しないこと
+        _, next_cursor = ESUtil.search_recent_articles_with_cursor(elasticsearch, MagicMock(), {}, 3, cursor)
+
+        self.assertIsNone(next_cursor)
+        _, kwargs = elasticsearch.search.call_args
+        self.assertEqual(kwargs['body']['search_after'], [1520150272000001, 'testid000001'])
+        self.assertEqual(kwargs['body']['size'], 3)
+        self.assertNotIn('from', kwargs['body'])
+
+    def test_search_article_with_cursor_with_word(self):
+        elasticsearch = MagicMock()
+        elasticsearch.search.return_value = {'hits': {'hits': []}}
+
+        # 文字列検索の場合はスコアを含むソート値の cursor のみ受け付けること
+        with self.assertRaises(ValidationError):
+            ESUtil.search_article_with_cursor(elasticsearch, 10, ESUtil.encode_cursor([1, 'a']), word='ALIS')
+
+        cursor = ESUtil.encode_cursor([1.5, 1, 'a'])
+        _, next_cursor = ESUtil.search_article_with_cursor(elasticsearch, 10, cursor, word='ALIS')
+
+        self.assertIsNone(next_cursor)
+        _, kwargs = elasticsearch.search.call_args
+        self.assertEqual(kwargs['body']['search_after'], [1.5, 1, 'a'])
+
+    def test_search_random_article_ids(self):
+        elasticsearch = MagicMock()
+        elasticsearch.search.return_value = {'hits': {'hits': [{'_id': 'testid000002'}, {'_id': 'testid000001'}]}}
+
+        article_ids = ESUtil.search_random_article_ids(elasticsearch, 2)
+
+        self.assertEqual(article_ids, ['testid000002', 'testid000001'])
+        _, kwargs = elasticsearch.search.call_args
+        # article_id のみを利用するため _source は取得しないこと
+        self.assertEqual(kwargs['body']['size'], 2)
+        self.assertFalse(kwargs['body']['_source'])
+
+    def test_search_article_with_source_fields(self):
+        elasticsearch = MagicMock()
+        elasticsearch.search.return_value = {'hits': {'hits': []}}
+
+        # 本文を含まない項目のみを取得すること
+        ESUtil.search_article(elasticsearch, 10, 1, word='ALIS')
+        _, kwargs = elasticsearch.search.call_args
+        self.assertEqual(kwargs['body']['_source'], settings.ES_ARTICLE_SOURCE_FIELDS)
+        self.assertNotIn('body', kwargs['body']['_source'])
+
+        ESUtil.search_article(elasticsearch, 10, 1, word='ALIS', source_fields=['article_id', 'title'])
+        _, kwargs = elasticsearch.search.call_args
+        self.assertEqual(kwargs['body']['_source'], ['article_id', 'title'])
+
     def __assert_search_tags(self, word, expected):
         result = ESUtil.search_tag(self.elasticsearch, word, 10, 1)
         tags = [tag['name'] for tag in result]
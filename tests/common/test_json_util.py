@@ -0,0 +1,36 @@
+import json
+from decimal import Decimal
+from unittest import TestCase
+from json_util import JsonUtil
+
+
+class TestJsonUtil(TestCase):
+    def test_dumps_ok(self):
+        obj = {
+            'article_id': 'testid000001',
+            'price': Decimal('100000000000000000000'),
+            'like_count': Decimal('3'),
+            'score': Decimal('1.5'),
+            'tags': ['a', 'b'],
+            'eye_catch_url': None
+        }
+        self.assertEqual(
+            JsonUtil.dumps(obj),
+            '{"article_id": "testid000001", "price": 100000000000000000000, "like_count": 3, "score": 1.5, '
+            '"tags": ["a", "b"], "eye_catch_url": null}'
+        )
+
+    def test_dumps_ok_large_integer(self):
+        # wei 単位の値は 64bit 整数の範囲を超えるため、精度を落とさずに整数として出力されること
+        value = Decimal(10 ** 24 + 1)
+        self.assertEqual(json.loads(JsonUtil.dumps({'value': value})), {'value': 10 ** 24 + 1})
+
+    def test_dumps_ok_integral_decimal_with_exponent(self):
+        self.assertEqual(JsonUtil.dumps([Decimal('1E+2'), Decimal('2.0')]), '[100, 2]')
+
+    def test_dumps_ok_negative_fraction(self):
+        self.assertEqual(JsonUtil.dumps([Decimal('-1.5'), Decimal('-2')]), '[-1.5, -2]')
+
+    def test_dumps_ng_not_serializable(self):
+        with self.assertRaises(TypeError):
+            JsonUtil.dumps({'value': object()})
@@ -1,4 +1,6 @@
+import io
 import os
+import copy
 import json
 from tests_util import TestsUtil
 from unittest import TestCase
@@ -7,6 +9,9 @@ from jsonschema import ValidationError
 from lambda_base import LambdaBase
 from record_not_found_error import RecordNotFoundError
 from not_authorized_error import NotAuthorizedError
+from user_util import UserUtil
+from dynamodb_item_memo import DynamoDBItemMemo
+from tag_lookup_memo import TagLookupMemo
 
 
 class TestLambdaBase(TestCase):
@@ -33,6 +38,9 @@ class TestLambdaBase(TestCase):
     def tearDownClass(cls):
         TestsUtil.delete_all_tables(cls.dynamodb)
 
+    def setUp(self):
+        UserUtil.private_eth_address_cache.clear()
+
     class TestLambdaImpl(LambdaBase):
         def get_schema(self):
             pass
@@ -70,6 +78,99 @@ class TestLambdaBase(TestCase):
         response = lambda_impl.main()
         self.assertEqual(response['statusCode'], 500)
 
+    def test_main_ok_with_metrics(self):
+        with patch.dict(os.environ, {'LAMBDA_METRICS_ENABLED': 'true'}), \
+                patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            lambda_impl = self.TestLambdaImpl({}, {}, self.dynamodb)
+            lambda_impl.exec_main_proc = MagicMock(side_effect=RecordNotFoundError('not found'))
+            lambda_impl.main()
+
+        log = json.loads(mock_stdout.getvalue())
+        self.assertEqual(log['Handler'], 'TestLambdaImpl')
+        self.assertEqual(log['StatusCode'], '404')
+        for phase in ['total', 'update_event', 'get_params', 'validate_params', 'exec_main_proc']:
+            self.assertIn(phase, log)
+
+    def test_main_ok_without_metrics(self):
+        with patch.dict(os.environ, {'LAMBDA_METRICS_ENABLED': 'false'}), \
+                patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            self.TestLambdaImpl({}, {}, self.dynamodb).main()
+
+        self.assertEqual(mock_stdout.getvalue(), '')
+
+    def test_main_ok_with_item_memo(self):
+        table = self.dynamodb.Table(os.environ['USER_CONFIGURATIONS_TABLE_NAME'])
+        table.get_item = MagicMock(wraps=table.get_item)
+        lambda_impl = self.TestLambdaImpl({}, {}, self.dynamodb)
+        lambda_impl.validate_params = lambda: DynamoDBItemMemo.get_item(table, {'user_id': 'test-user1'})
+        lambda_impl.exec_main_proc = MagicMock(
+            side_effect=lambda: DynamoDBItemMemo.get_item(table, {'user_id': 'test-user1'})
+        )
+        lambda_impl.main()
+
+        # validate_params と exec_main_proc で同一 item を取得しても DynamoDB への問い合わせは 1 回であること
+        self.assertEqual(table.get_item.call_count, 1)
+        self.assertEqual(lambda_impl.exec_main_proc.call_count, 1)
+        # invocation 終了後は memo が破棄されていること
+        self.assertIsNone(DynamoDBItemMemo.current)
+
+    def test_main_ok_with_tag_lookup_memo(self):
+        lambda_impl = self.TestLambdaImpl({}, {}, self.dynamodb)
+        lambda_impl.exec_main_proc = MagicMock(side_effect=lambda: TagLookupMemo.current)
+        memo = lambda_impl.main()
+
+        # invocation 中のみ memo が有効であること
+        self.assertIsInstance(memo, TagLookupMemo)
+        self.assertIsNone(TagLookupMemo.current)
+
+    def test_main_ng_update_event_error(self):
+        event = {'requestContext': {'authorizer': {'principalId': 'test-user1'}}}
+        with patch.dict(os.environ, {'LAMBDA_METRICS_ENABLED': 'true'}), \
+                patch('sys.stdout', new_callable=io.StringIO) as mock_stdout, \
+                patch('user_util.UserUtil.get_private_eth_address_with_cache') as mock_get_address:
+            mock_get_address.side_effect = Exception('dynamodb error')
+            with self.assertRaisesRegex(Exception, 'dynamodb error'):
+                self.TestLambdaImpl(event, {}, self.dynamodb).main()
+
+        # 例外が送出された場合も memo が破棄され、500 としてメトリクスが出力されること
+        self.assertIsNone(DynamoDBItemMemo.current)
+        self.assertIsNone(TagLookupMemo.current)
+        log = json.loads(mock_stdout.getvalue())
+        self.assertEqual(log['StatusCode'], '500')
+        self.assertIn('total', log)
+
+    class TestSchemaLambdaImpl(LambdaBase):
+        schema_call_count = 0
+
+        def get_schema(self):
+            self.__class__.schema_call_count += 1
+            return {
+                'type': 'object',
+                'properties': {
+                    'limit': {'type': 'integer', 'minimum': 1}
+                }
+            }
+
+        def validate_params(self):
+            self.cast_params_to_int(self.params)
+            self.validate_schema(self.params)
+
+        def exec_main_proc(self):
+            return {'statusCode': 200, 'body': json.dumps(self.params)}
+
+    def test_main_ok_with_compiled_schema(self):
+        LambdaBase.compiled_schemas.clear()
+        self.TestSchemaLambdaImpl.schema_call_count = 0
+
+        for limit in ['1', '2', '0']:
+            response = self.TestSchemaLambdaImpl({'queryStringParameters': {'limit': limit}}, {}).main()
+
+        # schema はクラス毎に 1 度のみ組み立てられ、以降の invocation でも検証・型変換に利用されること
+        self.assertEqual(self.TestSchemaLambdaImpl.schema_call_count, 1)
+        self.assertEqual(response['statusCode'], 400)
+        response = self.TestSchemaLambdaImpl({'queryStringParameters': {'limit': '2'}}, {}).main()
+        self.assertEqual(json.loads(response['body']), {'limit': 2})
+
     def test_get_params_ok_not_exists_any_params(self):
         event = {}
         lambda_impl = self.TestLambdaImpl(event, {})
@@ -198,6 +299,47 @@ class TestLambdaBase(TestCase):
         self.assertEqual('true', lambda_impl.event['requestContext']['authorizer']['claims']['phone_number_verified'])
         self.assertEqual('true', lambda_impl.event['requestContext']['authorizer']['claims']['email_verified'])
 
+    def test_update_event_ok_exists_private_eth_address_with_cache(self):
+        user_id = self.user_configurations_items[0]['user_id']
+        event = {
+            'requestContext': {
+                'authorizer': {
+                    'principalId': user_id
+                }
+            }
+        }
+
+        with patch.dict(os.environ, {'LAMBDA_METRICS_ENABLED': 'true'}), \
+                patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            self.TestLambdaImpl(copy.deepcopy(event), {}, self.dynamodb).main()
+        self.assertEqual(json.loads(mock_stdout.getvalue())['private_eth_address_cache_misses'], 1)
+
+        with patch.dict(os.environ, {'LAMBDA_METRICS_ENABLED': 'true'}), \
+                patch('sys.stdout', new_callable=io.StringIO) as mock_stdout, \
+                patch('user_util.UserUtil.get_private_eth_address_from_db') as mock_get_private_eth_address_from_db:
+            lambda_impl = self.TestLambdaImpl(copy.deepcopy(event), {}, self.dynamodb)
+            lambda_impl.main()
+            mock_get_private_eth_address_from_db.assert_not_called()
+
+        self.assertEqual(self.user_configurations_items[0]['private_eth_address'],
+                         lambda_impl.event['requestContext']['authorizer']['claims']['custom:private_eth_address'])
+        log = json.loads(mock_stdout.getvalue())
+        self.assertEqual(log['private_eth_address_cache_hits'], 1)
+        self.assertNotIn('private_eth_address_cache_misses', log)
+
+    def test_update_event_ok_not_exists_private_eth_address_not_cached(self):
+        user_id = self.user_configurations_items[1]['user_id']
+        event = {
+            'requestContext': {
+                'authorizer': {
+                    'principalId': user_id
+                }
+            }
+        }
+
+        self.TestLambdaImpl(copy.deepcopy(event), {}, self.dynamodb).main()
+        self.assertIsNone(UserUtil.private_eth_address_cache.get(user_id))
+
     def test_update_event_ok_not_exists_private_eth_address(self):
         event = {
             'body': {
@@ -0,0 +1,72 @@
+import io
+import os
+import json
+from unittest import TestCase
+from unittest.mock import patch
+from lambda_metrics import LambdaMetrics
+
+
+class TestLambdaMetrics(TestCase):
+    def test_flush_ok(self):
+        with patch.dict(os.environ, {'LAMBDA_METRICS_ENABLED': 'true'}), \
+                patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            metrics = LambdaMetrics('TestHandler')
+            with metrics.measure('exec_main_proc'):
+                with LambdaMetrics.measure_current('serialize'):
+                    pass
+            metrics.add('dynamodb_calls', 3)
+            metrics.flush({'statusCode': 200})
+
+        log = json.loads(mock_stdout.getvalue())
+        self.assertEqual(log['Handler'], 'TestHandler')
+        self.assertEqual(log['StatusCode'], '200')
+        self.assertEqual(log['dynamodb_calls'], 3)
+        self.assertTrue(log['exec_main_proc'] >= log['serialize'] >= 0)
+        self.assertEqual(log['_aws']['CloudWatchMetrics'][0]['Dimensions'], [['Handler', 'StatusCode']])
+        self.assertEqual(
+            sorted(log['_aws']['CloudWatchMetrics'][0]['Metrics'], key=lambda m: m['Name']),
+            [
+                {'Name': 'dynamodb_calls', 'Unit': 'Count'},
+                {'Name': 'exec_main_proc', 'Unit': 'Milliseconds'},
+                {'Name': 'serialize', 'Unit': 'Milliseconds'}
+            ]
+        )
+        self.assertIsNone(LambdaMetrics.current)
+
+    def test_flush_ok_disabled(self):
+        with patch.dict(os.environ, {'LAMBDA_METRICS_ENABLED': 'false'}), \
+                patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            metrics = LambdaMetrics('TestHandler')
+            with metrics.measure('exec_main_proc'):
+                pass
+            metrics.add('dynamodb_calls', 3)
+            metrics.flush({'statusCode': 200})
+
+        self.assertEqual(mock_stdout.getvalue(), '')
+        self.assertEqual(metrics.metrics, {})
+
+    def test_measure_ok_add_up_same_phase(self):
+        with patch.dict(os.environ, {'LAMBDA_METRICS_ENABLED': 'true'}), \
+                patch('time.perf_counter', side_effect=[1.0, 1.5, 2.0, 2.25]):
+            metrics = LambdaMetrics('TestHandler')
+            with metrics.measure('serialize'):
+                pass
+            with metrics.measure('serialize'):
+                pass
+
+        self.assertEqual(metrics.metrics, {'serialize': 750})
+
+    def test_measure_current_ok_without_current(self):
+        LambdaMetrics.current = None
+        with LambdaMetrics.measure_current('serialize'):
+            pass
+
+    def test_add_current_ok(self):
+        with patch.dict(os.environ, {'LAMBDA_METRICS_ENABLED': 'true'}):
+            metrics = LambdaMetrics('TestHandler')
+            LambdaMetrics.add_current('dynamodb_query_scanned_count', 10)
+            LambdaMetrics.add_current('dynamodb_query_scanned_count', 5)
+        LambdaMetrics.current = None
+        LambdaMetrics.add_current('dynamodb_query_scanned_count', 1)
+
+        self.assertEqual(metrics.metrics, {'dynamodb_query_scanned_count': 15})
@@ -0,0 +1,107 @@
+import os
+import responses
+import requests
+from tests_util import TestsUtil
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+from outbound_call_tracker import OutboundCallTracker
+
+
+class FakeTransport:
+    def __init__(self):
+        self.perform_request = MagicMock(return_value={'hits': {'hits': []}})
+
+
+class FakeElasticsearch:
+    def __init__(self):
+        self.transport = FakeTransport()
+
+
+class TestOutboundCallTracker(TestCase):
+    dynamodb = TestsUtil.get_dynamodb_client()
+
+    @classmethod
+    def setUpClass(cls):
+        TestsUtil.set_all_tables_name_to_env()
+        TestsUtil.delete_all_tables(cls.dynamodb)
+        TestsUtil.create_table(cls.dynamodb, os.environ['ARTICLE_INFO_TABLE_NAME'], [{'article_id': 'testid000001'}])
+
+    @classmethod
+    def tearDownClass(cls):
+        TestsUtil.delete_all_tables(cls.dynamodb)
+
+    def tearDown(self):
+        OutboundCallTracker.stop()
+
+    def test_start_ok_disabled(self):
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop('OUTBOUND_CALL_WARNING_THRESHOLD', None)
+            self.assertIsNone(OutboundCallTracker.start(False, dynamodb=self.dynamodb))
+
+        table = self.dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
+        table.get_item(Key={'article_id': 'testid000001'})
+        self.assertIsNone(OutboundCallTracker.stop())
+
+    def test_record_ok_dynamodb(self):
+        OutboundCallTracker.start(True, dynamodb=self.dynamodb)
+        table = self.dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
+        table.get_item(Key={'article_id': 'testid000001'})
+        table.get_item(Key={'article_id': 'testid000002'})
+        self.dynamodb.batch_get_item(
+            RequestItems={os.environ['ARTICLE_INFO_TABLE_NAME']: {'Keys': [{'article_id': 'testid000001'}]}}
+        )
+        tracker = OutboundCallTracker.stop()
+
+        self.assertEqual(tracker.calls[('dynamodb', os.environ['ARTICLE_INFO_TABLE_NAME'])]['count'], 3)
+
+    def test_record_ok_elasticsearch(self):
+        elasticsearch = FakeElasticsearch()
+        OutboundCallTracker.start(True, elasticsearch=elasticsearch)
+        # 同一の client に対して複数回 start されても二重に計測されないこと
+        OutboundCallTracker.start(True, elasticsearch=elasticsearch)
+        elasticsearch.transport.perform_request('GET', '/articles/_search', body={})
+        tracker = OutboundCallTracker.stop()
+
+        self.assertEqual(tracker.calls[('elasticsearch', 'articles')]['count'], 1)
+
+    @responses.activate
+    def test_record_ok_requests(self):
+        responses.add(responses.POST, 'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/wallet/balance',
+                      json={'result': '0x0'}, status=200)
+        responses.add(responses.GET, 'https://example.com/test', json={}, status=200)
+
+        OutboundCallTracker.start(True)
+        requests.post('https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/wallet/balance')
+        requests.get('https://example.com/test')
+        tracker = OutboundCallTracker.stop()
+
+        self.assertEqual(tracker.calls[('private_chain', '/production/wallet/balance')]['count'], 1)
+        self.assertEqual(tracker.calls[('http', '/test')]['count'], 1)
+
+    def test_report_ok(self):
+        tracker = OutboundCallTracker()
+        tracker.calls = {
+            ('dynamodb', 'ArticleInfo'): {'count': 2, 'time': 10},
+            ('dynamodb', 'Users'): {'count': 1, 'time': 5},
+            ('elasticsearch', 'articles'): {'count': 1, 'time': 20}
+        }
+        metrics = MagicMock()
+        tracker.report(metrics, 'TestHandler')
+
+        metrics.add.assert_any_call('dynamodb_calls', 3)
+        metrics.add.assert_any_call('dynamodb_time', 15, 'Milliseconds')
+        metrics.add.assert_any_call('elasticsearch_calls', 1)
+        metrics.set_property.assert_any_call('dynamodb_targets', {'ArticleInfo': 2, 'Users': 1})
+        metrics.set_property.assert_any_call('dynamodb_target_times', {'ArticleInfo': 10, 'Users': 5})
+
+    def test_report_ok_over_threshold(self):
+        with patch.dict(os.environ, {'OUTBOUND_CALL_WARNING_THRESHOLD': '2'}):
+            tracker = OutboundCallTracker.start(False)
+        tracker.calls = {
+            ('dynamodb', 'ArticleInfo'): {'count': 3, 'time': 10},
+            ('dynamodb', 'Users'): {'count': 2, 'time': 5}
+        }
+
+        with patch('logging.Logger.warning') as mock_warning:
+            tracker.report(MagicMock(), 'TestHandler')
+            mock_warning.assert_called_once_with('TestHandler called ArticleInfo 3 times in one invocation (threshold: 2)')
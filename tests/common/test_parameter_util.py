@@ -1,6 +1,7 @@
 from unittest import TestCase
+from unittest.mock import patch
 
-from jsonschema import ValidationError
+from jsonschema import ValidationError, Draft7Validator
 from parameter_util import ParameterUtil
 
 
@@ -32,6 +33,60 @@ class TestParameterToInt(TestCase):
 
         self.assertEqual(params, expected_params)
 
+    def test_validate_ok(self):
+        schema = {
+            'type': 'object',
+            'properties': {
+                'limit': {'type': 'integer', 'minimum': 1, 'maximum': 100}
+            },
+            'required': ['limit']
+        }
+
+        try:
+            ParameterUtil.validate({'limit': 100}, schema)
+        except ValidationError:
+            self.fail('expected no error is raised')
+
+    def test_validate_ng(self):
+        schema = {
+            'type': 'object',
+            'properties': {
+                'limit': {'type': 'integer', 'minimum': 1, 'maximum': 100}
+            },
+            'required': ['limit']
+        }
+
+        with self.assertRaises(ValidationError):
+            ParameterUtil.validate({'limit': 101}, schema)
+        with self.assertRaises(ValidationError):
+            ParameterUtil.validate({}, schema)
+
+    def test_validate_ok_with_format_checker(self):
+        schema = {
+            'type': 'object',
+            'properties': {
+                'mail': {'type': 'string', 'format': 'email'}
+            }
+        }
+
+        ParameterUtil.validate({'mail': 'not_email'}, schema)
+        with self.assertRaises(ValidationError):
+            ParameterUtil.validate({'mail': 'not_email'}, schema, use_format_checker=True)
+
+    def test_validate_ok_compile_schema_once(self):
+        with patch.object(Draft7Validator, 'check_schema', wraps=Draft7Validator.check_schema) as mock_check_schema:
+            for limit in [1, 2, 3]:
+                schema = {
+                    'type': 'object',
+                    'properties': {
+                        'compile_once_limit': {'type': 'integer'}
+                    }
+                }
+                ParameterUtil.cast_parameter_to_int({'compile_once_limit': str(limit)}, schema)
+                ParameterUtil.validate({'compile_once_limit': limit}, schema)
+
+            self.assertEqual(mock_check_schema.call_count, 1)
+
     def test_validate_array_unique_ok(self):
         target_items = ["FOO", "BAR", "foo"]
 
@@ -60,6 +115,18 @@ class TestParameterToInt(TestCase):
         with self.assertRaises(ValidationError):
             ParameterUtil.validate_array_unique(target_items, 'tags', case_insensitive=True)
 
+    def test_validate_fields_ok(self):
+        try:
+            ParameterUtil.validate_fields('article_id,title', ['article_id', 'title', 'overview'])
+            ParameterUtil.validate_fields(None, ['article_id'])
+        except ValidationError:
+            self.fail('expected no error is raised')
+
+    def test_validate_fields_with_not_allowed_field(self):
+        for fields in ['article_id,body', 'article_id,', ',article_id']:
+            with self.assertRaises(ValidationError):
+                ParameterUtil.validate_fields(fields, ['article_id', 'title'])
+
     def test_validate_price_params_ng_string(self):
         price = 'AAAA'
         with self.assertRaises(ValidationError):
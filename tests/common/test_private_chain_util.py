@@ -1,9 +1,14 @@
 import settings
 import os
+import json
+import requests
+import rlp
 from tests_util import TestsUtil
 from private_chain_util import PrivateChainUtil
-from web3 import Web3, HTTPProvider
+from lambda_metrics import LambdaMetrics
+from web3 import Web3, Account, HTTPProvider
 from eth_account.messages import encode_defunct
+from eth_keys import keys
 from eth_keys.exceptions import BadSignature
 from jsonschema import ValidationError
 from unittest import TestCase
@@ -32,14 +37,20 @@ class TestPrivateChainUtil(TestCase):
         TestsUtil.set_aws_auth_to_env()
         TestsUtil.set_all_private_chain_valuables_to_env()
 
-    @patch('requests.post', MagicMock(return_value=FakeResponse(status_code=200, text='{"result": "result_str"}')))
+    def setUp(self):
+        PrivateChainUtil.raw_transactions.clear()
+
+    def tearDown(self):
+        LambdaMetrics.current = None
+
+    @patch('requests.Session.post', MagicMock(return_value=FakeResponse(status_code=200, text='{"result": "result_str"}')))
     @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
     def test_send_transaction_ok(self):
         url = 'test_url'
         response = PrivateChainUtil.send_transaction(request_url=url)
         self.assertEqual(response, 'result_str')
 
-    @patch('requests.post', MagicMock(return_value=FakeResponse(status_code=200, text='{"result": "result_str"}')))
+    @patch('requests.Session.post', MagicMock(return_value=FakeResponse(status_code=200, text='{"result": "result_str"}')))
     @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
     def test_send_transaction_ok_with_payload(self):
         url = 'test_url'
@@ -47,20 +58,97 @@ class TestPrivateChainUtil(TestCase):
         response = PrivateChainUtil.send_transaction(request_url=url, payload_dict=payload_dict)
         self.assertEqual(response, 'result_str')
 
-    @patch('requests.post', MagicMock(return_value=FakeResponse(status_code=500, text='{"result": "result_str"}')))
+    @patch('requests.Session.post', MagicMock(return_value=FakeResponse(status_code=500, text='{"result": "result_str"}')))
     @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
     def test_send_transaction_ng_status_code_not_200(self):
         with self.assertRaises(SendTransactionError):
             url = 'test_url'
             PrivateChainUtil.send_transaction(request_url=url)
 
-    @patch('requests.post', MagicMock(return_value=FakeResponse(status_code=200, text='{"error": "error"}')))
+    @patch('requests.Session.post', MagicMock(return_value=FakeResponse(status_code=200, text='{"error": "error"}')))
     @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
     def test_send_transaction_ng_exists_error(self):
         with self.assertRaises(SendTransactionError):
             url = 'test_url'
             PrivateChainUtil.send_transaction(request_url=url)
 
+    @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
+    @patch.dict(os.environ, {'LAMBDA_METRICS_ENABLED': 'true'})
+    def test_send_transaction_ok_with_session(self):
+        metrics = LambdaMetrics('TestHandler')
+        with patch('requests.Session.post') as mock_post:
+            mock_post.return_value = FakeResponse(status_code=200, text='{"result": "result_str"}')
+            PrivateChainUtil.send_transaction(request_url='https://test_host/production/wallet/balance')
+            session = PrivateChainUtil.session
+            PrivateChainUtil.send_transaction(request_url='https://test_host/production/wallet/balance',
+                                              payload_dict={'key': 'value'})
+
+            # コンテナ内で同一のセッションを利用すること
+            self.assertIs(PrivateChainUtil.session, session)
+            self.assertEqual(mock_post.call_count, 2)
+            args, kwargs = mock_post.call_args
+            self.assertEqual(args, ('https://test_host/production/wallet/balance',))
+            self.assertEqual(kwargs['data'], '{"key": "value"}')
+            self.assertEqual(kwargs['timeout'], (settings.PRIVATE_CHAIN_CONNECT_TIMEOUT,
+                                                 settings.PRIVATE_CHAIN_READ_TIMEOUT))
+
+        # エンドポイント毎の処理時間が実行中の invocation のメトリクスとして出力されること
+        self.assertEqual(sorted(metrics.metrics), ['private_chain_wallet_balance_time'])
+        self.assertEqual(metrics.units['private_chain_wallet_balance_time'], 'Milliseconds')
+
+    @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
+    @patch('time.sleep', MagicMock(return_value=''))
+    @patch.dict(os.environ, {'LAMBDA_METRICS_ENABLED': 'true'})
+    def test_send_transaction_ok_idempotent_with_retry(self):
+        metrics = LambdaMetrics('TestHandler')
+        with patch('requests.Session.post') as mock_post:
+            mock_post.side_effect = [
+                requests.exceptions.ConnectTimeout(),
+                FakeResponse(status_code=503),
+                FakeResponse(status_code=200, text='{"result": "result_str"}')
+            ]
+            response = PrivateChainUtil.send_transaction(request_url='https://test_host/production/wallet/balance',
+                                                         idempotent=True)
+
+            self.assertEqual(response, 'result_str')
+            self.assertEqual(mock_post.call_count, 3)
+
+        self.assertEqual(metrics.metrics['private_chain_wallet_balance_errors'], 2)
+        self.assertEqual(metrics.metrics['private_chain_retry_count'], 2)
+        self.assertIn('private_chain_wallet_balance_time', metrics.metrics)
+
+    @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
+    @patch('time.sleep', MagicMock(return_value=''))
+    def test_send_transaction_ng_idempotent_retry_over(self):
+        with patch('requests.Session.post') as mock_post:
+            mock_post.return_value = FakeResponse(status_code=503)
+            with self.assertRaises(SendTransactionError):
+                PrivateChainUtil.send_transaction(request_url='test_url', idempotent=True)
+            self.assertEqual(mock_post.call_count, settings.PRIVATE_CHAIN_READ_MAX_RETRY + 1)
+
+            mock_post.reset_mock()
+            mock_post.return_value = None
+            mock_post.side_effect = requests.exceptions.ReadTimeout()
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                PrivateChainUtil.send_transaction(request_url='test_url', idempotent=True)
+            self.assertEqual(mock_post.call_count, settings.PRIVATE_CHAIN_READ_MAX_RETRY + 1)
+
+    @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
+    def test_send_transaction_ng_not_idempotent_without_retry(self):
+        # トランザクションの送信等、冪等でない呼び出しはリトライしないこと
+        with patch('requests.Session.post') as mock_post:
+            mock_post.return_value = FakeResponse(status_code=503)
+            with self.assertRaises(SendTransactionError):
+                PrivateChainUtil.send_transaction(request_url='test_url')
+            self.assertEqual(mock_post.call_count, 1)
+
+            mock_post.reset_mock()
+            mock_post.return_value = None
+            mock_post.side_effect = requests.exceptions.ReadTimeout()
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                PrivateChainUtil.send_transaction(request_url='test_url')
+            self.assertEqual(mock_post.call_count, 1)
+
     def test_send_raw_transaction_ok(self):
         test_raw_transaction = '0xabcdef0123456789'
         test_url = 'https://' + os.environ['PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/eth/send_raw_transaction'
@@ -76,7 +164,7 @@ class TestPrivateChainUtil(TestCase):
             self.assertEqual(test_url, kwargs['request_url'])
             self.assertEqual(expect_payload, kwargs['payload_dict'])
 
-    @patch('requests.post',
+    @patch('requests.Session.post',
            MagicMock(return_value=FakeResponse(status_code=200, text='{"result": {"logs": [{"type": "mined"}]}}')))
     @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
     def test_is_transaction_completed_ok(self):
@@ -86,8 +174,9 @@ class TestPrivateChainUtil(TestCase):
 
     @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
     @patch('time.sleep', MagicMock(return_value=''))
+    @patch('settings.TRANSACTION_CONFIRM_COUNT', 5)
     def test_is_transaction_completed_ok_last(self):
-        with patch('requests.post') as mock_post:
+        with patch('requests.Session.post') as mock_post:
             mock_post.side_effect = [
                 FakeResponse(status_code=200, text='{}'),
                 FakeResponse(status_code=200, text='{}'),
@@ -102,8 +191,9 @@ class TestPrivateChainUtil(TestCase):
 
     @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
     @patch('time.sleep', MagicMock(return_value=''))
+    @patch('settings.TRANSACTION_CONFIRM_COUNT', 5)
     def test_is_transaction_completed_ok_multiple_logs(self):
-        with patch('requests.post') as mock_post:
+        with patch('requests.Session.post') as mock_post:
             mock_post.side_effect = [
                 FakeResponse(status_code=200, text='{}'),
                 FakeResponse(status_code=200, text='{}'),
@@ -118,8 +208,9 @@ class TestPrivateChainUtil(TestCase):
 
     @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
     @patch('time.sleep', MagicMock(return_value=''))
+    @patch('settings.TRANSACTION_CONFIRM_COUNT', 5)
     def test_is_transaction_completed_ng_count_over(self):
-        with patch('requests.post') as mock_post:
+        with patch('requests.Session.post') as mock_post:
             mock_post.side_effect = [
                 FakeResponse(status_code=200, text='{}'),
                 FakeResponse(status_code=200, text='{}'),
@@ -133,7 +224,49 @@ class TestPrivateChainUtil(TestCase):
             self.assertEqual(response, False)
             self.assertEqual(mock_post.call_count, settings.TRANSACTION_CONFIRM_COUNT)
 
-    @patch('requests.post',
+    @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
+    def test_wait_for_transactions_ok_with_backoff(self):
+        with patch('requests.Session.post') as mock_post, patch('time.sleep') as mock_sleep:
+            mock_post.side_effect = [FakeResponse(status_code=200, text='{}')] * 4 + [
+                FakeResponse(status_code=200, text='{"result": {"logs": [{"type": "mined"}]}}')
+            ]
+            response = PrivateChainUtil.wait_for_transactions(['0x01'])
+
+            self.assertEqual(response, {'0x01': True})
+            # 初回は待機せず、以降は待機時間を倍にしながら上限までで再確認すること
+            self.assertEqual([args[0] for args, _ in mock_sleep.call_args_list], [0.2, 0.4, 0.8, 1])
+
+    @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
+    @patch('time.sleep', MagicMock(return_value=''))
+    def test_wait_for_transactions_ok_multiple_transactions(self):
+        responses = {
+            '0x01': [FakeResponse(status_code=200, text='{"result": {"logs": [{"type": "mined"}]}}')],
+            '0x02': [FakeResponse(status_code=200, text='{}'),
+                     FakeResponse(status_code=200, text='{"result": {"logs": [{"type": "mined"}]}}')],
+            '0x03': [FakeResponse(status_code=200, text='{}')] * settings.TRANSACTION_CONFIRM_COUNT
+        }
+        with patch('requests.Session.post') as mock_post:
+            mock_post.side_effect = lambda url, data, timeout: responses[json.loads(data)['transaction_hash']].pop(0)
+            response = PrivateChainUtil.wait_for_transactions(['0x01', '0x02', '0x03'])
+
+            self.assertEqual(response, {'0x01': True, '0x02': True, '0x03': False})
+            # 完了したトランザクションは以降確認しないこと
+            self.assertEqual(mock_post.call_count, 1 + 2 + settings.TRANSACTION_CONFIRM_COUNT)
+
+    @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
+    def test_wait_for_transactions_ng_deadline_over(self):
+        with patch('requests.Session.post') as mock_post, patch('time.sleep') as mock_sleep, \
+                patch('time.time') as mock_time:
+            mock_post.return_value = FakeResponse(status_code=200, text='{}')
+            mock_time.side_effect = [100, 100.5, 101.5]
+            response = PrivateChainUtil.wait_for_transactions(['0x01'], deadline=1)
+
+            self.assertEqual(response, {'0x01': False})
+            # 期限を超えて待機しないこと
+            self.assertEqual([args[0] for args, _ in mock_sleep.call_args_list], [0.2])
+            self.assertEqual(mock_post.call_count, 2)
+
+    @patch('requests.Session.post',
            MagicMock(return_value=FakeResponse(status_code=200, text='{"test": ""}')))
     @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
     @patch('time.sleep', MagicMock(return_value=''))
@@ -142,7 +275,7 @@ class TestPrivateChainUtil(TestCase):
         response = PrivateChainUtil.is_transaction_completed(transaction=tran)
         self.assertEqual(response, False)
 
-    @patch('requests.post',
+    @patch('requests.Session.post',
            MagicMock(return_value=FakeResponse(status_code=200, text='{"result": {}}')))
     @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
     @patch('time.sleep', MagicMock(return_value=''))
@@ -151,7 +284,7 @@ class TestPrivateChainUtil(TestCase):
             tran = '0x1234567890123456789012345678901234567890'
             PrivateChainUtil.is_transaction_completed(transaction=tran)
 
-    @patch('requests.post',
+    @patch('requests.Session.post',
            MagicMock(return_value=FakeResponse(status_code=200, text='{"result": {"test": [{"type": "mined"}]}}')))
     @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
     @patch('time.sleep', MagicMock(return_value=''))
@@ -160,7 +293,7 @@ class TestPrivateChainUtil(TestCase):
             tran = '0x1234567890123456789012345678901234567890'
             PrivateChainUtil.is_transaction_completed(transaction=tran)
 
-    @patch('requests.post',
+    @patch('requests.Session.post',
            MagicMock(return_value=FakeResponse(status_code=200, text='{"result": {"logs": [{"type": "dummy"}]}}')))
     @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
     @patch('time.sleep', MagicMock(return_value=''))
@@ -169,7 +302,7 @@ class TestPrivateChainUtil(TestCase):
             tran = '0x1234567890123456789012345678901234567890'
             PrivateChainUtil.is_transaction_completed(transaction=tran)
 
-    @patch('requests.post', MagicMock(return_value=FakeResponse(
+    @patch('requests.Session.post', MagicMock(return_value=FakeResponse(
         status_code=200, text='{"result": {"logs": [{"type": "mined"}, {"type": "dummy"}]}}')))
     @patch('aws_requests_auth.aws_auth.AWSRequestsAuth', MagicMock(return_value='dummy'))
     @patch('time.sleep', MagicMock(return_value=''))
@@ -193,6 +326,7 @@ class TestPrivateChainUtil(TestCase):
             }
             self.assertEqual(test_url, kwargs['request_url'])
             self.assertEqual(expect_payload, kwargs['payload_dict'])
+            self.assertTrue(kwargs['idempotent'])
 
     def test_get_transaction_count_ok(self):
         test_address = '0x401BA17D89D795B3C6e373c5062F1C3F8979e73B'
@@ -209,6 +343,30 @@ class TestPrivateChainUtil(TestCase):
             }
             self.assertEqual(test_url, kwargs['request_url'])
             self.assertEqual(expect_payload, kwargs['payload_dict'])
+            self.assertTrue(kwargs['idempotent'])
+
+    def test_get_account_values_ok(self):
+        test_address = '0x401BA17D89D795B3C6e373c5062F1C3F8979e73B'
+        with patch('private_chain_util.PrivateChainUtil.get_transaction_count') as mock_get_transaction_count, \
+                patch('private_chain_util.PrivateChainUtil.get_balance') as mock_get_balance, \
+                patch('private_chain_util.PrivateChainUtil.get_allowance') as mock_get_allowance:
+            mock_get_transaction_count.return_value = '0x5'
+            mock_get_balance.return_value = '0x10'
+            result = PrivateChainUtil.get_account_values(test_address, ['transaction_count', 'balance'])
+
+            self.assertEqual(result, {'transaction_count': '0x5', 'balance': '0x10'})
+            mock_get_transaction_count.assert_called_once_with(test_address)
+            mock_get_balance.assert_called_once_with(test_address)
+            # 指定していない値は取得しないこと
+            self.assertFalse(mock_get_allowance.called)
+
+    def test_get_account_values_ng_with_error(self):
+        test_address = '0x401BA17D89D795B3C6e373c5062F1C3F8979e73B'
+        with patch('private_chain_util.PrivateChainUtil.get_transaction_count', MagicMock(return_value='0x5')), \
+                patch('private_chain_util.PrivateChainUtil.get_allowance',
+                      MagicMock(side_effect=SendTransactionError('error'))):
+            with self.assertRaises(SendTransactionError):
+                PrivateChainUtil.get_account_values(test_address, ['allowance', 'transaction_count'])
 
     def test_increment_transaction_count_ok(self):
         result = PrivateChainUtil.increment_transaction_count('0x0')
@@ -234,6 +392,7 @@ class TestPrivateChainUtil(TestCase):
             }
             self.assertEqual(test_url, kwargs['request_url'])
             self.assertEqual(expect_payload, kwargs['payload_dict'])
+            self.assertTrue(kwargs['idempotent'])
 
     def test_validate_message_signature_ok(self):
         web3 = Web3(HTTPProvider('http://localhost:8584'))
@@ -494,6 +653,66 @@ class TestPrivateChainUtil(TestCase):
             PrivateChainUtil.get_data_from_raw_transaction('0xabcdef', '0x10')
         self.assertEqual(e.exception.args[0], 'raw_transaction is invalid')
 
+    def test_parse_raw_transaction_ok(self):
+        web3 = Web3(HTTPProvider('http://localhost:8584'))
+        test_account = web3.eth.account.create()
+        # EIP-155（chainId あり）と chainId なしの署名で、署名者が Account.recover_transaction と一致すること
+        for chain_id in [8995, None]:
+            transaction = {
+                'nonce': 10,
+                'gasPrice': 0,
+                'gas': 100000,
+                'to': web3.toChecksumAddress(os.environ['PRIVATE_CHAIN_ALIS_TOKEN_ADDRESS']),
+                'value': 0,
+                'data': '0xa9059cbb'
+            }
+            if chain_id is not None:
+                transaction['chainId'] = chain_id
+            signed = web3.eth.account.sign_transaction(transaction, test_account.key)
+
+            actual = PrivateChainUtil.parse_raw_transaction(signed.rawTransaction.hex())
+            self.assertEqual(actual.nonce, 10)
+            self.assertEqual(actual.to, os.environ['PRIVATE_CHAIN_ALIS_TOKEN_ADDRESS'].lower())
+            self.assertEqual(actual.data, 'a9059cbb')
+            self.assertEqual(actual.v, signed.v)
+            self.assertEqual(actual.sender, test_account.address)
+            self.assertEqual(actual.sender, Account.recover_transaction(signed.rawTransaction))
+
+    def test_parse_raw_transaction_memoized(self):
+        web3 = Web3(HTTPProvider('http://localhost:8584'))
+        test_account = web3.eth.account.create()
+        transaction = {
+            'nonce': 10,
+            'gasPrice': 0,
+            'gas': 100000,
+            'to': web3.toChecksumAddress(os.environ['PRIVATE_CHAIN_ALIS_TOKEN_ADDRESS']),
+            'value': 0,
+            'data': '0xa9059cbb',
+            'chainId': 8995
+        }
+        signed = web3.eth.account.sign_transaction(transaction, test_account.key)
+        raw_transaction = signed.rawTransaction.hex()
+
+        with patch('raw_transaction.rlp.decode', wraps=rlp.decode) as mock_decode, \
+                patch('raw_transaction.keys.Signature', wraps=keys.Signature) as mock_signature:
+            PrivateChainUtil.validate_raw_transaction_signature(raw_transaction, test_account.address)
+            PrivateChainUtil.get_data_from_raw_transaction(raw_transaction, format(10, '#x'))
+            parsed = PrivateChainUtil.parse_raw_transaction(raw_transaction)
+            PrivateChainUtil.validate_raw_transaction_signature(parsed, test_account.address)
+            PrivateChainUtil.get_data_from_raw_transaction(parsed, format(10, '#x'))
+
+            # デコードと署名者の復元はトランザクション毎に 1 度のみ行われること
+            self.assertEqual(mock_decode.call_count, 1)
+            self.assertEqual(mock_signature.call_count, 1)
+            self.assertIs(parsed, PrivateChainUtil.parse_raw_transaction(raw_transaction.upper().replace('0X', '0x')))
+
+    def test_parse_raw_transaction_ng_invalid_signature(self):
+        raw_transaction = '0x' + rlp.encode([b'', b'', b'\x01\x86\xa0', b'\x01' * 20, b'', b'', b'\x1b', b'', b'']).hex()
+        parsed = PrivateChainUtil.parse_raw_transaction(raw_transaction)
+        with self.assertRaises(ValidationError) as e:
+            PrivateChainUtil.validate_raw_transaction_signature(parsed, '0x123456789a123456789a123456789a123456789a')
+        self.assertEqual(e.exception.args[0], 'Signature is invalid')
+
     def test_validate_erc20_transfer_data_ok_tip_value_minimum(self):
         method = 'a9059cbb'
         to_address = format(10, '064x')
@@ -0,0 +1,59 @@
+import os
+from tests_util import TestsUtil
+from unittest import TestCase
+from unittest.mock import patch
+from screened_article_cache import ScreenedArticleCache
+
+
+class TestScreenedArticleCache(TestCase):
+    dynamodb = TestsUtil.get_dynamodb_client()
+
+    def setUp(self):
+        ScreenedArticleCache.clear()
+        TestsUtil.set_all_tables_name_to_env()
+        TestsUtil.delete_all_tables(self.dynamodb)
+        TestsUtil.create_table(self.dynamodb, os.environ['SCREENED_ARTICLE_TABLE_NAME'], [
+            {'article_type': 'write_blacklisted', 'users': ['user01', 'user02']},
+            {'article_type': 'blacklisted', 'articles': ['article01']},
+            {'article_type': 'recommended', 'articles': ['article03', 'article01', 'article02']},
+            {'article_type': 'eyecatch', 'articles': {'crypto': ['article04', 'article05']}}
+        ])
+        self.table = self.dynamodb.Table(os.environ['SCREENED_ARTICLE_TABLE_NAME'])
+
+    def tearDown(self):
+        TestsUtil.delete_all_tables(self.dynamodb)
+
+    def test_get_ok(self):
+        self.assertEqual(ScreenedArticleCache.get_write_blacklisted_users(self.dynamodb), {'user01', 'user02'})
+        self.assertEqual(ScreenedArticleCache.get_sorted_write_blacklisted_users(self.dynamodb), ('user01', 'user02'))
+        self.assertEqual(ScreenedArticleCache.get_blacklisted_article_ids(self.dynamodb), {'article01'})
+        self.assertEqual(ScreenedArticleCache.get_recommended_article_ids(self.dynamodb),
+                         ('article03', 'article01', 'article02'))
+        self.assertEqual(ScreenedArticleCache.get_eyecatch_article_ids(self.dynamodb, 'crypto'),
+                         ('article04', 'article05'))
+        self.assertEqual(ScreenedArticleCache.get_eyecatch_article_ids(self.dynamodb, 'game'), ())
+
+    def test_get_ok_not_exists(self):
+        self.table.delete_item(Key={'article_type': 'write_blacklisted'})
+        self.table.delete_item(Key={'article_type': 'recommended'})
+        self.table.delete_item(Key={'article_type': 'eyecatch'})
+
+        self.assertEqual(ScreenedArticleCache.get_write_blacklisted_users(self.dynamodb), frozenset())
+        self.assertEqual(ScreenedArticleCache.get_recommended_article_ids(self.dynamodb), ())
+        self.assertEqual(ScreenedArticleCache.get_eyecatch_article_ids(self.dynamodb, 'crypto'), ())
+
+    def test_get_ok_within_ttl(self):
+        ScreenedArticleCache.get_write_blacklisted_users(self.dynamodb)
+        self.table.put_item(Item={'article_type': 'write_blacklisted', 'users': ['user03']})
+
+        # TTL 内は DynamoDB を参照しないこと
+        self.assertEqual(ScreenedArticleCache.get_write_blacklisted_users(self.dynamodb), {'user01', 'user02'})
+
+    def test_get_ok_after_ttl(self):
+        ScreenedArticleCache.get_write_blacklisted_users(self.dynamodb)
+        self.table.put_item(Item={'article_type': 'write_blacklisted', 'users': ['user03']})
+
+        # TTL 経過後は行全体を再取得すること
+        with patch('time.time', return_value=ScreenedArticleCache.entries['write_blacklisted']['expires_at']):
+            self.assertEqual(ScreenedArticleCache.get_write_blacklisted_users(self.dynamodb), {'user03'})
+            self.assertEqual(ScreenedArticleCache.get_sorted_write_blacklisted_users(self.dynamodb), ('user03',))
@@ -8,6 +8,7 @@ import settings
 from tests_es_util import TestsEsUtil
 
 from tag_util import TagUtil
+from tag_lookup_memo import TagLookupMemo
 from tests_util import TestsUtil
 from unittest.mock import patch, MagicMock
 
@@ -164,6 +165,86 @@ class TestTagUtil(TestCase):
 
         self.assertEqual(tags, expected)
 
+    def test_create_and_count_ok_with_one_request_each(self):
+        TagUtil.create_tag(self.elasticsearch, 'A')
+        TagUtil.create_tag(self.elasticsearch, 'B')
+        TagUtil.create_tag(self.elasticsearch, 'C')
+        self.elasticsearch.indices.refresh(index="tags")
+
+        before_tag_names = ['A', 'B', 'X']
+        after_tag_names = ['A', 'c', 'D', 'E', 'd']
+
+        elasticsearch = MagicMock(wraps=self.elasticsearch)
+        TagUtil.create_and_count(elasticsearch, before_tag_names, after_tag_names)
+        self.elasticsearch.indices.refresh(index="tags")
+
+        # 検索、作成・更新の _bulk がそれぞれ 1 回のみ実行されること
+        self.assertEqual(elasticsearch.search.call_count, 1)
+        self.assertEqual(elasticsearch.bulk.call_count, 1)
+        self.assertFalse(elasticsearch.update.called)
+        self.assertFalse(elasticsearch.index.called)
+
+        tags = TestsEsUtil.get_all_tags(self.elasticsearch)
+
+        expected = [
+            {
+                'name': 'A',
+                'name_with_analyzer': 'A',
+                'count': Decimal('1'),
+            },
+            {
+                'name': 'B',
+                'name_with_analyzer': 'B',
+                'count': Decimal('0'),
+            },
+            {
+                'name': 'C',
+                'name_with_analyzer': 'C',
+                'count': Decimal('2'),
+            },
+            {
+                'name': 'D',
+                'name_with_analyzer': 'D',
+                'count': Decimal('1'),
+            },
+            {
+                'name': 'E',
+                'name_with_analyzer': 'E',
+                'count': Decimal('1'),
+            },
+            {
+                'name': 'd',
+                'name_with_analyzer': 'd',
+                'count': Decimal('1'),
+            },
+        ]
+
+        for tag in tags:
+            del tag['created_at']
+
+        tags = sorted(tags, key=lambda t: t['name'])
+
+        self.assertEqual(tags, expected)
+
+    def test_create_and_count_with_no_changes(self):
+        elasticsearch = MagicMock()
+
+        TagUtil.create_and_count(elasticsearch, ['A', 'B'], ['B', 'A'])
+
+        self.assertFalse(elasticsearch.search.called)
+        self.assertFalse(elasticsearch.bulk.called)
+
+    def test_create_and_count_with_bulk_error(self):
+        elasticsearch = MagicMock()
+        elasticsearch.search.return_value = {'hits': {'hits': []}}
+        elasticsearch.bulk.return_value = {
+            'errors': True,
+            'items': [{'index': {'_id': 'A', 'status': 400, 'error': {'type': 'mapper_parsing_exception'}}}]
+        }
+
+        with self.assertRaises(Exception):
+            TagUtil.create_and_count(elasticsearch, [], ['A'])
+
     @patch('tag_util.Web3Util.get_badge_types', MagicMock(return_value=[0]))
     def test_validate_tags(self):
         def expected_raise_error(args, user_id=''):
@@ -213,6 +294,49 @@ class TestTagUtil(TestCase):
 
         self.assertEquals(result, ['aaa', 'BbB', 'CCC', 'DDD'])
 
+    def test_get_tags_with_name_collation_with_one_request(self):
+        TagUtil.create_tag(self.elasticsearch, "aaa")
+        TagUtil.create_tag(self.elasticsearch, "BbB")
+        TagUtil.create_tag(self.elasticsearch, "ΟΔΟΣ")
+
+        self.elasticsearch.indices.refresh(index="tags")
+
+        elasticsearch = MagicMock(wraps=self.elasticsearch)
+        tag_names = ['AAA', 'bbb', 'DDD', 'οδοσ', 'aaa']
+        result = TagUtil.get_tags_with_name_collation(elasticsearch, tag_names)
+
+        # 全てのタグ名を 1 回の検索で照合すること
+        self.assertEqual(result, ['aaa', 'BbB', 'DDD', 'ΟΔΟΣ', 'aaa'])
+        self.assertEqual(elasticsearch.search.call_count, 1)
+
+    def test_get_tags_with_name_collation_with_memo(self):
+        elasticsearch = MagicMock()
+        elasticsearch.search.side_effect = [
+            {'hits': {'hits': [{'_source': {'name': 'AAA', 'count': 3}}]}},
+            {'hits': {'hits': [{'_source': {'name': 'CCC', 'count': 1}}]}}
+        ]
+        elasticsearch.bulk.return_value = {'errors': False, 'items': []}
+
+        TagLookupMemo.start()
+        try:
+            result = TagUtil.get_tags_with_name_collation(elasticsearch, ['aaa', 'BBB'])
+            TagUtil.create_and_count(elasticsearch, ['ccc'], ['aaa', 'BBB'])
+        finally:
+            TagLookupMemo.stop()
+
+        self.assertEqual(result, ['AAA', 'BBB'])
+
+        # 照合時に検索済みのタグは create_and_count で再検索しないこと
+        self.assertEqual(elasticsearch.search.call_count, 2)
+        _, kwargs = elasticsearch.search.call_args
+        self.assertEqual(kwargs['body']['query']['bool']['filter'], [{'terms': {'name': ['ccc']}}])
+
+        _, kwargs = elasticsearch.bulk.call_args
+        self.assertEqual(
+            [list(action.values())[0]['_id'] for action in kwargs['body'][::2]],
+            ['AAA', 'BBB', 'CCC']
+        )
+
     def test_get_tags_with_name_collation_with_none(self):
         TagUtil.create_tag(self.elasticsearch, "aaa")
         TagUtil.create_tag(self.elasticsearch, "BbB")
@@ -0,0 +1,77 @@
+import os
+from unittest import TestCase
+from unittest.mock import patch
+from freezegun import freeze_time
+from lambda_metrics import LambdaMetrics
+from ttl_cache import TTLCache
+
+
+class TestTTLCache(TestCase):
+    def setUp(self):
+        with patch.dict(os.environ, {'LAMBDA_METRICS_ENABLED': 'true'}):
+            self.metrics = LambdaMetrics('TestHandler')
+
+    def tearDown(self):
+        LambdaMetrics.current = None
+
+    def test_get_ok(self):
+        cache = TTLCache('test', 10, 60)
+        cache.set('key', 'value')
+
+        self.assertEqual('value', cache.get('key'))
+        self.assertEqual({'test_cache_hits': 1}, self.metrics.metrics)
+
+    def test_get_ok_not_exists(self):
+        cache = TTLCache('test', 10, 60)
+
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual('default', cache.get('key', 'default'))
+        self.assertEqual({'test_cache_misses': 2}, self.metrics.metrics)
+
+    def test_get_ok_expired(self):
+        cache = TTLCache('test', 10, 60)
+        with freeze_time('2022-11-02 00:00:00') as frozen_time:
+            cache.set('key', 'value')
+            frozen_time.tick(59)
+            self.assertEqual('value', cache.get('key'))
+            frozen_time.tick(1)
+            self.assertIsNone(cache.get('key'))
+
+        self.assertEqual({'test_cache_hits': 1, 'test_cache_misses': 1}, self.metrics.metrics)
+
+    def test_get_ok_without_metrics(self):
+        LambdaMetrics.current = None
+        cache = TTLCache('test', 10, 60)
+        cache.set('key', 'value')
+
+        self.assertEqual('value', cache.get('key'))
+        self.assertIsNone(cache.get('not_exists_key'))
+
+    def test_set_ok_evict_least_recently_used(self):
+        cache = TTLCache('test', 2, 60)
+        cache.set('key1', 'value1')
+        cache.set('key2', 'value2')
+        # key1 を参照することで key2 が最も参照されていない値となる
+        cache.get('key1')
+        cache.set('key3', 'value3')
+
+        self.assertEqual('value1', cache.get('key1'))
+        self.assertIsNone(cache.get('key2'))
+        self.assertEqual('value3', cache.get('key3'))
+
+    def test_delete_ok(self):
+        cache = TTLCache('test', 10, 60)
+        cache.set('key', 'value')
+        cache.delete('key')
+        cache.delete('not_exists_key')
+
+        self.assertIsNone(cache.get('key'))
+
+    def test_clear_ok(self):
+        cache = TTLCache('test', 10, 60)
+        cache.set('key1', 'value1')
+        cache.set('key2', 'value2')
+        cache.clear()
+
+        self.assertIsNone(cache.get('key1'))
+        self.assertIsNone(cache.get('key2'))
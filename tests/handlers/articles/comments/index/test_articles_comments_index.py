@@ -132,6 +132,116 @@ class TestArticlesCommentsIndex(TestCase):
         self.assertEqual(json.loads(response['body'])['Items'], expected_items)
         self.assertEqual(json.loads(response['body'])['LastEvaluatedKey'], expected_last_evaluated_key)
 
+    def test_main_ok_with_reply_limit(self):
+        params = {
+            'queryStringParameters': {
+                'limit': '3',
+                'reply_limit': '1'
+            },
+            'pathParameters': {
+                'article_id': 'publicId0001'
+            }
+        }
+
+        response = ArticlesCommentsIndex(params, {}, self.dynamodb).main()
+
+        self.assertEqual(response['statusCode'], 200)
+        items = json.loads(response['body'])['Items']
+        self.assertEqual([item['comment_id'] for item in items], ['comment00003', 'comment00002', 'comment00001'])
+        self.assertIsNone(items[0].get('replies'))
+        self.assertEqual(items[1]['replies'], [self.reply_items[2]])
+        self.assertNotIn('replies_last_evaluated_key', items[1])
+        # 返信が reply_limit 件を超えるスレッドには続きを取得するためのキーが付与されること
+        self.assertEqual(items[2]['replies'], [self.reply_items[0]])
+        self.assertEqual(items[2]['replies_last_evaluated_key'], {
+            'comment_id': self.reply_items[0]['comment_id'],
+            'parent_id': self.reply_items[0]['parent_id'],
+            'sort_key': self.reply_items[0]['sort_key']
+        })
+
+    def test_main_ok_with_parent_id(self):
+        params = {
+            'queryStringParameters': {
+                'reply_limit': '1',
+                'parent_id': 'comment00001',
+                'reply_comment_id': self.reply_items[0]['comment_id'],
+                'reply_sort_key': str(self.reply_items[0]['sort_key'])
+            },
+            'pathParameters': {
+                'article_id': 'publicId0001'
+            }
+        }
+
+        response = ArticlesCommentsIndex(params, {}, self.dynamodb).main()
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(json.loads(response['body'])['Items'], [self.reply_items[1]])
+        self.assertNotIn('LastEvaluatedKey', json.loads(response['body']))
+
+    def test_main_ok_with_reply_limit_equal_to_replies(self):
+        params = {
+            'queryStringParameters': {
+                'limit': '3',
+                'reply_limit': '2'
+            },
+            'pathParameters': {
+                'article_id': 'publicId0001'
+            }
+        }
+
+        response = ArticlesCommentsIndex(params, {}, self.dynamodb).main()
+
+        self.assertEqual(response['statusCode'], 200)
+        items = json.loads(response['body'])['Items']
+        # 返信が reply_limit 件ちょうどのスレッドには続きを取得するためのキーが付与されないこと
+        self.assertEqual(items[2]['comment_id'], 'comment00001')
+        self.assertEqual(items[2]['replies'], [self.reply_items[0], self.reply_items[1]])
+        self.assertNotIn('replies_last_evaluated_key', items[2])
+
+    def test_main_ng_with_parent_id_not_exists_in_article(self):
+        for parent_id in ['comment00004', 'comment00005', 'comment99999']:
+            params = {
+                'queryStringParameters': {
+                    'parent_id': parent_id
+                },
+                'pathParameters': {
+                    'article_id': 'publicId0001'
+                }
+            }
+
+            response = ArticlesCommentsIndex(params, {}, self.dynamodb).main()
+
+            self.assertEqual(response['statusCode'], 404)
+
+    def test_validation_reply_comment_id_without_parent_id(self):
+        params = {
+            'queryStringParameters': {
+                'reply_comment_id': self.reply_items[0]['comment_id'],
+                'reply_sort_key': str(self.reply_items[0]['sort_key'])
+            },
+            'pathParameters': {
+                'article_id': 'publicId0001'
+            }
+        }
+
+        self.assert_bad_request(params)
+
+    def test_validation_reply_comment_id_without_reply_sort_key(self):
+        for reply_key in ['reply_comment_id', 'reply_sort_key']:
+            params = {
+                'queryStringParameters': {
+                    'parent_id': 'comment00001',
+                    'reply_comment_id': self.reply_items[0]['comment_id'],
+                    'reply_sort_key': str(self.reply_items[0]['sort_key'])
+                },
+                'pathParameters': {
+                    'article_id': 'publicId0001'
+                }
+            }
+            del params['queryStringParameters'][reply_key]
+
+            self.assert_bad_request(params)
+
     def test_main_with_evaluated_key(self):
         params = {
             'queryStringParameters': {
@@ -9,6 +9,8 @@ from tests_es_util import TestsEsUtil
 
 from articles_popular import ArticlesPopular
 from tests_util import TestsUtil
+from screened_article_cache import ScreenedArticleCache
+from es_util import ESUtil
 import json
 
 
@@ -19,6 +21,8 @@ class TestArticlesPopular(TestCase):
     )
 
     def setUp(self):
+        ScreenedArticleCache.clear()
+        ESUtil.index_cache.clear()
         TestsUtil.set_all_tables_name_to_env()
         TestsEsUtil.delete_alias(self.elasticsearch, settings.ARTICLE_SCORE_INDEX_NAME)
 
@@ -5,6 +5,7 @@ import time
 import settings
 from articles_recent import ArticlesRecent
 from tests_util import TestsUtil
+from screened_article_cache import ScreenedArticleCache
 import os
 import json
 from elasticsearch import Elasticsearch
@@ -128,6 +129,7 @@ class TestArticlesRecent(TestCase):
         TestsUtil.create_table(cls.dynamodb, os.environ['TOPIC_TABLE_NAME'], topic_items)
 
     def setUp(self):
+        ScreenedArticleCache.clear()
         TestsUtil.create_table(self.dynamodb, os.environ['SCREENED_ARTICLE_TABLE_NAME'], [])
 
     def tearDown(self):
@@ -306,6 +308,49 @@ class TestArticlesRecent(TestCase):
         self.assertEqual(response['statusCode'], 200)
         self.assertEqual(len(json.loads(response['body'])['Items']), 0)
 
+    def test_main_ok_with_fields(self):
+        params = {
+            'queryStringParameters': {
+                'limit': '1',
+                'fields': 'article_id,title'
+            }
+        }
+
+        response = ArticlesRecent(params, {}, dynamodb=self.dynamodb, elasticsearch=self.elasticsearch).main()
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(json.loads(response['body'])['Items'], [{'article_id': 'testid000005', 'title': 'test_title'}])
+
+    def test_main_ok_with_cursor(self):
+        params = {
+            'queryStringParameters': {
+                'limit': '30',
+                'topic': 'food'
+            }
+        }
+        response = ArticlesRecent(params, {}, dynamodb=self.dynamodb, elasticsearch=self.elasticsearch).main()
+        expected_article_ids = [item['article_id'] for item in json.loads(response['body'])['Items']]
+
+        # cursor を辿って取得した結果が、page 指定で取得した結果と一致すること
+        article_ids = []
+        cursor = ''
+        while cursor is not None:
+            params = {
+                'queryStringParameters': {
+                    'limit': '7',
+                    'topic': 'food',
+                    'cursor': cursor
+                }
+            }
+            response = ArticlesRecent(params, {}, dynamodb=self.dynamodb, elasticsearch=self.elasticsearch).main()
+            self.assertEqual(response['statusCode'], 200)
+            body = json.loads(response['body'])
+            article_ids.extend([item['article_id'] for item in body['Items']])
+            cursor = body['Cursor']
+
+        self.assertEqual(len(article_ids), 30)
+        self.assertEqual(article_ids, expected_article_ids)
+
     def test_call_validate_topic(self):
         params = {
             'queryStringParameters': {
@@ -375,3 +420,31 @@ class TestArticlesRecent(TestCase):
         }
 
         self.assert_bad_request(params)
+
+    def test_validation_page_with_cursor(self):
+        params = {
+            'queryStringParameters': {
+                'page': '2',
+                'cursor': ''
+            }
+        }
+
+        self.assert_bad_request(params)
+
+    def test_validation_invalid_cursor(self):
+        params = {
+            'queryStringParameters': {
+                'cursor': 'ALIS'
+            }
+        }
+
+        self.assert_bad_request(params)
+
+    def test_validation_invalid_fields(self):
+        params = {
+            'queryStringParameters': {
+                'fields': 'article_id,body'
+            }
+        }
+
+        self.assert_bad_request(params)
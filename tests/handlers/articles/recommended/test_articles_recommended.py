@@ -3,6 +3,7 @@ import os
 from unittest import TestCase
 
 from tests_util import TestsUtil
+from screened_article_cache import ScreenedArticleCache
 
 from articles_recommended import ArticlesRecommended
 
@@ -11,6 +12,7 @@ class TestArticlesRecommended(TestCase):
     dynamodb = TestsUtil.get_dynamodb_client()
 
     def setUp(self):
+        ScreenedArticleCache.clear()
         TestsUtil.delete_all_tables(self.dynamodb)
         TestsUtil.set_all_tables_name_to_env()
 
@@ -9,6 +9,8 @@ from elasticsearch import Elasticsearch
 import settings
 from tests_es_util import TestsEsUtil
 from tests_util import TestsUtil
+from screened_article_cache import ScreenedArticleCache
+from es_util import ESUtil
 from articles_tip_ranking import ArticlesTipRanking
 
 
@@ -19,6 +21,8 @@ class TestArticleTipRanking(TestCase):
     )
 
     def setUp(self):
+        ScreenedArticleCache.clear()
+        ESUtil.index_cache.clear()
         TestsUtil.set_all_tables_name_to_env()
         TestsUtil.delete_all_tables(self.dynamodb)
         TestsEsUtil.delete_alias(self.elasticsearch, settings.ARTICLE_TIP_RANKING_INDEX_NAME)
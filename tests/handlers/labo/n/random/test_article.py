@@ -0,0 +1,121 @@
+import json
+import os
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from tests_util import TestsUtil
+
+from article import LaboNRandomArticle
+
+
+class TestLaboNRandomArticle(TestCase):
+    dynamodb = TestsUtil.get_dynamodb_client()
+
+    def setUp(self):
+        LaboNRandomArticle.article_pool.clear()
+        TestsUtil.delete_all_tables(self.dynamodb)
+        TestsUtil.set_all_tables_name_to_env()
+
+        self.article_info_items = [
+            {
+                'article_id': 'testid000001',
+                'user_id': 'test_user_id',
+                'title': 'title',
+                'status': 'public',
+                'sort_key': 1520150272000001
+            },
+            {
+                'article_id': 'testid000002',
+                'user_id': 'test_user_id',
+                'title': 'title',
+                'status': 'public',
+                'sort_key': 1520150272000002
+            }
+        ]
+        TestsUtil.create_table(self.dynamodb, os.environ['ARTICLE_INFO_TABLE_NAME'], self.article_info_items)
+
+        article_content_items = [
+            {
+                'article_id': 'testid000001',
+                'title': 'title',
+                'body': 'body',
+                'paid_body': 'paid_body'
+            },
+            {
+                'article_id': 'testid000002',
+                'title': 'title',
+                'body': 'body'
+            }
+        ]
+        TestsUtil.create_table(self.dynamodb, os.environ['ARTICLE_CONTENT_TABLE_NAME'], article_content_items)
+
+    def tearDown(self):
+        TestsUtil.delete_all_tables(self.dynamodb)
+
+    @patch('es_util.ESUtil.search_random_article_ids', MagicMock(return_value=['testid000001']))
+    def test_main_ok(self):
+        response = LaboNRandomArticle({}, {}, dynamodb=self.dynamodb, elasticsearch=MagicMock()).main()
+
+        self.assertEqual(response['statusCode'], 200)
+        # paid_body は返却されないこと
+        self.assertEqual(json.loads(response['body']), {
+            'article_id': 'testid000001',
+            'user_id': 'test_user_id',
+            'title': 'title',
+            'status': 'public',
+            'sort_key': 1520150272000001,
+            'body': 'body'
+        })
+
+    def test_main_ok_with_article_pool(self):
+        with patch('es_util.ESUtil.search_random_article_ids') as mock_search:
+            mock_search.return_value = ['testid000001', 'testid000002']
+            for _ in range(5):
+                response = LaboNRandomArticle({}, {}, dynamodb=self.dynamodb, elasticsearch=MagicMock()).main()
+                self.assertEqual(response['statusCode'], 200)
+                self.assertIn(json.loads(response['body'])['article_id'], ['testid000001', 'testid000002'])
+
+        # 候補の抽出は TTL の間に 1 回のみであること
+        self.assertEqual(mock_search.call_count, 1)
+
+    def test_main_ok_with_not_exists_article_in_pool(self):
+        with patch('es_util.ESUtil.search_random_article_ids') as mock_search, \
+                patch('random.choice') as mock_choice:
+            mock_search.return_value = ['testid999999', 'testid000002']
+            mock_choice.side_effect = lambda article_ids: article_ids[0]
+            response = LaboNRandomArticle({}, {}, dynamodb=self.dynamodb, elasticsearch=MagicMock()).main()
+
+        # 取得できない記事は候補から除き、別の候補を返却すること
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(json.loads(response['body'])['article_id'], 'testid000002')
+        self.assertEqual(LaboNRandomArticle.article_pool.get('article_ids'), ['testid000002'])
+
+    def test_main_ok_with_unpublished_article_in_pool(self):
+        with patch('es_util.ESUtil.search_random_article_ids') as mock_search, \
+                patch('random.choice') as mock_choice:
+            mock_search.return_value = ['testid000001', 'testid000002']
+            mock_choice.side_effect = lambda article_ids: article_ids[0]
+            response = LaboNRandomArticle({}, {}, dynamodb=self.dynamodb, elasticsearch=MagicMock()).main()
+            self.assertEqual(json.loads(response['body'])['article_id'], 'testid000001')
+
+            # 候補の抽出後に記事が非公開となった場合
+            article_info_table = self.dynamodb.Table(os.environ['ARTICLE_INFO_TABLE_NAME'])
+            article_info_table.update_item(
+                Key={'article_id': 'testid000001'},
+                UpdateExpression='set #attr = :article_status',
+                ExpressionAttributeNames={'#attr': 'status'},
+                ExpressionAttributeValues={':article_status': 'draft'}
+            )
+            response = LaboNRandomArticle({}, {}, dynamodb=self.dynamodb, elasticsearch=MagicMock()).main()
+
+        # 非公開の記事は候補から除き、別の候補を返却すること
+        self.assertEqual(mock_search.call_count, 1)
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(json.loads(response['body'])['article_id'], 'testid000002')
+        self.assertEqual(LaboNRandomArticle.article_pool.get('article_ids'), ['testid000002'])
+
+    @patch('es_util.ESUtil.search_random_article_ids', MagicMock(return_value=[]))
+    def test_main_with_empty_pool(self):
+        response = LaboNRandomArticle({}, {}, dynamodb=self.dynamodb, elasticsearch=MagicMock()).main()
+
+        self.assertEqual(response['statusCode'], 404)
@@ -10,6 +10,7 @@ from tests_util import TestsUtil
 from web3 import Web3, HTTPProvider
 from private_chain_util import PrivateChainUtil
 from exceptions import SendTransactionError
+from settlement_queue import SettlementQueue, LocalSettlementQueue
 
 
 class TestMeArticlesPurchaseCreate(TestCase):
@@ -194,7 +195,7 @@ class TestMeArticlesPurchaseCreate(TestCase):
         side_effect=['purchase_transaction_hash', 'burn_transaction_hash']))
     @patch('private_chain_util.PrivateChainUtil.get_transaction_count', MagicMock(return_value='0x5'))
     @patch('private_chain_util.PrivateChainUtil.is_transaction_completed', MagicMock(return_value=True))
-    @patch("me_articles_purchase_create.MeArticlesPurchaseCreate._MeArticlesPurchaseCreate__get_randomhash",
+    @patch("settlement_util.SettlementUtil._SettlementUtil__get_randomhash",
            MagicMock(side_effect=[
                "d6f09fcaa6f409b7dde72957fdc17992d570e12ad23e8e968c29ab9aaea4df3d",
                "0e12ad23e8e968c29ab9aaea4df3dd6f09fcaa6f409b7dde72957fdc17992d57"
@@ -364,6 +365,71 @@ class TestMeArticlesPurchaseCreate(TestCase):
             self.assertEqual(paid_status.get('created_at'), 1520150552)
             self.assertEqual(len(paid_status_table.scan()['Items']), 4)
 
+    @patch('private_chain_util.PrivateChainUtil.send_raw_transaction', MagicMock(
+        side_effect=['purchase_transaction_hash', 'burn_transaction_hash']))
+    @patch('private_chain_util.PrivateChainUtil.get_transaction_count', MagicMock(return_value='0x5'))
+    @patch('private_chain_util.PrivateChainUtil.is_transaction_completed', MagicMock(return_value=True))
+    @patch('time_util.TimeUtil.generate_sort_key', MagicMock(return_value=1520150552000003))
+    @patch('time.time', MagicMock(return_value=1520150552.000003))
+    @patch('settlement_queue.SettlementQueue.backend', LocalSettlementQueue())
+    def test_main_ok_async_settlement(self):
+        target_article = self.article_info_table_items[2]
+        test_purchase_value = int(target_article['price'] * Decimal(9) / Decimal(10))
+        burn_value = int(test_purchase_value / Decimal(9))
+        to_address = format(10, '064x')
+        raw_transactions = self.create_singed_transactions(to_address, test_purchase_value, burn_value)
+        act_user_id = 'purchaseuser001'
+        with patch('me_articles_purchase_create.UserUtil.get_private_eth_address') as mock_get_private_eth_address:
+            mock_get_private_eth_address.return_value = '0x' + to_address[24:]
+            event = {
+                'body': {
+                    'purchase_signed_transaction': raw_transactions['purchase'].rawTransaction.hex(),
+                    'burn_signed_transaction': raw_transactions['burn'].rawTransaction.hex(),
+                    'async_settlement': True
+                },
+                'requestContext': {
+                    'authorizer': {
+                        'claims': {
+                            'cognito:username': act_user_id,
+                            'custom:private_eth_address': self.test_account.address,
+                            'phone_number_verified': 'true',
+                            'email_verified': 'true'
+                        }
+                    }
+                },
+                'pathParameters': {
+                    'article_id': target_article['article_id']
+                }
+            }
+            event['body'] = json.dumps(event['body'])
+
+            response = MeArticlesPurchaseCreate(event, {}, self.dynamodb, cognito=None).main()
+            self.assertEqual(response['statusCode'], 202)
+            self.assertEqual(json.loads(response['body']), {"status": "doing"})
+
+            # 承認待ちの購入データが作成され、バーン・通知は行われないこと
+            paid_articles_table = self.dynamodb.Table(os.environ['PAID_ARTICLES_TABLE_NAME'])
+            paid_article = paid_articles_table.get_item(Key={
+                'article_id': target_article['article_id'],
+                'sort_key': 1520150552000003
+            }).get('Item')
+            self.assertEqual(paid_article['status'], 'doing')
+            self.assertIsNone(paid_article.get('burn_transaction'))
+            self.assertEqual(PrivateChainUtil.send_raw_transaction.call_count, 1)
+            self.assertEqual(len(self.notification_table.scan()['Items']), 0)
+
+            # 承認以降の処理が settlement worker に依頼されていること
+            records = SettlementQueue.backend.to_event()['Records']
+            self.assertEqual(len(records), 1)
+            self.assertEqual(json.loads(records[0]['body']), {
+                'type': 'purchase',
+                'article_id': target_article['article_id'],
+                'user_id': act_user_id,
+                'sort_key': 1520150552000003,
+                'purchase_transaction': 'purchase_transaction_hash',
+                'burn_signed_transaction': raw_transactions['burn'].rawTransaction.hex()
+            })
+
     @patch('private_chain_util.PrivateChainUtil.send_raw_transaction', MagicMock(
         side_effect=['purchase_transaction_hash', 'burn_transaction_hash']))
     @patch('private_chain_util.PrivateChainUtil.get_transaction_count', MagicMock(return_value='0x5'))
@@ -724,7 +790,7 @@ class TestMeArticlesPurchaseCreate(TestCase):
         side_effect=['purchase_transaction_hash', Exception()]))
     @patch('private_chain_util.PrivateChainUtil.get_transaction_count', MagicMock(return_value='0x5'))
     @patch('private_chain_util.PrivateChainUtil.is_transaction_completed', MagicMock(return_value=True))
-    @patch("me_articles_purchase_create.MeArticlesPurchaseCreate._MeArticlesPurchaseCreate__get_randomhash",
+    @patch("settlement_util.SettlementUtil._SettlementUtil__get_randomhash",
            MagicMock(side_effect=[
                "d6f09fcaa6f409b7dde72957fdc17992d570e12ad23e8e968c29ab9aaea4df3d",
                "0e12ad23e8e968c29ab9aaea4df3dd6f09fcaa6f409b7dde72957fdc17992d57"
@@ -0,0 +1,55 @@
+import os
+import json
+from unittest import TestCase
+from me_articles_purchase_status import MeArticlesPurchaseStatus
+from tests_util import TestsUtil
+
+
+class TestMeArticlesPurchaseStatus(TestCase):
+    dynamodb = TestsUtil.get_dynamodb_client()
+
+    def setUp(self):
+        TestsUtil.set_all_tables_name_to_env()
+        TestsUtil.delete_all_tables(self.dynamodb)
+
+        paid_status_items = [
+            {
+                'article_id': 'publicId0001',
+                'user_id': 'purchaseuser001',
+                'status': 'doing',
+                'created_at': 1520150552
+            }
+        ]
+        TestsUtil.create_table(self.dynamodb, os.environ['PAID_STATUS_TABLE_NAME'], paid_status_items)
+
+    def tearDown(self):
+        TestsUtil.delete_all_tables(self.dynamodb)
+
+    @staticmethod
+    def create_event(article_id, user_id='purchaseuser001'):
+        return {
+            'pathParameters': {
+                'article_id': article_id
+            },
+            'requestContext': {
+                'authorizer': {
+                    'claims': {
+                        'cognito:username': user_id
+                    }
+                }
+            }
+        }
+
+    def test_main_ok(self):
+        response = MeArticlesPurchaseStatus(self.create_event('publicId0001'), {}, self.dynamodb).main()
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(json.loads(response['body']), {'status': 'doing'})
+
+    def test_main_ng_not_exists(self):
+        response = MeArticlesPurchaseStatus(self.create_event('publicId0001', 'purchaseuser002'), {}, self.dynamodb).main()
+        self.assertEqual(response['statusCode'], 404)
+
+    def test_validation_article_id_invalid(self):
+        response = MeArticlesPurchaseStatus(self.create_event('AAA'), {}, self.dynamodb).main()
+        self.assertEqual(response['statusCode'], 400)
@@ -7,6 +7,7 @@ from unittest.mock import MagicMock, patch
 from tests_util import TestsUtil
 from web3 import Web3, HTTPProvider
 from me_configurations_wallet_add import MeConfigurationsWalletAdd
+from user_util import UserUtil
 from eth_account.messages import encode_defunct
 
 
@@ -202,6 +203,34 @@ class TestMeConfigurationsWalletAdd(TestCase):
             ]
         )
 
+    def test_main_ok_invalidate_private_eth_address_cache(self):
+        test_user = 'test-user'
+        test_signature = self.create_singed_message_transactions(test_user)
+        UserUtil.private_eth_address_cache.set(test_user, '0x1234567890123456789012345678901234567890')
+
+        event = {
+            'body': {
+                'wallet_address': self.test_account.address,
+                'salt': self.user_configurations_items[0]['salt'],
+                'encrypted_secret_key': self.user_configurations_items[0]['encrypted_secret_key'],
+                'signature': test_signature,
+            },
+            'requestContext': {
+                'authorizer': {
+                    'claims': {
+                        'cognito:username': test_user
+                    }
+                }
+            }
+        }
+        event['body'] = json.dumps(event['body'])
+        self.cognito.admin_update_user_attributes = MagicMock(return_value=True)
+        response = MeConfigurationsWalletAdd(
+            event=event, context={}, dynamodb=self.dynamodb, cognito=self.cognito
+        ).main()
+        self.assertEqual(response['statusCode'], 200)
+        self.assertIsNone(UserUtil.private_eth_address_cache.get(test_user))
+
     def test_main_ng_exists_private_eth_address(self):
         test_user = self.user_configurations_items[0]['user_id']
         test_salt = 'EesN10uxbFLuaQcqdzPQeJeGk2L4Aazt9EfIoDX/murBtwrnGNulIzB2DP7hW/OLFpHXyqJ2kksJ5L6iBsjPfAEaHl7HYaj' \
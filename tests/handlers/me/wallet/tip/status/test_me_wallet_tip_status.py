@@ -0,0 +1,96 @@
+import os
+import json
+from unittest import TestCase
+from me_wallet_tip_status import MeWalletTipStatus
+from tests_util import TestsUtil
+
+
+class TestMeWalletTipStatus(TestCase):
+    dynamodb = TestsUtil.get_dynamodb_client()
+
+    def setUp(self):
+        TestsUtil.set_all_tables_name_to_env()
+        TestsUtil.delete_all_tables(self.dynamodb)
+
+        tip_items = [
+            {
+                'user_id': 'act_user_01',
+                'transaction': 'tip_transaction_hash_01',
+                'burn_transaction': None,
+                'settlement_status': 'pending',
+                'sort_key': 1520150552000001
+            },
+            {
+                'user_id': 'act_user_01',
+                'transaction': 'tip_transaction_hash_02',
+                'burn_transaction': 'burn_transaction_hash_02',
+                'sort_key': 1520150552000002
+            },
+            {
+                'user_id': 'act_user_01',
+                'transaction': 'tip_transaction_hash_03',
+                'burn_transaction': None,
+                'sort_key': 1520150552000003
+            },
+            {
+                'user_id': 'act_user_01',
+                'transaction': 'tip_transaction_hash_04',
+                'burn_transaction': None,
+                'settlement_status': 'done',
+                'sort_key': 1520150552000004
+            }
+        ]
+        TestsUtil.create_table(self.dynamodb, os.environ['TIP_TABLE_NAME'], tip_items)
+
+    def tearDown(self):
+        TestsUtil.delete_all_tables(self.dynamodb)
+
+    @staticmethod
+    def create_event(sort_key, user_id='act_user_01'):
+        return {
+            'queryStringParameters': {
+                'sort_key': sort_key
+            },
+            'requestContext': {
+                'authorizer': {
+                    'claims': {
+                        'cognito:username': user_id
+                    }
+                }
+            }
+        }
+
+    def test_main_ok_pending(self):
+        response = MeWalletTipStatus(self.create_event('1520150552000001'), {}, self.dynamodb).main()
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(json.loads(response['body']), {
+            'status': 'pending',
+            'transaction': 'tip_transaction_hash_01',
+            'burn_transaction': None
+        })
+
+    def test_main_ok_done_without_burn(self):
+        # バーンに失敗した投げ銭も settlement_status の状態を返却すること
+        response = MeWalletTipStatus(self.create_event('1520150552000004'), {}, self.dynamodb).main()
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(json.loads(response['body'])['status'], 'done')
+
+    def test_main_ok_without_settlement_status(self):
+        # settlement_status を持たない投げ銭はバーンの有無から状態を返却すること
+        response = MeWalletTipStatus(self.create_event('1520150552000002'), {}, self.dynamodb).main()
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(json.loads(response['body'])['status'], 'done')
+
+        # バーンが存在しない場合は失敗と判別できないため unknown となること
+        response = MeWalletTipStatus(self.create_event('1520150552000003'), {}, self.dynamodb).main()
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(json.loads(response['body'])['status'], 'unknown')
+
+    def test_main_ng_not_exists(self):
+        response = MeWalletTipStatus(self.create_event('1520150552000001', 'act_user_02'), {}, self.dynamodb).main()
+        self.assertEqual(response['statusCode'], 404)
+
+    def test_validation_sort_key_invalid(self):
+        response = MeWalletTipStatus(self.create_event('AAA'), {}, self.dynamodb).main()
+        self.assertEqual(response['statusCode'], 400)
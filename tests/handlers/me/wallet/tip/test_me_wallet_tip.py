@@ -10,6 +10,7 @@ from unittest.mock import patch, MagicMock
 from tests_util import TestsUtil
 from web3 import Web3, HTTPProvider
 from private_chain_util import PrivateChainUtil
+from settlement_queue import SettlementQueue, LocalSettlementQueue
 
 
 class TestMeWalletTip(TestCase):
@@ -118,7 +119,8 @@ class TestMeWalletTip(TestCase):
                 'uncompleted': Decimal(1),
                 'sort_key': Decimal(1520150552000003),
                 'target_date': '2018-03-04',
-                'created_at': Decimal(int(1520150552.000003))
+                'created_at': Decimal(int(1520150552.000003)),
+                'settlement_status': 'done'
             }
 
             self.assertEqual(expected_tip, tips[0])
@@ -176,7 +178,8 @@ class TestMeWalletTip(TestCase):
                 'uncompleted': Decimal(1),
                 'sort_key': Decimal(1520150552000003),
                 'target_date': '2018-03-04',
-                'created_at': Decimal(int(1520150552.000003))
+                'created_at': Decimal(int(1520150552.000003)),
+                'settlement_status': 'done'
             }
 
             self.assertEqual(expected_tip, tips[0])
@@ -235,7 +238,8 @@ class TestMeWalletTip(TestCase):
                 'uncompleted': Decimal(1),
                 'sort_key': Decimal(1520150552000003),
                 'target_date': '2018-03-04',
-                'created_at': Decimal(int(1520150552.000003))
+                'created_at': Decimal(int(1520150552.000003)),
+                'settlement_status': 'unknown'
             }
 
             self.assertEqual(expected_tip, tips[0])
@@ -334,11 +338,140 @@ class TestMeWalletTip(TestCase):
                 'uncompleted': Decimal(1),
                 'sort_key': Decimal(1520150552000003),
                 'target_date': '2018-03-04',
-                'created_at': Decimal(int(1520150552.000003))
+                'created_at': Decimal(int(1520150552.000003)),
+                'settlement_status': 'unknown'
             }
 
             self.assertEqual(expected_tip, tips[0])
 
+    @patch('private_chain_util.PrivateChainUtil.send_raw_transaction', MagicMock(
+        side_effect=['tip_transaction_hash', Exception()]))
+    @patch('private_chain_util.PrivateChainUtil.get_transaction_count', MagicMock(return_value='0x5'))
+    @patch('private_chain_util.PrivateChainUtil.get_balance', MagicMock(return_value=format(10 ** 30, '#x')))
+    @patch('private_chain_util.PrivateChainUtil.is_transaction_completed', MagicMock(return_value=True))
+    def test_main_ok_with_exception_in_burn(self):
+        test_tip_value = 10
+        to_address = format(10, '064x')
+        burn_value = int(test_tip_value / Decimal(10))
+        raw_transactions = self.create_singed_transactions(to_address, test_tip_value, burn_value)
+
+        with patch('me_wallet_tip.UserUtil.get_private_eth_address') as mock_get_private_eth_address:
+            mock_get_private_eth_address.return_value = '0x' + to_address[24:]
+            event = self.__create_async_settlement_event(raw_transactions)
+            event['body'] = json.dumps(dict(json.loads(event['body']), async_settlement=False))
+
+            response = MeWalletTip(event, {}, self.dynamodb, cognito=None).main()
+            self.assertEqual(response['statusCode'], 200)
+            # バーンに失敗した場合も投げ銭は承認済みのため done となること
+            tip_table = self.dynamodb.Table(os.environ['TIP_TABLE_NAME'])
+            tips = tip_table.scan()['Items']
+            self.assertEqual(len(tips), 1)
+            self.assertEqual(tips[0]['settlement_status'], 'done')
+            self.assertIsNone(tips[0]['burn_transaction'])
+
+    @patch('private_chain_util.PrivateChainUtil.send_raw_transaction', MagicMock(
+        side_effect=['tip_transaction_hash', 'burn_transaction_hash']))
+    @patch('private_chain_util.PrivateChainUtil.get_transaction_count', MagicMock(return_value='0x5'))
+    @patch('private_chain_util.PrivateChainUtil.get_balance', MagicMock(return_value=format(10 ** 30, '#x')))
+    @patch('private_chain_util.PrivateChainUtil.is_transaction_completed', MagicMock(return_value=True))
+    @patch('time_util.TimeUtil.generate_sort_key', MagicMock(return_value=1520150552000003))
+    @patch('time.time', MagicMock(return_value=1520150552.000003))
+    @patch('settlement_queue.SettlementQueue.backend', LocalSettlementQueue())
+    def test_main_ok_async_settlement(self):
+        test_tip_value = 10
+        to_address = format(10, '064x')
+        burn_value = int(test_tip_value / Decimal(10))
+        raw_transactions = self.create_singed_transactions(to_address, test_tip_value, burn_value)
+
+        with patch('me_wallet_tip.UserUtil.get_private_eth_address') as mock_get_private_eth_address:
+            mock_get_private_eth_address.return_value = '0x' + to_address[24:]
+            event = self.__create_async_settlement_event(raw_transactions)
+
+            response = MeWalletTip(event, {}, self.dynamodb, cognito=None).main()
+            self.assertEqual(response['statusCode'], 202)
+            self.assertEqual(json.loads(response['body']), {
+                'sort_key': 1520150552000003,
+                'transaction': 'tip_transaction_hash'
+            })
+
+            # 承認待ちの投げ銭データが作成され、バーンは行われないこと
+            tip_table = self.dynamodb.Table(os.environ['TIP_TABLE_NAME'])
+            tips = tip_table.scan()['Items']
+            self.assertEqual(len(tips), 1)
+            self.assertEqual(tips[0]['settlement_status'], 'pending')
+            self.assertIsNone(tips[0]['burn_transaction'])
+            # 決済されるまではバッチが参照する uncompleted-index に含まれないこと
+            self.assertNotIn('uncompleted', tips[0])
+            self.assertEqual(PrivateChainUtil.send_raw_transaction.call_count, 1)
+            PrivateChainUtil.is_transaction_completed.assert_not_called()
+
+            # 承認以降の処理が settlement worker に依頼されていること
+            records = SettlementQueue.backend.to_event()['Records']
+            self.assertEqual(len(records), 1)
+            self.assertEqual(json.loads(records[0]['body']), {
+                'type': 'tip',
+                'user_id': 'act_user_01',
+                'sort_key': 1520150552000003,
+                'transaction': 'tip_transaction_hash',
+                'burn_signed_transaction': raw_transactions['burn'].rawTransaction.hex()
+            })
+
+    @patch('private_chain_util.PrivateChainUtil.send_raw_transaction', MagicMock(
+        side_effect=['tip_transaction_hash', 'burn_transaction_hash']))
+    @patch('private_chain_util.PrivateChainUtil.get_transaction_count', MagicMock(return_value='0x5'))
+    @patch('private_chain_util.PrivateChainUtil.get_balance', MagicMock(return_value=format(10 ** 30, '#x')))
+    @patch('private_chain_util.PrivateChainUtil.is_transaction_completed', MagicMock(return_value=True))
+    @patch('time_util.TimeUtil.generate_sort_key', MagicMock(return_value=1520150552000003))
+    @patch('time.time', MagicMock(return_value=1520150552.000003))
+    @patch('settlement_queue.SettlementQueue.backend', MagicMock(send=MagicMock(side_effect=Exception())))
+    def test_main_ok_async_settlement_with_exception_in_send(self):
+        test_tip_value = 10
+        to_address = format(10, '064x')
+        burn_value = int(test_tip_value / Decimal(10))
+        raw_transactions = self.create_singed_transactions(to_address, test_tip_value, burn_value)
+
+        with patch('me_wallet_tip.UserUtil.get_private_eth_address') as mock_get_private_eth_address:
+            mock_get_private_eth_address.return_value = '0x' + to_address[24:]
+            event = self.__create_async_settlement_event(raw_transactions)
+
+            # キューへの送信に失敗した場合は同期的に決済されること
+            response = MeWalletTip(event, {}, self.dynamodb, cognito=None).main()
+            self.assertEqual(response['statusCode'], 200)
+            tip_table = self.dynamodb.Table(os.environ['TIP_TABLE_NAME'])
+            tips = tip_table.scan()['Items']
+            self.assertEqual(len(tips), 1)
+            self.assertEqual(tips[0]['settlement_status'], 'done')
+            self.assertEqual(tips[0]['burn_transaction'], 'burn_transaction_hash')
+
+    @patch('private_chain_util.PrivateChainUtil.send_raw_transaction', MagicMock(
+        side_effect=['tip_transaction_hash', 'burn_transaction_hash']))
+    @patch('private_chain_util.PrivateChainUtil.get_transaction_count', MagicMock(return_value='0x5'))
+    @patch('private_chain_util.PrivateChainUtil.get_balance', MagicMock(return_value=format(10 ** 30, '#x')))
+    @patch('private_chain_util.PrivateChainUtil.is_transaction_completed', MagicMock(return_value=False))
+    @patch('time_util.TimeUtil.generate_sort_key', MagicMock(return_value=1520150552000003))
+    @patch('time.time', MagicMock(return_value=1520150552.000003))
+    @patch('settlement_queue.SettlementQueue.backend', MagicMock(send=MagicMock(side_effect=Exception())))
+    def test_main_ok_async_settlement_with_exception_in_send_and_uncompleted(self):
+        test_tip_value = 10
+        to_address = format(10, '064x')
+        burn_value = int(test_tip_value / Decimal(10))
+        raw_transactions = self.create_singed_transactions(to_address, test_tip_value, burn_value)
+
+        with patch('me_wallet_tip.UserUtil.get_private_eth_address') as mock_get_private_eth_address:
+            mock_get_private_eth_address.return_value = '0x' + to_address[24:]
+            event = self.__create_async_settlement_event(raw_transactions)
+
+            # 承認を確認できなかった場合は pending のまま残さず、バーンせずに unknown として決済を終えること
+            response = MeWalletTip(event, {}, self.dynamodb, cognito=None).main()
+            self.assertEqual(response['statusCode'], 200)
+            tip_table = self.dynamodb.Table(os.environ['TIP_TABLE_NAME'])
+            tips = tip_table.scan()['Items']
+            self.assertEqual(len(tips), 1)
+            self.assertEqual(tips[0]['settlement_status'], 'unknown')
+            self.assertIsNone(tips[0]['burn_transaction'])
+            self.assertEqual(tips[0]['uncompleted'], Decimal(1))
+            self.assertEqual(PrivateChainUtil.send_raw_transaction.call_count, 1)
+
     @patch('private_chain_util.PrivateChainUtil.get_transaction_count', MagicMock(return_value='0x5'))
     @patch('private_chain_util.PrivateChainUtil.get_balance', MagicMock(return_value=format(10 ** 30, '#x')))
     def test_main_ng_same_user(self):
@@ -420,6 +553,7 @@ class TestMeWalletTip(TestCase):
             self.assertEqual(len(tips), 0)
 
     @patch('private_chain_util.PrivateChainUtil.get_transaction_count', MagicMock(return_value='0x5'))
+    @patch('private_chain_util.PrivateChainUtil.get_balance', MagicMock(return_value=format(10 ** 30, '#x')))
     def test_main_ng_less_than_min_value(self):
         test_tip_value = 0
         to_address = format(10, '064x')
@@ -458,6 +592,7 @@ class TestMeWalletTip(TestCase):
             self.assertEqual(len(tips), 0)
 
     @patch('private_chain_util.PrivateChainUtil.get_transaction_count', MagicMock(return_value='0x5'))
+    @patch('private_chain_util.PrivateChainUtil.get_balance', MagicMock(return_value=format(10 ** 30, '#x')))
     def test_main_ng_greater_than_max_value(self):
         test_tip_value = settings.parameters['tip_value']['maximum'] + 1
         to_address = format(10, '064x')
@@ -497,6 +632,7 @@ class TestMeWalletTip(TestCase):
             self.assertEqual(len(tips), 0)
 
     @patch('private_chain_util.PrivateChainUtil.get_transaction_count', MagicMock(return_value='0x5'))
+    @patch('private_chain_util.PrivateChainUtil.get_balance', MagicMock(return_value=format(10 ** 30, '#x')))
     def test_main_ng_invalid_burn_value(self):
         test_tip_value = 100
         to_address = format(10, '064x')
@@ -692,6 +828,28 @@ class TestMeWalletTip(TestCase):
         event['body'] = json.dumps(event['body'])
         self.assert_bad_request(event)
 
+    def __create_async_settlement_event(self, raw_transactions):
+        event = {
+            'body': {
+                'article_id': self.article_info_table_items[0]['article_id'],
+                'tip_signed_transaction': raw_transactions['tip'].rawTransaction.hex(),
+                'burn_signed_transaction': raw_transactions['burn'].rawTransaction.hex(),
+                'async_settlement': True
+            },
+            'requestContext': {
+                'authorizer': {
+                    'claims': {
+                        'cognito:username': 'act_user_01',
+                        'custom:private_eth_address': self.test_account.address,
+                        'phone_number_verified': 'true',
+                        'email_verified': 'true'
+                    }
+                }
+            }
+        }
+        event['body'] = json.dumps(event['body'])
+        return event
+
     def create_singed_transactions(self, to_address, test_tip_value, burn_value):
         test_nonce = 5
         method = 'a9059cbb'
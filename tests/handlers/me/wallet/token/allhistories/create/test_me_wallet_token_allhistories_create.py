@@ -7,6 +7,8 @@ from me_wallet_token_allhistories_create import MeWalletTokenAllhistoriesCreate
 from unittest.mock import patch, MagicMock
 from tests_util import TestsUtil
 from hexbytes import HexBytes
+from web3 import Web3, HTTPProvider
+from web3.eth import Eth
 
 
 class TestMeWalletTokenAllHistoriesCreate(TestCase):
@@ -62,6 +64,14 @@ class TestMeWalletTokenAllHistoriesCreate(TestCase):
             },
         ]
         TestsUtil.create_table(self.dynamodb, os.environ['USER_CONFIGURATIONS_TABLE_NAME'], user_configurations_items)
+        block_timestamp_items = [
+            {
+                'block_number': 3,
+                'timestamp': 1546268403
+            }
+        ]
+        TestsUtil.create_table(self.dynamodb, os.environ['BLOCK_TIMESTAMP_TABLE_NAME'], block_timestamp_items)
+        MeWalletTokenAllhistoriesCreate.block_timestamps.clear()
 
     def TearDown(self):
         TestsUtil.delete_all_tables(self.dynamodb)
@@ -339,6 +349,39 @@ class TestMeWalletTokenAllHistoriesCreate(TestCase):
                 event, {}, self.dynamodb).add_type('---', None, user_eoa)
             self.assertEqual(response, 'unknown')
 
+    @patch('web3.eth.Eth.getBlock', MagicMock(side_effect=lambda block_number: {'timestamp': 1546268400 + block_number}))
+    def test_get_block_timestamps(self):
+        target = MeWalletTokenAllhistoriesCreate({}, {}, dynamodb=self.dynamodb)
+        target.web3 = Web3(HTTPProvider(os.environ['PRIVATE_CHAIN_OPERATION_URL']))
+        logs = [{'blockNumber': block_number} for block_number in [1, 2, 1, 3, 2]]
+
+        actual = target._MeWalletTokenAllhistoriesCreate__get_block_timestamps(logs)
+        self.assertEqual(actual, {1: 1546268401, 2: 1546268402, 3: 1546268403})
+
+        # テーブルに存在しないブロックのみ、ブロック毎に 1 度だけ getBlock が呼び出されること
+        self.assertEqual(sorted([c[0][0] for c in Eth.getBlock.call_args_list]), [1, 2])
+        # 取得した timestamp がテーブルに保存されること
+        block_timestamp_table = self.dynamodb.Table(os.environ['BLOCK_TIMESTAMP_TABLE_NAME'])
+        items = sorted(block_timestamp_table.scan()['Items'], key=lambda item: item['block_number'])
+        self.assertEqual([(item['block_number'], item['timestamp']) for item in items],
+                         [(1, 1546268401), (2, 1546268402), (3, 1546268403)])
+
+    @patch('web3.eth.Eth.getBlock', MagicMock(side_effect=lambda block_number: {'timestamp': 1546268400 + block_number}))
+    def test_get_block_timestamps_with_cache(self):
+        target = MeWalletTokenAllhistoriesCreate({}, {}, dynamodb=self.dynamodb)
+        target.web3 = Web3(HTTPProvider(os.environ['PRIVATE_CHAIN_OPERATION_URL']))
+        target._MeWalletTokenAllhistoriesCreate__get_block_timestamps([{'blockNumber': 1}, {'blockNumber': 3}])
+        Eth.getBlock.reset_mock()
+
+        # コンテナ内にキャッシュ済みのブロックは、テーブル・private chain を参照しないこと
+        with patch('me_wallet_token_allhistories_create.DBUtil.batch_get_items') as mock_batch_get_items:
+            mock_batch_get_items.return_value = []
+            actual = MeWalletTokenAllhistoriesCreate({}, {}, dynamodb=self.dynamodb).\
+                _MeWalletTokenAllhistoriesCreate__get_block_timestamps([{'blockNumber': 3}, {'blockNumber': 1}])
+            self.assertEqual(actual, {1: 1546268401, 3: 1546268403})
+            mock_batch_get_items.assert_not_called()
+        Eth.getBlock.assert_not_called()
+
     def test_ng_migration_checking(self):
         event = {
             'requestContext': {
@@ -76,6 +76,7 @@ class TestMeWalletTokenHistoriesIndex(TestCase):
             args_block_number = {
                 'request_url': 'https://' + os.environ[
                     'PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/eth/block_number',
+                'idempotent': True
             }
             self.assertEqual(mock_send_transaction.call_args_list[0][1], args_block_number)
             args_get_block_by_number = {
@@ -83,7 +84,8 @@ class TestMeWalletTokenHistoriesIndex(TestCase):
                     'PRIVATE_CHAIN_EXECUTE_API_HOST'] + '/production/eth/get_block_by_number',
                 'payload_dict': {
                     'block_num': hex(from_block_number)
-                }
+                },
+                'idempotent': True
             }
             self.assertEqual(mock_send_transaction.call_args_list[1][1], args_get_block_by_number)
             args_replay_events = {
@@ -93,7 +95,8 @@ class TestMeWalletTokenHistoriesIndex(TestCase):
                     'from_block': hex(from_block_number),
                     'to_block': return_block_number,
                     'sender_eth_address': private_eth_address[2:]
-                }
+                },
+                'idempotent': True
             }
             self.assertEqual(mock_send_transaction.call_args_list[2][1], args_replay_events)
             args_apply_relay_events = {
@@ -103,7 +106,8 @@ class TestMeWalletTokenHistoriesIndex(TestCase):
                     'from_block': hex(from_block_number),
                     'to_block': return_block_number,
                     'recipient_eth_address': private_eth_address[2:]
-                }
+                },
+                'idempotent': True
             }
             self.assertEqual(mock_send_transaction.call_args_list[3][1], args_apply_relay_events)
 
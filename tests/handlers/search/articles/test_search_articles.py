@@ -136,6 +136,76 @@ class TestSearchArticles(TestCase):
         response = SearchArticles(params, {}, elasticsearch=self.elasticsearch).main()
         self.assertEqual(response['statusCode'], 400)
 
+    def test_search_request_without_body(self):
+        params = {
+                'queryStringParameters': {
+                    'query': 'huga'
+                }
+        }
+        response = SearchArticles(params, {}, elasticsearch=self.elasticsearch).main()
+        result = json.loads(response['body'])
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(len(result), 1)
+        # 本文は返却されないこと
+        self.assertEqual(result[0]['article_id'], 'test1')
+        self.assertEqual(result[0]['title'], 'abc1')
+        self.assertNotIn('body', result[0])
+
+    def test_search_request_with_fields(self):
+        params = {
+                'queryStringParameters': {
+                    'query': 'huga',
+                    'fields': 'article_id,title'
+                }
+        }
+        response = SearchArticles(params, {}, elasticsearch=self.elasticsearch).main()
+        result = json.loads(response['body'])
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(result, [{'article_id': 'test1', 'title': 'abc1'}])
+
+    def test_search_request_with_invalid_fields(self):
+        for fields in ['article_id,unknown_field', 'body']:
+            params = {
+                    'queryStringParameters': {
+                        'query': 'huga',
+                        'fields': fields
+                    }
+            }
+            response = SearchArticles(params, {}, elasticsearch=self.elasticsearch).main()
+            self.assertEqual(response['statusCode'], 400)
+
+    def test_search_request_with_cursor(self):
+        params = {
+                'queryStringParameters': {
+                    'limit': '8',
+                    'query': 'dummy',
+                    'cursor': ''
+                }
+        }
+        article_ids = []
+        for _ in range(4):
+            response = SearchArticles(params, {}, elasticsearch=self.elasticsearch).main()
+            self.assertEqual(response['statusCode'], 200)
+            result = json.loads(response['body'])
+            article_ids.extend([item['article_id'] for item in result['Items']])
+            params['queryStringParameters']['cursor'] = result['Cursor']
+
+        # 返却された cursor で続きを取得し、全件を重複なく取得できること
+        self.assertEqual(len(result['Items']), 6)
+        self.assertIsNone(result['Cursor'])
+        self.assertEqual(sorted(article_ids), sorted([f'dummy{dummy}' for dummy in range(30)]))
+
+    def test_search_request_with_page_and_cursor(self):
+        params = {
+                'queryStringParameters': {
+                    'page': '1',
+                    'query': 'dummy',
+                    'cursor': ''
+                }
+        }
+        response = SearchArticles(params, {}, elasticsearch=self.elasticsearch).main()
+        self.assertEqual(response['statusCode'], 400)
+
     def test_search_with_tag(self):
         params = {
                 'queryStringParameters': {
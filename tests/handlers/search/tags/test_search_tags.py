@@ -48,6 +48,25 @@ class TestSearchTags(TestCase):
         self.assertEquals(len(result), 1)
         self.assertEquals([tag['name'] for tag in result], ['alis alis'])
 
+    def test_search_request_with_cursor(self):
+        params = {
+                'queryStringParameters': {
+                    'query': 'ali',
+                    'limit': '2',
+                    'cursor': ''
+                }
+        }
+        response = SearchTags(params, {}, elasticsearch=self.elasticsearch).main()
+        result = json.loads(response['body'])
+        self.assertEquals([tag['name'] for tag in result['Items']], ['alismedia', 'alis alis'])
+        self.assertIsNotNone(result['Cursor'])
+
+        params['queryStringParameters']['cursor'] = result['Cursor']
+        response = SearchTags(params, {}, elasticsearch=self.elasticsearch).main()
+        result = json.loads(response['body'])
+        self.assertEquals([tag['name'] for tag in result['Items']], ['ALIS'])
+        self.assertIsNone(result['Cursor'])
+
     def test_search_request_with_default_limit(self):
         # 0~110のループ
         for n in range(0, 111):
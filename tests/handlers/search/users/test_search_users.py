@@ -1,6 +1,8 @@
 from elasticsearch import Elasticsearch
 from search_users import SearchUsers
+from es_util import ESUtil
 from unittest import TestCase
+from unittest.mock import MagicMock
 import json
 
 
@@ -10,48 +12,8 @@ class TestSearchUsers(TestCase):
     )
 
     def setUp(self):
-        self.elasticsearch.indices.create(
-                index="users",
-                body={
-                    "settings": {
-                        "index": {
-                            "number_of_replicas": "0"
-                        },
-                        "analysis": {
-                            "analyzer": {
-                                "default": {
-                                    "tokenizer": "keyword"
-                                }
-                            },
-                            "normalizer": {
-                                "lowcase": {
-                                    "type": "custom",
-                                    "char_filter": [],
-                                    "filter": ["lowercase"]
-                                }
-                            }
-                        }
-                    },
-                    "mappings": {
-                        "user": {
-                            "properties": {
-                                "user_id": {
-                                    "type": "keyword",
-                                    "copy_to": "search_name"
-                                },
-                                "user_display_name": {
-                                    "type": "keyword",
-                                    "copy_to": "search_name"
-                                },
-                                "search_name": {
-                                    "type": "keyword",
-                                    "normalizer": "lowcase"
-                                }
-                            }
-                        }
-                    }
-                }
-        )
+        ESUtil.user_search_name_ngram_cache.clear()
+        self.elasticsearch.indices.create(index="users", body=self.get_users_index_body())
         items = []
         for dummy in range(30):
             items.append({
@@ -71,6 +33,47 @@ class TestSearchUsers(TestCase):
     def tearDown(self):
         self.elasticsearch.indices.delete(index="users", ignore=[404])
 
+    def get_users_index_body(self):
+        return {
+            "settings": {
+                "index": {
+                    "number_of_replicas": "0"
+                },
+                "analysis": {
+                    "analyzer": {
+                        "default": {
+                            "tokenizer": "keyword"
+                        }
+                    },
+                    "normalizer": {
+                        "lowcase": {
+                            "type": "custom",
+                            "char_filter": [],
+                            "filter": ["lowercase"]
+                        }
+                    }
+                }
+            },
+            "mappings": {
+                "user": {
+                    "properties": {
+                        "user_id": {
+                            "type": "keyword",
+                            "copy_to": "search_name"
+                        },
+                        "user_display_name": {
+                            "type": "keyword",
+                            "copy_to": "search_name"
+                        },
+                        "search_name": {
+                            "type": "keyword",
+                            "normalizer": "lowcase"
+                        }
+                    }
+                }
+            }
+        }
+
     def test_search_request(self):
         params = {
                 'queryStringParameters': {
@@ -187,3 +190,87 @@ class TestSearchUsers(TestCase):
         response = SearchUsers(params, {}, elasticsearch=self.elasticsearch).main()
         result = json.loads(response['body'])
         self.assertEqual(len(result), 1)
+
+    def test_search_short_query(self):
+        # 1, 2 文字での部分一致
+        params = {
+                'queryStringParameters': {
+                    'query': 'r2',
+                    'limit': '30'
+                }
+        }
+        response = SearchUsers(params, {}, elasticsearch=self.elasticsearch).main()
+        result = json.loads(response['body'])
+        self.assertEqual(sorted([u['user_id'] for u in result]), ['testuser2', 'testuser20', 'testuser21', 'testuser22',
+                                                                  'testuser23', 'testuser24', 'testuser25', 'testuser26',
+                                                                  'testuser27', 'testuser28', 'testuser29'])
+
+        params['queryStringParameters']['query'] = '9'
+        response = SearchUsers(params, {}, elasticsearch=self.elasticsearch).main()
+        result = json.loads(response['body'])
+        self.assertEqual(sorted([u['user_id'] for u in result]), ['testuser19', 'testuser29', 'testuser9'])
+
+    def test_search_not_matched_across_user_id_and_display_name(self):
+        # user_id と user_display_name をまたいだ文字列には一致しない
+        params = {
+                'queryStringParameters': {
+                    'query': 'testuser1testuser'
+                }
+        }
+        response = SearchUsers(params, {}, elasticsearch=self.elasticsearch).main()
+        result = json.loads(response['body'])
+        self.assertEqual(len(result), 0)
+
+
+class TestSearchUsersWithNgram(TestSearchUsers):
+    # search_name の n-gram サブフィールドを利用した場合も、従来の wildcard と同じ結果となること
+    def get_users_index_body(self):
+        body = super().get_users_index_body()
+        body['settings']['analysis']['analyzer'].update({
+            'search_name_ngram': {
+                'type': 'custom',
+                'tokenizer': 'search_name_ngram',
+                'filter': ['lowercase']
+            },
+            'search_name_short_ngram': {
+                'type': 'custom',
+                'tokenizer': 'search_name_short_ngram',
+                'filter': ['lowercase']
+            }
+        })
+        body['settings']['analysis']['tokenizer'] = {
+            'search_name_ngram': {
+                'type': 'ngram',
+                'min_gram': 3,
+                'max_gram': 3
+            },
+            'search_name_short_ngram': {
+                'type': 'ngram',
+                'min_gram': 1,
+                'max_gram': 2
+            }
+        }
+        body['mappings']['user']['_meta'] = {'search_name_ngram_ready': True}
+        body['mappings']['user']['properties']['search_name']['fields'] = {
+            'ngram': {
+                'type': 'text',
+                'analyzer': 'search_name_ngram'
+            },
+            'short_ngram': {
+                'type': 'text',
+                'analyzer': 'search_name_short_ngram'
+            }
+        }
+        return body
+
+    def test_search_request_with_ngram_query(self):
+        elasticsearch = MagicMock(wraps=self.elasticsearch)
+        params = {
+                'queryStringParameters': {
+                    'query': 'testuser1'
+                }
+        }
+        SearchUsers(params, {}, elasticsearch=elasticsearch).main()
+
+        _, kwargs = elasticsearch.search.call_args
+        self.assertEqual(kwargs['body']['query'], {'match_phrase': {'search_name.ngram': 'testuser1'}})
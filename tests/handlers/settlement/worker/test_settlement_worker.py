@@ -0,0 +1,279 @@
+import os
+import settings
+from decimal import Decimal
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+from settlement_worker import SettlementWorker
+from settlement_queue import LocalSettlementQueue
+from private_chain_util import PrivateChainUtil
+from exceptions import ReceiptError, SendTransactionError
+from tests_util import TestsUtil
+
+
+class TestSettlementWorker(TestCase):
+    dynamodb = TestsUtil.get_dynamodb_client()
+
+    @classmethod
+    def setUpClass(cls):
+        TestsUtil.set_aws_auth_to_env()
+        TestsUtil.set_all_private_chain_valuables_to_env()
+
+    def setUp(self):
+        TestsUtil.set_all_tables_name_to_env()
+        os.environ['SETTLEMENT_MAX_RECEIVE_COUNT'] = '10'
+        TestsUtil.delete_all_tables(self.dynamodb)
+
+        self.article_info_items = [
+            {
+                'article_id': 'publicId0001',
+                'user_id': 'author001',
+                'status': 'public',
+                'title': 'purchase001 title',
+                'sort_key': 1520150272000000,
+                'price': 100 * (10 ** 18)
+            }
+        ]
+        self.tip_items = [
+            {
+                'user_id': 'act_user_01',
+                'to_user_id': 'author001',
+                'tip_value': 10,
+                'article_id': 'publicId0001',
+                'article_title': 'purchase001 title',
+                'transaction': 'tip_transaction_hash',
+                'burn_transaction': None,
+                'settlement_status': 'pending',
+                'sort_key': 1520150552000003,
+                'target_date': '2018-03-04',
+                'created_at': 1520150552
+            },
+            {
+                'user_id': 'act_user_01',
+                'to_user_id': 'author001',
+                'tip_value': 10,
+                'article_id': 'publicId0001',
+                'article_title': 'purchase001 title',
+                'transaction': 'settled_tip_transaction_hash',
+                'burn_transaction': 'settled_burn_transaction_hash',
+                'settlement_status': 'done',
+                'uncompleted': 1,
+                'sort_key': 1520150552000004,
+                'target_date': '2018-03-04',
+                'created_at': 1520150552
+            }
+        ]
+        self.paid_article_items = [
+            {
+                'article_id': 'publicId0001',
+                'user_id': 'purchaseuser001',
+                'article_user_id': 'author001',
+                'article_title': 'purchase001 title',
+                'purchase_transaction': 'purchase_transaction_hash',
+                'sort_key': 1520150552000003,
+                'price': 100 * (10 ** 18),
+                'history_created_at': 1520150270,
+                'status': 'doing',
+                'created_at': 1520150552
+            }
+        ]
+        self.paid_status_items = [
+            {
+                'article_id': 'publicId0001',
+                'user_id': 'purchaseuser001',
+                'status': 'doing',
+                'created_at': 1520150552
+            }
+        ]
+        TestsUtil.create_table(self.dynamodb, os.environ['ARTICLE_INFO_TABLE_NAME'], self.article_info_items)
+        TestsUtil.create_table(self.dynamodb, os.environ['TIP_TABLE_NAME'], self.tip_items)
+        TestsUtil.create_table(self.dynamodb, os.environ['PAID_ARTICLES_TABLE_NAME'], self.paid_article_items)
+        TestsUtil.create_table(self.dynamodb, os.environ['PAID_STATUS_TABLE_NAME'], self.paid_status_items)
+        TestsUtil.create_table(self.dynamodb, os.environ['NOTIFICATION_TABLE_NAME'], [])
+        TestsUtil.create_table(self.dynamodb, os.environ['UNREAD_NOTIFICATION_MANAGER_TABLE_NAME'], [])
+
+    def tearDown(self):
+        TestsUtil.delete_all_tables(self.dynamodb)
+
+    @staticmethod
+    def create_event(messages, receive_count=1):
+        queue = LocalSettlementQueue()
+        for message in messages:
+            queue.send(message)
+        return queue.to_event(receive_count)
+
+    def tip_message(self, sort_key=1520150552000003):
+        return {
+            'type': 'tip',
+            'user_id': 'act_user_01',
+            'sort_key': sort_key,
+            'transaction': 'tip_transaction_hash',
+            'burn_signed_transaction': 'burn_signed_transaction'
+        }
+
+    def purchase_message(self):
+        return {
+            'type': 'purchase',
+            'article_id': 'publicId0001',
+            'user_id': 'purchaseuser001',
+            'sort_key': 1520150552000003,
+            'purchase_transaction': 'purchase_transaction_hash',
+            'burn_signed_transaction': 'burn_signed_transaction'
+        }
+
+    def get_tip(self, sort_key=1520150552000003):
+        tip_table = self.dynamodb.Table(os.environ['TIP_TABLE_NAME'])
+        return tip_table.get_item(Key={'user_id': 'act_user_01', 'sort_key': sort_key})['Item']
+
+    @patch('private_chain_util.PrivateChainUtil.send_raw_transaction', MagicMock(return_value='burn_transaction_hash'))
+    @patch('private_chain_util.PrivateChainUtil.is_transaction_completed', MagicMock(return_value=True))
+    def test_main_tip_done(self):
+        SettlementWorker(self.create_event([self.tip_message()]), {}, self.dynamodb).main()
+
+        PrivateChainUtil.send_raw_transaction.assert_called_once_with('burn_signed_transaction')
+        tip = self.get_tip()
+        self.assertEqual(tip['settlement_status'], 'done')
+        self.assertEqual(tip['burn_transaction'], 'burn_transaction_hash')
+        # 決済時に uncompleted が設定され、バッチが参照する uncompleted-index に含まれること
+        self.assertEqual(tip['uncompleted'], Decimal(1))
+
+    @patch('private_chain_util.PrivateChainUtil.send_raw_transaction', MagicMock(return_value='burn_transaction_hash'))
+    @patch('private_chain_util.PrivateChainUtil.is_transaction_completed', MagicMock(side_effect=ReceiptError()))
+    def test_main_tip_receipt_error(self):
+        # トランザクションが失敗している（ReceiptError）場合は再実行させず、決済失敗とすること
+        SettlementWorker(self.create_event([self.tip_message()]), {}, self.dynamodb).main()
+
+        PrivateChainUtil.send_raw_transaction.assert_not_called()
+        tip = self.get_tip()
+        self.assertEqual(tip['settlement_status'], 'fail')
+        self.assertIsNone(tip['burn_transaction'])
+
+    @patch('private_chain_util.PrivateChainUtil.send_raw_transaction', MagicMock(return_value='burn_transaction_hash'))
+    @patch('private_chain_util.PrivateChainUtil.is_transaction_completed', MagicMock(return_value=False))
+    def test_main_tip_uncompleted(self):
+        # 承認待ちの場合はキューから再実行させるために例外を送出し、投げ銭データは pending のままであること
+        with self.assertRaises(Exception):
+            SettlementWorker(self.create_event([self.tip_message()]), {}, self.dynamodb).main()
+
+        PrivateChainUtil.send_raw_transaction.assert_not_called()
+        self.assertEqual(self.get_tip()['settlement_status'], 'pending')
+        self.assertNotIn('uncompleted', self.get_tip())
+
+    @patch('private_chain_util.PrivateChainUtil.send_raw_transaction', MagicMock(return_value='burn_transaction_hash'))
+    @patch('private_chain_util.PrivateChainUtil.is_transaction_completed', MagicMock(return_value=False))
+    def test_main_tip_uncompleted_last_receive(self):
+        # 再実行の上限に達しても承認されない場合は dead letter queue に移される前に unknown とすること
+        SettlementWorker(self.create_event([self.tip_message()], receive_count=10), {}, self.dynamodb).main()
+
+        PrivateChainUtil.send_raw_transaction.assert_not_called()
+        self.assertEqual(self.get_tip()['settlement_status'], 'unknown')
+
+    @patch('private_chain_util.PrivateChainUtil.send_raw_transaction', MagicMock(return_value='burn_transaction_hash'))
+    @patch('private_chain_util.PrivateChainUtil.is_transaction_completed', MagicMock(return_value=True))
+    def test_main_tip_already_settled(self):
+        # 重複して配信されたメッセージは処理しないこと
+        SettlementWorker(self.create_event([self.tip_message(1520150552000004)]), {}, self.dynamodb).main()
+
+        PrivateChainUtil.is_transaction_completed.assert_not_called()
+        PrivateChainUtil.send_raw_transaction.assert_not_called()
+        self.assertEqual(self.get_tip(1520150552000004)['burn_transaction'], 'settled_burn_transaction_hash')
+
+    @patch('private_chain_util.PrivateChainUtil.send_raw_transaction', MagicMock(return_value='burn_transaction_hash'))
+    @patch('private_chain_util.PrivateChainUtil.is_transaction_completed', MagicMock(return_value=True))
+    def test_main_purchase_done(self):
+        SettlementWorker(self.create_event([self.purchase_message()]), {}, self.dynamodb).main()
+
+        paid_articles_table = self.dynamodb.Table(os.environ['PAID_ARTICLES_TABLE_NAME'])
+        paid_article = paid_articles_table.get_item(
+            Key={'article_id': 'publicId0001', 'sort_key': 1520150552000003}
+        )['Item']
+        self.assertEqual(paid_article['status'], 'done')
+        self.assertEqual(paid_article['burn_transaction'], 'burn_transaction_hash')
+
+        paid_status_table = self.dynamodb.Table(os.environ['PAID_STATUS_TABLE_NAME'])
+        paid_status = paid_status_table.get_item(Key={'article_id': 'publicId0001', 'user_id': 'purchaseuser001'})['Item']
+        self.assertEqual(paid_status['status'], 'done')
+
+        # 購入者と著者へ通知が作成されること
+        notification_table = self.dynamodb.Table(os.environ['NOTIFICATION_TABLE_NAME'])
+        notifications = notification_table.scan()['Items']
+        self.assertEqual(sorted([n['user_id'] for n in notifications]), ['author001', 'purchaseuser001'])
+        self.assertEqual(notifications[0]['price'], Decimal(100 * (10 ** 18)))
+
+    @patch('private_chain_util.PrivateChainUtil.send_raw_transaction', MagicMock(return_value='burn_transaction_hash'))
+    @patch('private_chain_util.PrivateChainUtil.is_transaction_completed', MagicMock(return_value=False))
+    def test_main_purchase_uncompleted(self):
+        with self.assertRaises(Exception):
+            SettlementWorker(self.create_event([self.purchase_message()]), {}, self.dynamodb).main()
+
+        PrivateChainUtil.send_raw_transaction.assert_not_called()
+        paid_status_table = self.dynamodb.Table(os.environ['PAID_STATUS_TABLE_NAME'])
+        paid_status = paid_status_table.get_item(Key={'article_id': 'publicId0001', 'user_id': 'purchaseuser001'})['Item']
+        self.assertEqual(paid_status['status'], 'doing')
+
+    @patch('private_chain_util.PrivateChainUtil.send_raw_transaction', MagicMock(return_value='burn_transaction_hash'))
+    @patch('private_chain_util.PrivateChainUtil.is_transaction_completed', MagicMock(side_effect=ReceiptError()))
+    def test_main_purchase_receipt_error(self):
+        # トランザクションが失敗している（ReceiptError）場合は購入失敗とし、購入のロックを解除すること
+        SettlementWorker(self.create_event([self.purchase_message()]), {}, self.dynamodb).main()
+
+        PrivateChainUtil.send_raw_transaction.assert_not_called()
+        paid_articles_table = self.dynamodb.Table(os.environ['PAID_ARTICLES_TABLE_NAME'])
+        paid_article = paid_articles_table.get_item(
+            Key={'article_id': 'publicId0001', 'sort_key': 1520150552000003}
+        )['Item']
+        self.assertEqual(paid_article['status'], 'fail')
+        paid_status_table = self.dynamodb.Table(os.environ['PAID_STATUS_TABLE_NAME'])
+        paid_status = paid_status_table.get_item(Key={'article_id': 'publicId0001', 'user_id': 'purchaseuser001'})['Item']
+        self.assertEqual(paid_status['status'], 'fail')
+
+        # 購入者へ購入失敗の通知のみが作成されること
+        notification_table = self.dynamodb.Table(os.environ['NOTIFICATION_TABLE_NAME'])
+        notifications = notification_table.scan()['Items']
+        self.assertEqual(len(notifications), 1)
+        self.assertEqual(notifications[0]['user_id'], 'purchaseuser001')
+        self.assertEqual(notifications[0]['type'], settings.ARTICLE_PURCHASE_ERROR_TYPE)
+
+    @patch('private_chain_util.PrivateChainUtil.send_raw_transaction', MagicMock(return_value='burn_transaction_hash'))
+    @patch('private_chain_util.PrivateChainUtil.is_transaction_completed',
+           MagicMock(side_effect=SendTransactionError()))
+    def test_main_purchase_send_transaction_error(self):
+        with self.assertRaises(SendTransactionError):
+            SettlementWorker(self.create_event([self.purchase_message()]), {}, self.dynamodb).main()
+
+        # 購入失敗とはせず、通知も作成されないこと
+        PrivateChainUtil.send_raw_transaction.assert_not_called()
+        paid_status_table = self.dynamodb.Table(os.environ['PAID_STATUS_TABLE_NAME'])
+        paid_status = paid_status_table.get_item(Key={'article_id': 'publicId0001', 'user_id': 'purchaseuser001'})['Item']
+        self.assertEqual(paid_status['status'], 'doing')
+        notification_table = self.dynamodb.Table(os.environ['NOTIFICATION_TABLE_NAME'])
+        self.assertEqual(notification_table.scan()['Items'], [])
+
+    @patch('private_chain_util.PrivateChainUtil.send_raw_transaction', MagicMock(return_value='burn_transaction_hash'))
+    @patch('private_chain_util.PrivateChainUtil.is_transaction_completed', MagicMock(return_value=False))
+    def test_main_purchase_uncompleted_last_receive(self):
+        # 再実行の上限に達しても承認されない場合は、後から承認される恐れがあるため購入のロック（doing）を解除せず、
+        # 例外を送出して dead letter queue に移すこと
+        with self.assertRaises(Exception):
+            SettlementWorker(self.create_event([self.purchase_message()], receive_count=10), {}, self.dynamodb).main()
+
+        PrivateChainUtil.send_raw_transaction.assert_not_called()
+        paid_status_table = self.dynamodb.Table(os.environ['PAID_STATUS_TABLE_NAME'])
+        paid_status = paid_status_table.get_item(Key={'article_id': 'publicId0001', 'user_id': 'purchaseuser001'})['Item']
+        self.assertEqual(paid_status['status'], 'doing')
+        notification_table = self.dynamodb.Table(os.environ['NOTIFICATION_TABLE_NAME'])
+        self.assertEqual(notification_table.scan()['Items'], [])
+
+    @patch('private_chain_util.PrivateChainUtil.send_raw_transaction', MagicMock(return_value='burn_transaction_hash'))
+    @patch('private_chain_util.PrivateChainUtil.is_transaction_completed',
+           MagicMock(side_effect=SendTransactionError()))
+    def test_main_purchase_send_transaction_error_last_receive(self):
+        with self.assertRaises(SendTransactionError):
+            SettlementWorker(self.create_event([self.purchase_message()], receive_count=10), {}, self.dynamodb).main()
+
+        paid_status_table = self.dynamodb.Table(os.environ['PAID_STATUS_TABLE_NAME'])
+        paid_status = paid_status_table.get_item(Key={'article_id': 'publicId0001', 'user_id': 'purchaseuser001'})['Item']
+        self.assertEqual(paid_status['status'], 'doing')
+
+    def test_main_unknown_type(self):
+        with self.assertRaises(Exception):
+            SettlementWorker(self.create_event([{'type': 'unknown'}]), {}, self.dynamodb).main()
@@ -119,7 +119,8 @@ class TestsUtil:
             {'env_name': 'TOKEN_SEND_TABLE_NAME', 'table_name': 'TokenSend'},
             {'env_name': 'SUCCEEDED_TIP_TABLE_NAME', 'table_name': 'SucceededTip'},
             {'env_name': 'USER_CONFIGURATIONS_TABLE_NAME', 'table_name': 'UserConfigurations'},
-            {'env_name': 'ACQUISITION_INFO_TABLE_NAME', 'table_name': 'AcquisitionInfo'}
+            {'env_name': 'ACQUISITION_INFO_TABLE_NAME', 'table_name': 'AcquisitionInfo'},
+            {'env_name': 'BLOCK_TIMESTAMP_TABLE_NAME', 'table_name': 'BlockTimestamp'}
         ]
         if os.environ.get('IS_DYNAMODB_ENDPOINT_OF_AWS') is not None:
             for table in cls.all_tables: